@@ -90,6 +90,145 @@ class AppSettings:
     def MCP_TOOL_PERMISSION_MODEL(self) -> str:
         return self._require_type("MCP_TOOL_PERMISSION_MODEL", "", str)
 
+    @property
+    def VECTOR_STORE_TOOL_MAX_TOKENS(self) -> int:
+        return self._require_type("VECTOR_STORE_TOOL_MAX_TOKENS", 2000, int)
+
+    @property
+    def VECTOR_STORES_CACHE(self) -> str:
+        """Alias of the Django cache holding the vector stores resolved by name."""
+        return self._require_type("VECTOR_STORES_CACHE", "default", str)
+
+    @property
+    def VECTOR_STORES_CACHE_TIMEOUT(self) -> int:
+        """Seconds the vector stores resolved by name are cached. 0 disables the cache."""
+        return self._require_type("VECTOR_STORES_CACHE_TIMEOUT", 300, int)
+
+    @property
+    def LLM_CLIENT_HTTP2(self) -> bool:
+        """Use HTTP/2 in the shared LLM HTTP clients, if the `h2` package is installed."""
+        return self._require_type("LLM_CLIENT_HTTP2", True, bool)
+
+    @property
+    def RUNNER_PROMPTS_CACHE(self) -> str:
+        """Alias of the Django cache holding the runners' prompt overrides."""
+        return self._require_type("RUNNER_PROMPTS_CACHE", "default", str)
+
+    @property
+    def RUNNER_PROMPTS_CACHE_TIMEOUT(self) -> int:
+        """Seconds the runners' prompt overrides are cached. 0 disables the cache."""
+        return self._require_type("RUNNER_PROMPTS_CACHE_TIMEOUT", 300, int)
+
+    @property
+    def CHATS_CACHE(self) -> str:
+        """Alias of the Django cache holding the chat identity and pre-prompted questions."""
+        return self._require_type("CHATS_CACHE", "default", str)
+
+    @property
+    def CHATS_CACHE_TIMEOUT(self) -> int:
+        return self._require_type("CHATS_CACHE_TIMEOUT", 300, int)
+
+    @property
+    def CHATS_BACKGROUND_SUMMARIZATION(self) -> bool:
+        """Summarize the conversations in a Celery task after the response instead of in the turn."""
+        return self._require_type("CHATS_BACKGROUND_SUMMARIZATION", False, bool)
+
+    @property
+    def CHATS_CONCURRENT_TURNS(self) -> str:
+        """
+        What to do with a turn while another one runs in the same chat session: "queue" waits for
+        it (up to `CHATS_TURN_LOCK_TIMEOUT`), "reject" fails right away and "allow" runs both.
+        """
+        return self._require_type("CHATS_CONCURRENT_TURNS", "queue", str)
+
+    @property
+    def CHATS_TURN_LOCK_TIMEOUT(self) -> int:
+        """Seconds a queued turn waits for the previous one before failing."""
+        return self._require_type("CHATS_TURN_LOCK_TIMEOUT", 60, int)
+
+    @property
+    def CHATS_SUMMARIZATION_MODEL(self) -> str:
+        """OpenAI model summarizing the conversations. "" uses the chat model."""
+        return self._require_type("CHATS_SUMMARIZATION_MODEL", "", str)
+
+    @property
+    def CHATS_SUMMARIZATION_MAX_TOKENS(self) -> int:
+        """
+        Tokens of the messages not summarized yet that trigger the summarization. 0 triggers it
+        by message count instead.
+        """
+        return self._require_type("CHATS_SUMMARIZATION_MAX_TOKENS", 0, int)
+
+    @property
+    def CHATS_SUMMARIZATION_MAX_INPUT_TOKENS(self) -> int:
+        """Maximum tokens of the messages sent to be summarized. 0 doesn't limit them."""
+        return self._require_type("CHATS_SUMMARIZATION_MAX_INPUT_TOKENS", 0, int)
+
+    @property
+    def CHECKPOINTER_AUTO_SETUP(self) -> bool:
+        """Migrate the checkpoint tables on first use if not migrated yet in the process."""
+        return self._require_type("CHECKPOINTER_AUTO_SETUP", True, bool)
+
+    @property
+    def CHECKPOINTER_POOL_MIN_SIZE(self) -> int:
+        return self._require_type("CHECKPOINTER_POOL_MIN_SIZE", 1, int)
+
+    @property
+    def CHECKPOINTER_POOL_MAX_SIZE(self) -> int:
+        return self._require_type("CHECKPOINTER_POOL_MAX_SIZE", 10, int)
+
+    @property
+    def CHECKPOINTER_POOL_TIMEOUT(self) -> int:
+        """Seconds to wait for a connection from the pool before failing."""
+        return self._require_type("CHECKPOINTER_POOL_TIMEOUT", 30, int)
+
+    @property
+    def CHECKPOINTER_POOL_MAX_IDLE(self) -> int:
+        """Seconds an unused connection stays in the pool before being closed."""
+        return self._require_type("CHECKPOINTER_POOL_MAX_IDLE", 600, int)
+
+    @property
+    def CHECKPOINTER_SHALLOW(self) -> bool:
+        """Keep only the latest checkpoint of each thread."""
+        return self._require_type("CHECKPOINTER_SHALLOW", False, bool)
+
+    @property
+    def CHECKPOINTER_SERDE(self) -> str:
+        """Import path of the serializer of the checkpoint blobs and writes."""
+        return self._require_type(
+            "CHECKPOINTER_SERDE",
+            "baseapp_ai_langkit.chats.checkpoint_serde.CompressedJsonPlusSerializer",
+            str,
+        )
+
+    @property
+    def CHECKPOINTER_SERDE_COMPRESSION_MIN_SIZE(self) -> int:
+        """Serialized checkpoint values from this size (in bytes) on are compressed."""
+        return self._require_type("CHECKPOINTER_SERDE_COMPRESSION_MIN_SIZE", 1024, int)
+
+    @property
+    def CHECKPOINTER_CACHE(self) -> str:
+        """Alias of the Django cache holding the latest checkpoint of each thread. "" disables it."""
+        return self._require_type("CHECKPOINTER_CACHE", "", str)
+
+    @property
+    def CHECKPOINTER_CACHE_TIMEOUT(self) -> int:
+        return self._require_type("CHECKPOINTER_CACHE_TIMEOUT", 3600, int)
+
+    @property
+    def CHECKPOINTER_RETENTION_KEEP_LAST(self) -> int:
+        """Checkpoints kept per thread by the retention job. 0 keeps all of them."""
+        return self._require_type("CHECKPOINTER_RETENTION_KEEP_LAST", 10, int)
+
+    @property
+    def CHECKPOINTER_RETENTION_TTL_DAYS(self) -> int:
+        """Days without activity after which a thread's checkpoints are deleted. 0 disables it."""
+        return self._require_type("CHECKPOINTER_RETENTION_TTL_DAYS", 0, int)
+
+    @property
+    def CHECKPOINTER_RETENTION_BATCH_SIZE(self) -> int:
+        return self._require_type("CHECKPOINTER_RETENTION_BATCH_SIZE", 1000, int)
+
 
 _app_settings = AppSettings("BASEAPP_AI_LANGKIT_")
 
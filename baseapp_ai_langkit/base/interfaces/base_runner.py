@@ -1,11 +1,21 @@
 import logging
 from abc import ABC, abstractmethod
-from typing import Tuple, Type, Union
+from typing import Iterator, Tuple, Type, Union
 
-from baseapp_ai_langkit.base.interfaces.exceptions import LLMChatInterfaceException
+from asgiref.sync import sync_to_async
+
+from baseapp_ai_langkit import app_settings
+from baseapp_ai_langkit.base.interfaces.exceptions import (
+    ChatSessionBusyException,
+    LLMChatInterfaceException,
+)
 from baseapp_ai_langkit.base.interfaces.llm_node import LLMNodeInterface
 from baseapp_ai_langkit.base.prompt_schemas.base_prompt_schema import BasePromptSchema
 from baseapp_ai_langkit.chats.models import ChatSession
+from baseapp_ai_langkit.chats.thread_locks import (
+    acquire_thread_lock,
+    release_thread_lock,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +39,34 @@ class BaseRunnerInterface(ABC):
             logger.error(f"Error in {self.__class__.__name__}: {e}")
             raise LLMChatInterfaceException(e)
 
+    def stream(self) -> Iterator[str]:
+        """
+        Yield the response text as it's generated. Runners that don't implement it yield the
+        whole response of `run` at once.
+        """
+        yield self.run()
+
+    def safe_stream(self) -> Iterator[str]:
+        try:
+            yield from self.stream()
+        except Exception as e:
+            logger.error(f"Error in {self.__class__.__name__}: {e}")
+            raise LLMChatInterfaceException(e)
+
+    async def arun(self) -> str:
+        """
+        Async version of `run`. Override it to run the LLM interface logic natively async,
+        otherwise `run` runs in a thread.
+        """
+        return await sync_to_async(self.run, thread_sensitive=False)()
+
+    async def asafe_run(self):
+        try:
+            return await self.arun()
+        except Exception as e:
+            logger.error(f"Error in {self.__class__.__name__}: {e}")
+            raise LLMChatInterfaceException(e)
+
     @classmethod
     def get_available_nodes(cls) -> dict[str, Type[LLMNodeInterface]]:
         return {**cls.edge_nodes, **cls.nodes}
@@ -69,17 +107,12 @@ class BaseRunnerInterface(ABC):
     ) -> Tuple[BasePromptSchema, Union[list[BasePromptSchema], BasePromptSchema]]:
         from baseapp_ai_langkit.runners.models import (
             LLMRunner,
-            LLMRunnerNode,
             LLMRunnerNodeUsagePrompt,
         )
 
-        runner_record = LLMRunner.get_runner_instance_from_runner_class(self.__class__)
-        if not runner_record:
-            return None, None
-
-        try:
-            node_record = runner_record.nodes.get(node=node_key)
-        except LLMRunnerNode.DoesNotExist:
+        # The runner's whole prompt tree is prefetched and cached, no queries are done per node.
+        node_record = LLMRunner.get_prompt_overrides(self.__class__).get(node_key)
+        if not node_record:
             return None, None
 
         try:
@@ -102,6 +135,55 @@ class BaseRunnerInterface(ABC):
 
 
 class BaseChatInterface(BaseRunnerInterface):
+    """
+    The safe methods run one turn at a time per chat session, so concurrent turns don't load
+    and save the same conversation state. Concurrent turns are queued or rejected according to
+    `BASEAPP_AI_LANGKIT_CHATS_CONCURRENT_TURNS`.
+    """
+
     def __init__(self, session: ChatSession, user_input: str):
         self.session = session
         self.user_input = user_input
+
+    def safe_run(self):
+        locked = self.acquire_session_lock()
+        try:
+            return super().safe_run()
+        finally:
+            if locked:
+                self.release_session_lock()
+
+    def safe_stream(self) -> Iterator[str]:
+        locked = self.acquire_session_lock()
+        try:
+            yield from super().safe_stream()
+        finally:
+            if locked:
+                self.release_session_lock()
+
+    async def asafe_run(self):
+        # The lock is held by the Django database connection, which is only usable in sync code.
+        locked = await sync_to_async(self.acquire_session_lock)()
+        try:
+            return await super().asafe_run()
+        finally:
+            if locked:
+                await sync_to_async(self.release_session_lock)()
+
+    def acquire_session_lock(self) -> bool:
+        """
+        Lock the session for the turn. Returns whether it was locked, raises
+        ChatSessionBusyException if it's busy with another turn.
+        """
+        policy = app_settings.CHATS_CONCURRENT_TURNS
+        if policy == "allow":
+            return False
+        timeout = 0 if policy == "reject" else app_settings.CHATS_TURN_LOCK_TIMEOUT
+        if not acquire_thread_lock(str(self.session.id), "turn", timeout=timeout):
+            raise ChatSessionBusyException(
+                f"Chat session {self.session.id} is busy with another message."
+            )
+        return True
+
+    def release_session_lock(self):
+        release_thread_lock(str(self.session.id), "turn")
@@ -4,3 +4,12 @@ class LLMChatInterfaceException(Exception):
     """
 
     pass
+
+
+class ChatSessionBusyException(LLMChatInterfaceException):
+    """
+    Raised when a chat session is busy with another turn (see
+    `BASEAPP_AI_LANGKIT_CHATS_CONCURRENT_TURNS`).
+    """
+
+    pass
@@ -1,3 +1,4 @@
+import asyncio
 import copy
 from abc import ABC, abstractmethod
 from typing import List, Optional, Union
@@ -105,3 +106,9 @@ class LLMNodeInterface(ABC):
     @abstractmethod
     def invoke(self, messages: List[AnyMessage], *args, **kwargs) -> AIMessage:
         pass
+
+    async def ainvoke(self, messages: List[AnyMessage], *args, **kwargs) -> AIMessage:
+        """
+        Async version of `invoke`. Runs `invoke` in a thread unless overridden.
+        """
+        return await asyncio.to_thread(self.invoke, messages, *args, **kwargs)
@@ -0,0 +1,12 @@
+from typing import Callable
+
+from django.db import transaction
+
+
+def invalidate_now_and_on_commit(invalidate: Callable[[], None], using: str) -> None:
+    """
+    Invalidate a cache from a model signal, and again once the transaction is committed, in
+    case another thread cached the old rows meanwhile.
+    """
+    invalidate()
+    transaction.on_commit(invalidate, using=using)
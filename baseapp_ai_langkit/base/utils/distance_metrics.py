@@ -0,0 +1,68 @@
+from typing import List, Sequence, Type, Union
+
+import numpy as np
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from pgvector.django import CosineDistance, L2Distance, MaxInnerProduct
+
+
+class DistanceMetric(models.TextChoices):
+    """
+    Distance metrics supported for vector similarity searches.
+
+    `INNER_PRODUCT` requires the stored and query vectors to be L2-normalized, in which case it
+    ranks exactly like `COSINE` but skips the per-row norm computation. Note that pgvector's
+    `<#>` operator returns the *negative* inner product, so for normalized vectors
+    `cosine distance = negative inner product + 1`.
+    """
+
+    COSINE = "cosine", _("Cosine distance")
+    INNER_PRODUCT = "inner_product", _("Inner product (normalized vectors)")
+    L2 = "l2", _("Euclidean distance")
+
+
+DISTANCE_EXPRESSIONS = {
+    DistanceMetric.COSINE: CosineDistance,
+    DistanceMetric.INNER_PRODUCT: MaxInnerProduct,
+    DistanceMetric.L2: L2Distance,
+}
+
+# pgvector operator classes to use in HNSW/IVFFlat indexes for each metric.
+INDEX_OPCLASSES = {
+    DistanceMetric.COSINE: "vector_cosine_ops",
+    DistanceMetric.INNER_PRODUCT: "vector_ip_ops",
+    DistanceMetric.L2: "vector_l2_ops",
+}
+
+
+def get_distance_expression(metric: Union[DistanceMetric, str]) -> Type[models.Func]:
+    return DISTANCE_EXPRESSIONS[DistanceMetric(metric)]
+
+
+def get_index_opclass(metric: Union[DistanceMetric, str]) -> str:
+    return INDEX_OPCLASSES[DistanceMetric(metric)]
+
+
+def requires_normalized_vectors(metric: Union[DistanceMetric, str]) -> bool:
+    return DistanceMetric(metric) == DistanceMetric.INNER_PRODUCT
+
+
+def to_cosine_distance_threshold(metric: Union[DistanceMetric, str], threshold: float) -> float:
+    """
+    Translate a cosine distance threshold into the scale of the given metric's distance, for
+    the metrics where it can be done (i.e. inner product over normalized vectors).
+    """
+    if DistanceMetric(metric) == DistanceMetric.INNER_PRODUCT:
+        return threshold - 1
+    return threshold
+
+
+def normalize_vectors(vectors: Sequence[Sequence[float]]) -> List[List[float]]:
+    """
+    L2-normalize the given vectors. Zero vectors are returned as is.
+    """
+    if len(vectors) == 0:
+        return []
+    array = np.asarray(vectors, dtype=np.float64)
+    norms = np.linalg.norm(array, axis=1, keepdims=True)
+    return (array / np.where(norms == 0, 1, norms)).tolist()
@@ -0,0 +1,32 @@
+"""
+Helpers for the resources bound to an event loop (e.g. async connection pools or HTTP clients),
+of which `asyncio.run` and `async_to_sync` create a new one for every call.
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import AsyncIterator, Awaitable, Callable
+
+# Started shutdown hooks of each loop. Loops only keep weak references to their async
+# generators.
+_shutdown_hooks: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_shutdown_hooks_lock = threading.Lock()
+
+
+async def on_loop_shutdown(callback: Callable[[], Awaitable[None]]) -> None:
+    """
+    Await `callback` in the running event loop when it shuts down its async generators, which
+    `asyncio.run` and `async_to_sync` do before closing it.
+    """
+    hook = _run_on_shutdown(callback)
+    with _shutdown_hooks_lock:
+        _shutdown_hooks.setdefault(asyncio.get_running_loop(), []).append(hook)
+    await hook.__anext__()
+
+
+async def _run_on_shutdown(callback: Callable[[], Awaitable[None]]) -> AsyncIterator[None]:
+    try:
+        yield
+    finally:
+        await callback()
@@ -0,0 +1,144 @@
+"""
+Process-wide registry of the LLM clients used by the runners, so each turn reuses the same
+chat model and its keep-alive HTTP connections to the provider instead of paying a new TCP and
+TLS handshake.
+"""
+
+import asyncio
+import logging
+import threading
+import weakref
+from functools import lru_cache
+from typing import Any, Dict, Hashable, Optional, Type, TypeVar
+
+import httpx
+import openai
+from langchain_core.language_models import BaseLanguageModel
+from langchain_openai import ChatOpenAI
+
+from baseapp_ai_langkit import app_settings
+from baseapp_ai_langkit.base.utils.event_loops import on_loop_shutdown
+
+logger = logging.getLogger(__name__)
+
+LLMType = TypeVar("LLMType", bound=BaseLanguageModel)
+
+_llms: Dict[Hashable, BaseLanguageModel] = {}
+_llms_lock = threading.Lock()
+# HTTP clients sending the async requests, by event loop.
+_loop_async_http_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def is_http2_enabled() -> bool:
+    """
+    HTTP/2 multiplexes the concurrent requests to the provider over one connection. It requires
+    the `h2` package (`pip install httpx[http2]`).
+    """
+    if not app_settings.LLM_CLIENT_HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@lru_cache(maxsize=None)
+def get_http_client() -> httpx.Client:
+    return openai.DefaultHttpxClient(http2=is_http2_enabled())
+
+
+class LoopBoundAsyncHttpxClient(openai.DefaultAsyncHttpxClient):
+    """
+    Async HTTP client sending the requests with a client of the running event loop, since the
+    pooled connections of an `httpx.AsyncClient` can only be used from the loop that opened them.
+    """
+
+    async def send(self, request: httpx.Request, **kwargs: Any) -> httpx.Response:
+        client = await aget_loop_async_http_client()
+        return await client.send(request, **kwargs)
+
+
+@lru_cache(maxsize=None)
+def get_async_http_client() -> httpx.AsyncClient:
+    return LoopBoundAsyncHttpxClient()
+
+
+async def aget_loop_async_http_client() -> httpx.AsyncClient:
+    """
+    Get (creating it on first use) the HTTP client of the running event loop, closed when the
+    loop shuts down.
+    """
+    loop = asyncio.get_running_loop()
+    client = _loop_async_http_clients.get(loop)
+    if client is None:
+        client = _loop_async_http_clients[loop] = openai.DefaultAsyncHttpxClient(
+            http2=is_http2_enabled()
+        )
+        await on_loop_shutdown(client.aclose)
+    return client
+
+
+def get_llm(llm_class: Type[LLMType] = ChatOpenAI, **kwargs: Any) -> LLMType:
+    """
+    Get the shared instance of `llm_class` for the given kwargs, creating it on first use.
+    Models accepting `http_client` and `http_async_client` (e.g. ChatOpenAI) get the shared
+    HTTP clients unless others are given. Kwargs that can't be hashed (e.g. callbacks) aren't
+    shared, a new instance is created every time.
+    """
+    try:
+        key = (llm_class, _freeze(kwargs))
+    except TypeError:
+        return _create_llm(llm_class, kwargs)
+
+    llm = _llms.get(key)
+    if llm is not None:
+        return llm
+    with _llms_lock:
+        llm = _llms.get(key)
+        if llm is None:
+            llm = _llms[key] = _create_llm(llm_class, kwargs)
+            logger.debug(f"Created shared {llm_class.__name__} for {kwargs}")
+    return llm
+
+
+def get_summarization_llm(llm_class: Type[LLMType] = ChatOpenAI) -> Optional[LLMType]:
+    """
+    Get the shared llm summarizing the chat conversations, set by
+    `BASEAPP_AI_LANGKIT_CHATS_SUMMARIZATION_MODEL`. None summarizes them with the chat llm.
+    """
+    if not app_settings.CHATS_SUMMARIZATION_MODEL:
+        return None
+    return get_llm(llm_class, model=app_settings.CHATS_SUMMARIZATION_MODEL, temperature=0)
+
+
+def clear_llms():
+    with _llms_lock:
+        _llms.clear()
+
+
+def _create_llm(llm_class: Type[LLMType], kwargs: dict) -> LLMType:
+    fields = getattr(llm_class, "model_fields", {})
+    if (
+        "http_client" in fields
+        and "http_async_client" in fields
+        and not kwargs.get("http_client")
+        and not kwargs.get("http_async_client")
+    ):
+        kwargs = {
+            **kwargs,
+            "http_client": get_http_client(),
+            "http_async_client": get_async_http_client(),
+        }
+    return llm_class(**kwargs)
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    hash(value)
+    return value
@@ -0,0 +1,76 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+from django.test import TestCase, override_settings
+from langchain_openai import ChatOpenAI
+
+from baseapp_ai_langkit.base.utils.llm_clients import (
+    clear_llms,
+    get_async_http_client,
+    get_http_client,
+    get_llm,
+    get_summarization_llm,
+    is_http2_enabled,
+)
+
+
+@override_settings(OPENAI_API_KEY="test")
+@patch.dict("os.environ", {"OPENAI_API_KEY": "test"})
+class TestLLMClients(TestCase):
+    def setUp(self):
+        clear_llms()
+
+    def test_llms_are_shared_by_config(self):
+        llm = get_llm(ChatOpenAI, model="gpt-4o-mini", temperature=0)
+
+        self.assertIs(get_llm(ChatOpenAI, temperature=0, model="gpt-4o-mini"), llm)
+        self.assertIsNot(get_llm(ChatOpenAI, model="gpt-4o-mini", temperature=1), llm)
+        self.assertIsNot(get_llm(ChatOpenAI, model="gpt-4o", temperature=0), llm)
+
+    def test_summarization_llm_setting(self):
+        self.assertIsNone(get_summarization_llm())
+        with self.settings(BASEAPP_AI_LANGKIT_CHATS_SUMMARIZATION_MODEL="gpt-4.1-nano"):
+            llm = get_summarization_llm()
+            self.assertEqual(llm.model_name, "gpt-4.1-nano")
+            self.assertIs(get_summarization_llm(), llm)
+
+    def test_llms_share_the_http_clients(self):
+        llm = get_llm(ChatOpenAI, model="gpt-4o-mini")
+        other = get_llm(ChatOpenAI, model="gpt-4o")
+
+        self.assertIs(llm.http_client, get_http_client())
+        self.assertIs(llm.http_async_client, get_async_http_client())
+        self.assertIs(other.root_client._client, llm.root_client._client)
+
+    def test_async_requests_use_a_client_per_event_loop(self):
+        clients = []
+
+        def create_client(**kwargs):
+            transport = httpx.MockTransport(lambda request: httpx.Response(200))
+            clients.append(httpx.AsyncClient(transport=transport))
+            return clients[-1]
+
+        async def request():
+            return await get_async_http_client().get("https://api.openai.com/v1/models")
+
+        with patch(
+            "baseapp_ai_langkit.base.utils.llm_clients.openai.DefaultAsyncHttpxClient",
+            side_effect=create_client,
+        ):
+            self.assertEqual(asyncio.run(request()).status_code, 200)
+            self.assertEqual(asyncio.run(request()).status_code, 200)
+
+        self.assertEqual(len(clients), 2)
+        self.assertTrue(all(client.is_closed for client in clients))
+
+    def test_unhashable_config_is_not_shared(self):
+        kwargs = {"model": "gpt-4o-mini", "metadata": {"data": bytearray(b"unhashable")}}
+
+        self.assertIsNot(get_llm(ChatOpenAI, **kwargs), get_llm(ChatOpenAI, **kwargs))
+
+    def test_http2_requires_h2(self):
+        with patch.dict("sys.modules", {"h2": None}):
+            self.assertFalse(is_http2_enabled())
+        with override_settings(BASEAPP_AI_LANGKIT_LLM_CLIENT_HTTP2=False):
+            self.assertFalse(is_http2_enabled())
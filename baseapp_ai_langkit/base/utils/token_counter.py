@@ -0,0 +1,56 @@
+import logging
+from functools import lru_cache
+from typing import Optional
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENCODING_NAME = "o200k_base"
+# Rough characters-per-token ratio used when no tokenizer is available.
+APPROXIMATE_CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=None)
+def get_encoding(encoding_name: str = DEFAULT_ENCODING_NAME) -> Optional[tiktoken.Encoding]:
+    """
+    Load (once per process) the tiktoken encoding used to count tokens.
+
+    Returns None when the encoding cannot be loaded (e.g. the BPE files cannot be downloaded),
+    in which case token counts fall back to an approximation.
+    """
+    try:
+        return tiktoken.get_encoding(encoding_name)
+    except Exception as e:
+        logger.warning(f"Could not load tiktoken encoding '{encoding_name}': {e}")
+        return None
+
+
+@lru_cache(maxsize=8192)
+def count_tokens(text: str, encoding_name: str = DEFAULT_ENCODING_NAME) -> int:
+    """
+    Count the tokens of the given text. Results are cached, so repeated chunks (e.g. the same
+    vector store documents being retrieved over and over) are only tokenized once.
+    """
+    if not text:
+        return 0
+    encoding = get_encoding(encoding_name)
+    if encoding is None:
+        return -(-len(text) // APPROXIMATE_CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(
+    text: str, max_tokens: int, encoding_name: str = DEFAULT_ENCODING_NAME
+) -> str:
+    """
+    Truncate the given text so it fits in `max_tokens` tokens.
+    """
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text, encoding_name) <= max_tokens:
+        return text
+    encoding = get_encoding(encoding_name)
+    if encoding is None:
+        return text[: max_tokens * APPROXIMATE_CHARS_PER_TOKEN]
+    return encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
@@ -14,9 +14,15 @@ class MessagesWorker(BaseWorker):
     """
 
     def invoke(self, messages: List[AnyMessage], state: dict = {}) -> AIMessage:
+        return self.llm.invoke(self.get_llm_messages(messages, state), config=self.config)
+
+    async def ainvoke(self, messages: List[AnyMessage], state: dict = {}) -> AIMessage:
+        return await self.llm.ainvoke(self.get_llm_messages(messages, state), config=self.config)
+
+    def get_llm_messages(self, messages: List[AnyMessage], state: dict) -> List[AnyMessage]:
         state_modifiers = self.get_state_modifier_list()
         for state_modifier in state_modifiers:
             state_modifier.placeholders_data.update(state)
 
         state_modifier = self.get_state_modifier_system_message()
-        return self.llm.invoke(state_modifier + messages, config=self.config)
+        return state_modifier + messages
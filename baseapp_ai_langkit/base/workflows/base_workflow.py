@@ -1,10 +1,50 @@
+import functools
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, Type
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Type
 
 from langchain_core.runnables import RunnableConfig
+from langgraph.config import get_config
 from langgraph.graph import StateGraph
 from langgraph.graph.state import CompiledStateGraph
 
+# Compiled graphs shared by the workflows with the same cache key, most recently used last.
+WORKFLOW_CHAIN_CACHE_SIZE = 128
+_workflow_chains: "OrderedDict[Hashable, CompiledStateGraph]" = OrderedDict()
+_workflow_chains_lock = threading.Lock()
+
+# Key of the run config holding the workflow whose graph is running, which the dispatched
+# actions run on. Configurable keys starting with "__" aren't saved in the checkpoints.
+WORKFLOW_CONFIG_KEY = "__baseapp_ai_langkit_workflow"
+
+
+def clear_workflow_chain_cache():
+    with _workflow_chains_lock:
+        _workflow_chains.clear()
+
+
+def is_dispatched_action(func: Optional[Callable]) -> bool:
+    if func is None:
+        return True
+    if isinstance(func, functools.partial):
+        # Sync functions run in an executor by async graphs.
+        return is_dispatched_action(func.args[-1] if func.args else func.func)
+    return getattr(func, "dispatched_action", False)
+
+
+def get_running_workflow() -> "BaseWorkflow":
+    """
+    The workflow running the current graph, taken from the run config.
+    """
+    workflow = get_config().get("configurable", {}).get(WORKFLOW_CONFIG_KEY)
+    if workflow is None:
+        raise RuntimeError(
+            "Workflow graphs must run with the workflow's `get_run_config()`, their compiled "
+            "graph can be shared with other workflows."
+        )
+    return workflow
+
 
 class BaseWorkflow(ABC):
     """
@@ -22,6 +62,8 @@ class BaseWorkflow(ABC):
     Methods:
         setup_workflow() -> StateGraph: Setup the workflow.
         setup_workflow_chain() -> CompiledStateGraph: Setup the compiled workflow.
+        get_workflow_chain_cache_key() -> Hashable: Key to share the compiled workflow.
+        get_run_config() -> RunnableConfig: The config to run the compiled workflow with.
         get_state() -> Any: Get the state of the workflow.
         execute(*args, **kwargs) -> Any: Execute the workflow.
     """
@@ -30,13 +72,29 @@ class BaseWorkflow(ABC):
     workflow: StateGraph
     workflow_chain: CompiledStateGraph
 
+    # Share the compiled workflow between the instances with the same cache key instead of
+    # building it for each one. Only the workflows whose nodes and conditional edges are all
+    # registered with `dispatch` (or `adispatch`) are shared, so they run on the workflow
+    # executing the graph rather than on the one that built it. The graph must be run with
+    # `get_run_config()` for them to find it.
+    cache_workflow_chain: bool = True
+
     def __init__(
         self,
         config: RunnableConfig,
     ):
         self.config = config
+        cache_key = self.get_workflow_chain_cache_key() if self.cache_workflow_chain else None
+        workflow_chain = self._get_cached_workflow_chain(cache_key)
+        if workflow_chain is not None:
+            self.workflow = workflow_chain.builder
+            self.workflow_chain = workflow_chain
+            return
+
         self.setup_workflow()
         self.setup_workflow_chain()
+        if cache_key is not None and self._is_workflow_dispatched():
+            self._set_cached_workflow_chain(cache_key, self.workflow_chain)
 
     def setup_workflow(self) -> StateGraph:
         self.workflow = StateGraph(self.state_graph_schema)
@@ -49,9 +107,82 @@ class BaseWorkflow(ABC):
     def setup_workflow_chain(self) -> CompiledStateGraph:
         self.workflow_chain = self.workflow.compile()
 
+    def get_run_config(self) -> RunnableConfig:
+        """
+        The workflow's config, with the workflow the dispatched actions run on.
+        """
+        return {
+            **self.config,
+            "configurable": {**self.config.get("configurable", {}), WORKFLOW_CONFIG_KEY: self},
+        }
+
     def get_state(self):
         return self.workflow_chain.get_state(self.config)
 
+    def get_workflow_chain_cache_key(self) -> Optional[Hashable]:
+        """
+        Everything that changes the graph built by the workflow. None doesn't share it.
+        """
+        return (self.__class__,)
+
+    def dispatch(self, get_action: Callable[["BaseWorkflow"], Callable]) -> Callable:
+        """
+        Wrap a graph action (node or conditional edge) so it's taken from the workflow running
+        the graph, e.g. `self.dispatch(lambda workflow: workflow.workflow_node_name)`. The action
+        doesn't reference this workflow, so a shared graph doesn't keep it alive.
+        """
+
+        def action(state):
+            return get_action(get_running_workflow())(state)
+
+        return self._as_dispatched_action(action, get_action)
+
+    def adispatch(self, get_action: Callable[["BaseWorkflow"], Callable]) -> Callable:
+        """
+        Async version of `dispatch`.
+        """
+
+        async def action(state):
+            return await get_action(get_running_workflow())(state)
+
+        return self._as_dispatched_action(action, get_action)
+
+    def _as_dispatched_action(self, action: Callable, get_action: Callable) -> Callable:
+        # Named after the action (LangGraph names the conditional edges after their function).
+        action.__name__ = action.__qualname__ = getattr(get_action(self), "__name__", "action")
+        action.dispatched_action = True
+        return action
+
+    def _is_workflow_dispatched(self) -> bool:
+        for node in self.workflow.nodes.values():
+            runnable = node.runnable
+            if not is_dispatched_action(
+                getattr(runnable, "func", None)
+            ) or not is_dispatched_action(getattr(runnable, "afunc", None)):
+                return False
+        for branches in self.workflow.branches.values():
+            for branch in branches.values():
+                if not is_dispatched_action(getattr(branch.path, "func", None)):
+                    return False
+        return True
+
+    @staticmethod
+    def _get_cached_workflow_chain(cache_key: Optional[Hashable]) -> Optional[CompiledStateGraph]:
+        if cache_key is None:
+            return None
+        with _workflow_chains_lock:
+            workflow_chain = _workflow_chains.get(cache_key)
+            if workflow_chain is not None:
+                _workflow_chains.move_to_end(cache_key)
+            return workflow_chain
+
+    @staticmethod
+    def _set_cached_workflow_chain(cache_key: Hashable, workflow_chain: CompiledStateGraph):
+        with _workflow_chains_lock:
+            _workflow_chains[cache_key] = workflow_chain
+            while len(_workflow_chains) > WORKFLOW_CHAIN_CACHE_SIZE:
+                _workflow_chains.popitem(last=False)
+
     @abstractmethod
     def execute(self, *args, **kwargs):
         pass
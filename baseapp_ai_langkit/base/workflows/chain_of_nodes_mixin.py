@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import END, START
 
 from baseapp_ai_langkit.base.interfaces.llm_node import LLMNodeInterface
@@ -12,7 +13,17 @@ class ChainOfNodesMixin(ABC):
         node_slugs = list(self.nodes.keys())
 
         for slug, node in self.nodes.items():
-            self.workflow.add_node(slug, self.invoke_node(node))
+            # Bind the slug now, the node instance is taken from the running workflow.
+            func = self.dispatch(
+                lambda workflow, slug=slug: workflow.invoke_node(workflow.nodes[slug])
+            )
+            if self.ainvoke_node(node) is None:
+                self.workflow.add_node(slug, func)
+            else:
+                afunc = self.adispatch(
+                    lambda workflow, slug=slug: workflow.ainvoke_node(workflow.nodes[slug])
+                )
+                self.workflow.add_node(slug, RunnableLambda(func, afunc=afunc))
 
         for i, slug in enumerate(node_slugs):
             if i == 0:
@@ -23,6 +34,17 @@ class ChainOfNodesMixin(ABC):
             else:
                 self.workflow.add_edge(node_slugs[i - 1], slug)
 
+    def get_workflow_chain_cache_key(self):
+        key = super().get_workflow_chain_cache_key()
+        return key and (*key, tuple(self.nodes.keys()))
+
     @abstractmethod
     def invoke_node(self, node: LLMNodeInterface):
         pass
+
+    def ainvoke_node(self, node: LLMNodeInterface):
+        """
+        Optionally return the async version of `invoke_node`, used when the workflow runs with
+        `ainvoke`. Otherwise the sync one runs in a thread.
+        """
+        return None
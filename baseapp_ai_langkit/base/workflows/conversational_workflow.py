@@ -1,13 +1,42 @@
+import contextlib
+import functools
+import logging
+from typing import Callable, ContextManager, Iterator, Optional, Tuple
+
 from langchain_core.language_models import BaseLanguageModel
-from langchain_core.messages import HumanMessage, RemoveMessage, SystemMessage
+from langchain_core.messages import (
+    BaseMessage,
+    BaseMessageChunk,
+    HumanMessage,
+    RemoveMessage,
+    SystemMessage,
+    trim_messages,
+)
+from langchain_core.runnables import RunnableLambda
 from langgraph.checkpoint.postgres import PostgresSaver
 from langgraph.graph import END, MessagesState
+from langgraph.types import Durability
 
+from baseapp_ai_langkit.base.utils.token_counter import (
+    count_tokens,
+    truncate_to_tokens,
+)
 from baseapp_ai_langkit.base.workflows.base_workflow import BaseWorkflow
 
+logger = logging.getLogger(__name__)
+
 
 class ConversationState(MessagesState):
     summary: str
+    # Number of leading messages already covered by the summary (the summary message itself and
+    # the retained messages).
+    summarized_messages: int
+    # Number of leading messages whose tokens were already added to `token_count`.
+    counted_messages: int
+    # Tokens of the messages not covered by the summary, tracked incrementally.
+    token_count: int
+    # Input, output and total tokens used to generate the latest summary.
+    summary_usage: dict
 
 
 class ConversationalWorkflow(BaseWorkflow):
@@ -21,16 +50,32 @@ class ConversationalWorkflow(BaseWorkflow):
     - add_memory_summarization_edges
 
     Args:
-        llm (BaseLanguageModel): The llm to exec the summarization node.
+        llm (BaseLanguageModel): The llm of the workflow, also used to summarize the
+            conversation if no `summarization_llm` is given.
         checkpointer (PostgresSaver): The checkpointer to store the conversation state.
         max_messages (int): Defines the limit to trigger the summarization node.
         retained_messages (int): Defines the number of messages to keep in the memory.
+        max_tokens (int): Tokens of the messages not yet summarized that trigger the
+            summarization node. When set, it's used instead of `max_messages`.
+        background_summarization (bool): Don't summarize the conversation during the turns, it's
+            summarized afterwards with `summarize_thread` (e.g. in a Celery task).
+        summarization_llm (BaseLanguageModel): A (usually cheaper) llm to summarize the
+            conversation.
+        summarization_max_input_tokens (int): Maximum tokens of the messages sent to be
+            summarized. The oldest messages not summarized yet are left out to fit it.
+        durability (str): When the checkpoints are saved ("sync", "async" or "exit"). Defaults
+            to the checkpointer's `durability`, if any, otherwise LangGraph's default.
     """
 
     llm: BaseLanguageModel
     checkpointer: PostgresSaver
     max_messages: int
     retained_messages: int
+    max_tokens: Optional[int]
+    background_summarization: bool
+    summarization_llm: BaseLanguageModel
+    summarization_max_input_tokens: Optional[int]
+    durability: Optional[Durability]
 
     error: Exception = None
 
@@ -40,6 +85,11 @@ class ConversationalWorkflow(BaseWorkflow):
         checkpointer: PostgresSaver,
         max_messages: int = 6,
         retained_messages: int = 2,
+        durability: Optional[Durability] = None,
+        max_tokens: Optional[int] = None,
+        background_summarization: bool = False,
+        summarization_llm: Optional[BaseLanguageModel] = None,
+        summarization_max_input_tokens: Optional[int] = None,
         *args,
         **kwargs,
     ):
@@ -47,6 +97,11 @@ class ConversationalWorkflow(BaseWorkflow):
         self.checkpointer = checkpointer
         self.max_messages = max_messages
         self.retained_messages = retained_messages
+        self.max_tokens = max_tokens
+        self.background_summarization = background_summarization
+        self.summarization_llm = summarization_llm or llm
+        self.summarization_max_input_tokens = summarization_max_input_tokens
+        self.durability = durability or getattr(checkpointer, "durability", None)
         super().__init__(*args, **kwargs)
 
     @property
@@ -56,12 +111,89 @@ class ConversationalWorkflow(BaseWorkflow):
     def setup_workflow_chain(self):
         self.workflow_chain = self.workflow.compile(checkpointer=self.checkpointer)
 
+    def get_workflow_chain_cache_key(self):
+        key = super().get_workflow_chain_cache_key()
+        # The Postgres savers are created for each turn, but the ones of a same class and
+        # connection pool are interchangeable.
+        checkpointer = self.checkpointer
+        if hasattr(checkpointer, "conn"):
+            checkpointer = (type(checkpointer), checkpointer.conn)
+        return key and (*key, checkpointer)
+
     def workflow_node_maybe_rollback_memory(self, state: ConversationState):
         if self.error:
             state["messages"] = state["messages"] + [RemoveMessage(id=state["messages"][-1].id)]
+        else:
+            state.update(self.get_token_count_update(state))
         return state
 
+    def get_token_count_update(self, state: ConversationState) -> dict:
+        """
+        Add the tokens of the messages added since the last count to `token_count`, so each
+        message is only tokenized once.
+        """
+        messages = state["messages"]
+        counted_messages = state.get("counted_messages") or 0
+        if counted_messages > len(messages):
+            # The messages were replaced without updating the counters (e.g. by a subclass).
+            counted_messages = state.get("summarized_messages") or 0
+            token_count = 0
+        else:
+            token_count = state.get("token_count") or 0
+        return {
+            "counted_messages": len(messages),
+            "token_count": token_count
+            + sum(self.count_message_tokens(message) for message in messages[counted_messages:]),
+        }
+
+    def count_message_tokens(self, message: BaseMessage) -> int:
+        return count_tokens(message.text)
+
+    def count_messages_tokens(self, messages: list[BaseMessage]) -> int:
+        return sum(self.count_message_tokens(message) for message in messages)
+
     def workflow_node_summarize_conversation(self, state: ConversationState):
+        messages = self.get_summarization_messages(state)
+        summary_response = self.summarization_llm.invoke(messages)
+        return self.get_summarized_state(
+            state,
+            summary_response.content,
+            summary_usage=self.get_summary_usage(messages, summary_response),
+        )
+
+    async def aworkflow_node_summarize_conversation(self, state: ConversationState):
+        messages = self.get_summarization_messages(state)
+        summary_response = await self.summarization_llm.ainvoke(messages)
+        return self.get_summarized_state(
+            state,
+            summary_response.content,
+            summary_usage=self.get_summary_usage(messages, summary_response),
+        )
+
+    def get_summary_usage(self, messages: list, summary_response: BaseMessage) -> dict:
+        """
+        Tokens used to generate the summary, as reported by the llm or, if it doesn't report
+        them, as counted by `count_message_tokens`.
+        """
+        usage_metadata = getattr(summary_response, "usage_metadata", None)
+        if usage_metadata:
+            usage = {
+                "input_tokens": usage_metadata["input_tokens"],
+                "output_tokens": usage_metadata["output_tokens"],
+            }
+        else:
+            usage = {
+                "input_tokens": self.count_messages_tokens(messages),
+                "output_tokens": self.count_message_tokens(summary_response),
+            }
+        usage["total_tokens"] = usage["input_tokens"] + usage["output_tokens"]
+        logger.info(
+            f"Summarized the conversation of thread "
+            f"{self.config.get('configurable', {}).get('thread_id')}: {usage}"
+        )
+        return usage
+
+    def get_summarization_messages(self, state: ConversationState) -> list:
         summary = state.get("summary", "")
         if summary:
             summary_message = (
@@ -73,12 +205,52 @@ class ConversationalWorkflow(BaseWorkflow):
                 "Summarize the conversation above, remember to keep key information about the user:"
             )
 
-        # 1. Create summary prompt invoke.
+        # 1. Create summary prompt invoke, only with the messages not covered by the summary yet.
         summarization_prompt = HumanMessage(content=summary_message)
-        messages_for_llm = state["messages"] + [summarization_prompt]
-        summary_response = self.llm.invoke(messages_for_llm)
-        new_summary = summary_response.content
+        messages = self.get_messages_to_summarize(state)
+        if self.summarization_max_input_tokens:
+            messages = self.trim_messages_to_summarize(
+                messages,
+                self.summarization_max_input_tokens
+                - self.count_message_tokens(summarization_prompt),
+            )
+        return messages + [summarization_prompt]
+
+    def trim_messages_to_summarize(self, messages: list, max_tokens: int) -> list:
+        """
+        Keep the latest messages that fit in `max_tokens`. If not even the last one fits, it's
+        truncated.
+        """
+        trimmed_messages = trim_messages(
+            messages, max_tokens=max(max_tokens, 0), token_counter=self.count_messages_tokens
+        )
+        if not trimmed_messages and messages:
+            last_message = messages[-1]
+            trimmed_messages = [
+                last_message.model_copy(
+                    update={"content": truncate_to_tokens(last_message.text, max_tokens)}
+                )
+            ]
+        return trimmed_messages
+
+    def get_messages_to_summarize(self, state: ConversationState) -> list:
+        summarized_messages = state.get("summarized_messages") or 0
+        if summarized_messages > len(state["messages"]):
+            summarized_messages = 0
+        return state["messages"][summarized_messages:]
 
+    def get_summarized_state(
+        self,
+        state: ConversationState,
+        new_summary: str,
+        new_messages: list = (),
+        summary_usage: Optional[dict] = None,
+    ) -> dict:
+        """
+        State update replacing the summarized messages with the summary and the retained
+        messages. `new_messages` are the messages added after `state` was summarized, which are
+        kept after them.
+        """
         # 2. Select the messages we want to keep.
         messages_to_keep = state["messages"][-self.retained_messages :]
         reinserted_messages = []
@@ -87,28 +259,52 @@ class ConversationalWorkflow(BaseWorkflow):
             reinserted_messages.append(new_msg)
 
         # 3. Remove all messages from the state (needed since the summary would be mandatorily inserted at the end).
-        remove_all = [RemoveMessage(id=m.id) for m in state["messages"]]
+        remove_all = [RemoveMessage(id=m.id) for m in [*state["messages"], *new_messages]]
+        reinserted_new_messages = [msg.model_copy(update={"id": None}) for msg in new_messages]
 
         # 4. Create the summary message that would appear at the top of the conversation.
         new_summary_message = SystemMessage(
             content=f"Updated conversation summary:\n\n{new_summary}"
         )
 
-        # 5. Update the state.
-        return {
+        # 5. Update the state. The remaining messages are all covered by the new summary.
+        kept_messages = 1 + len(reinserted_messages)
+        update = {
             "summary": new_summary,
-            "messages": remove_all + [new_summary_message] + reinserted_messages,
+            "messages": remove_all
+            + [new_summary_message]
+            + reinserted_messages
+            + reinserted_new_messages,
+            "summarized_messages": kept_messages,
+            "counted_messages": kept_messages,
+            "token_count": 0,
         }
+        if summary_usage is not None:
+            update["summary_usage"] = summary_usage
+        return update
 
     def add_memory_summarization_nodes(self):
-        self.workflow.add_node("maybe_rollback_memory", self.workflow_node_maybe_rollback_memory)
-        self.workflow.add_node("summarize_conversation", self.workflow_node_summarize_conversation)
+        self.workflow.add_node(
+            "maybe_rollback_memory",
+            self.dispatch(lambda workflow: workflow.workflow_node_maybe_rollback_memory),
+        )
+        self.workflow.add_node(
+            "summarize_conversation",
+            RunnableLambda(
+                self.dispatch(lambda workflow: workflow.workflow_node_summarize_conversation),
+                afunc=self.adispatch(
+                    lambda workflow: workflow.aworkflow_node_summarize_conversation
+                ),
+            ),
+        )
 
     def add_memory_summarization_edges(self, start_point: str, end_point: str = END):
         self.workflow.add_edge(start_point, "maybe_rollback_memory")
         self.workflow.add_conditional_edges(
             "maybe_rollback_memory",
-            self.get_should_summarize_conditional_edge(end_point),
+            self.dispatch(
+                lambda workflow: workflow.get_should_summarize_conditional_edge(end_point)
+            ),
             ["summarize_conversation", end_point],
         )
         self.workflow.add_edge("summarize_conversation", end_point)
@@ -120,16 +316,116 @@ class ConversationalWorkflow(BaseWorkflow):
         """
 
         def should_summarize(state: ConversationState) -> str:
-            if self.error:
+            if self.error or self.background_summarization:
                 return end_point
-            messages = state["messages"]
-            return "summarize_conversation" if len(messages) > self.max_messages else end_point
+            return "summarize_conversation" if self.should_summarize(state) else end_point
 
         return should_summarize
 
+    def should_summarize(self, state: ConversationState) -> bool:
+        if self.max_tokens is not None:
+            return (state.get("token_count") or 0) > self.max_tokens
+        return len(state["messages"]) > self.max_messages
+
+    def summarize_thread(
+        self, update_lock: Optional[Callable[[], ContextManager[bool]]] = None
+    ) -> Optional[dict]:
+        """
+        Summarize the conversation of the thread outside of a turn, if it needs it. The messages
+        added to the thread while the summary is generated are kept after it, and the summary is
+        discarded if the summarized messages changed meanwhile.
+
+        `update_lock` returns a context manager yielding whether it locked the thread's turns
+        (see `chats.thread_locks`). It's only held while the thread is re-read and the summary
+        saved, so turns keep running while the summary is generated, and no turn saves its state
+        over the summary. Callers must make sure the same thread isn't summarized concurrently.
+
+        Returns the state update, or None if the conversation wasn't summarized.
+        """
+        state = self.workflow_chain.get_state(self.config).values
+        if not state.get("messages") or not self.should_summarize(state):
+            return None
+
+        messages = self.get_summarization_messages(state)
+        summary_response = self.summarization_llm.invoke(messages)
+
+        thread_id = self.config["configurable"]["thread_id"]
+        update_lock = update_lock or functools.partial(contextlib.nullcontext, True)
+        with update_lock() as locked:
+            if not locked:
+                logger.info(f"Thread {thread_id} is busy, skipping its summary.")
+                return None
+            latest_messages = self.workflow_chain.get_state(self.config).values["messages"]
+            summarized_ids = [message.id for message in state["messages"]]
+            if [message.id for message in latest_messages[: len(summarized_ids)]] != summarized_ids:
+                logger.warning(
+                    f"Messages of thread {thread_id} changed while summarizing them, skipping "
+                    "the summary."
+                )
+                return None
+
+            update = self.get_summarized_state(
+                state,
+                summary_response.content,
+                new_messages=latest_messages[len(summarized_ids) :],
+                summary_usage=self.get_summary_usage(messages, summary_response),
+            )
+            self.workflow_chain.update_state(
+                self.get_run_config(), update, as_node="summarize_conversation"
+            )
+        return update
+
     def execute(self, prompt: str):
         input_message = HumanMessage(content=prompt)
-        result = self.workflow_chain.invoke({"messages": [input_message]}, self.config)
+        result = self.workflow_chain.invoke(
+            {"messages": [input_message]}, self.get_run_config(), durability=self.durability
+        )
+
+        if self.error:
+            raise self.error
+
+        return result
+
+    def get_streamed_nodes(self) -> Optional[list[str]]:
+        """
+        Nodes whose LLM tokens are streamed by `stream`. None streams every node but the
+        conversation summarization.
+        """
+        return None
+
+    def stream(self, prompt: str) -> Iterator[Tuple[BaseMessageChunk, dict]]:
+        """
+        Execute the workflow yielding the LLM tokens as they're generated, as
+        (message_chunk, metadata) tuples (LangGraph's `stream_mode="messages"`).
+        """
+        streamed_nodes = self.get_streamed_nodes()
+        input_message = HumanMessage(content=prompt)
+        for message_chunk, metadata in self.workflow_chain.stream(
+            {"messages": [input_message]},
+            self.get_run_config(),
+            stream_mode="messages",
+            durability=self.durability,
+        ):
+            node = metadata.get("langgraph_node")
+            if streamed_nodes is None:
+                if node == "summarize_conversation":
+                    continue
+            elif node not in streamed_nodes:
+                continue
+            yield message_chunk, metadata
+
+        if self.error:
+            raise self.error
+
+    async def aexecute(self, prompt: str):
+        """
+        Async counterpart of `execute`. The checkpointer must be an async one
+        (e.g. `AsyncLangGraphCheckpointer`).
+        """
+        input_message = HumanMessage(content=prompt)
+        result = await self.workflow_chain.ainvoke(
+            {"messages": [input_message]}, self.get_run_config(), durability=self.durability
+        )
 
         if self.error:
             raise self.error
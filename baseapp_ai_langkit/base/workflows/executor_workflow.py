@@ -50,4 +50,4 @@ class ExecutorWorkflow(ChainOfNodesMixin, BaseWorkflow):
     def execute(self, state: dict = {}):
         workflow_state = {"output": ""}
         workflow_state.update(state)
-        return self.workflow_chain.invoke(workflow_state, self.config)
+        return self.workflow_chain.invoke(workflow_state, self.get_run_config())
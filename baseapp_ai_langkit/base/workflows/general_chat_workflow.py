@@ -28,6 +28,10 @@ class GeneralChatWorkflow(ChainOfNodesMixin, ConversationalWorkflow):
         self.setup_chain_of_nodes()
         super().setup_workflow_chain()
 
+    def get_streamed_nodes(self):
+        # Only the last node answers the user.
+        return list(self.nodes.keys())[-1:]
+
     def invoke_node(self, node: LLMNodeInterface):
         def format_output(state: ConversationState):
             messages = state["messages"]
@@ -35,3 +39,11 @@ class GeneralChatWorkflow(ChainOfNodesMixin, ConversationalWorkflow):
             return {"messages": messages + [response]}
 
         return format_output
+
+    def ainvoke_node(self, node: LLMNodeInterface):
+        async def aformat_output(state: ConversationState):
+            messages = state["messages"]
+            response = await node.ainvoke(messages, state)
+            return {"messages": messages + [response]}
+
+        return aformat_output
@@ -145,7 +145,8 @@ class OrchestratedConversationalWorkflow(ConversationalWorkflow):
             )
 
             # Clearing is a safety measure to make sure the checkpointer is not storing those
-            # states. However, two concurrent requests from a same session will share this state.
+            # states. Concurrent requests of a same session would share this state, chat runners
+            # run them one at a time (see `BaseChatInterface`).
             state["selected_nodes"].clear()
             state["completed_nodes"].clear()
 
@@ -186,19 +187,29 @@ class OrchestratedConversationalWorkflow(ConversationalWorkflow):
     def get_node_extra_state_fields(self, node_key: str, state: OrchestratorState) -> dict:
         return {}
 
+    def get_workflow_chain_cache_key(self):
+        key = super().get_workflow_chain_cache_key()
+        return key and (*key, tuple(self.nodes.keys()))
+
     def setup_workflow_chain(self):
         # Add nodes.
-        self.workflow.add_node("orchestration", self.workflow_node_orchestration)
-        self.workflow.add_node("synthesis", self.workflow_node_synthesis)
+        self.workflow.add_node(
+            "orchestration", self.dispatch(lambda workflow: workflow.workflow_node_orchestration)
+        )
+        self.workflow.add_node(
+            "synthesis", self.dispatch(lambda workflow: workflow.workflow_node_synthesis)
+        )
         for node in self.nodes.keys():
-            self.workflow.add_node(node, self.workflow_node_call_node)
+            self.workflow.add_node(
+                node, self.dispatch(lambda workflow: workflow.workflow_node_call_node)
+            )
         self.add_memory_summarization_nodes()
 
         # Add edges.
         self.workflow.add_edge(START, "orchestration")
         self.workflow.add_conditional_edges(
             "orchestration",
-            self.workflow_conditional_edge_assign_nodes,
+            self.dispatch(lambda workflow: workflow.workflow_conditional_edge_assign_nodes),
             [*self.nodes.keys(), "synthesis"],
         )
         for node in self.nodes.keys():
@@ -1,8 +1,10 @@
-from unittest.mock import MagicMock
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
 
 from django.test import TestCase
 from langchain_core.language_models.fake_chat_models import FakeChatModel
 from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import InMemorySaver
 from langgraph.graph import END, START
 
 from baseapp_ai_langkit.base.workflows.conversational_workflow import (
@@ -100,3 +102,248 @@ class TestConversationalWorkflow(TestCase):
 
         with self.assertRaises(Exception):
             self.workflow.execute("Test prompt")
+
+
+class ExitDurabilitySaver(InMemorySaver):
+    durability = "exit"
+
+
+class TestConversationalWorkflowDurability(TestCase):
+    def run_workflow(self, checkpointer):
+        workflow = MockConversationalWorkflow(
+            llm=MockLLM(spec=FakeChatModel),
+            checkpointer=checkpointer,
+            config={"configurable": {"thread_id": "1"}},
+        )
+        workflow.execute("Hello")
+        return list(checkpointer.list(workflow.config))
+
+    def test_durability_defaults_to_the_checkpointer_one(self):
+        checkpoints = self.run_workflow(ExitDurabilitySaver())
+
+        self.assertEqual(len(checkpoints), 1)
+        self.assertEqual(len(checkpoints[0].checkpoint["channel_values"]["messages"]), 2)
+
+    def test_checkpoint_per_step_by_default(self):
+        self.assertGreater(len(self.run_workflow(InMemorySaver())), 1)
+
+
+class RecordingLLM(MockLLM):
+    def invoke(self, messages, *args, **kwargs):
+        self.calls.append(messages)
+        return super().invoke(messages, *args, **kwargs)
+
+
+@patch.object(
+    MockConversationalWorkflow,
+    "count_message_tokens",
+    side_effect=lambda message: len(message.text.split()),
+)
+class TestConversationalWorkflowTokenBudget(TestCase):
+    def setUp(self):
+        self.llm = RecordingLLM(spec=FakeChatModel)
+        self.llm.calls = []
+        self.workflow = MockConversationalWorkflow(
+            llm=self.llm,
+            checkpointer=InMemorySaver(),
+            config={"configurable": {"thread_id": "1"}},
+            retained_messages=1,
+            max_tokens=6,
+        )
+
+    def test_tokens_are_counted_incrementally(self, mock_count_message_tokens):
+        self.workflow.max_tokens = 100
+        self.workflow.execute("Hello")
+        result = self.workflow.execute("How are you?")
+
+        # Each message is only counted once: 2 per turn.
+        self.assertEqual(mock_count_message_tokens.call_count, 4)
+        self.assertEqual(result["counted_messages"], 4)
+        self.assertEqual(result["token_count"], 1 + 2 + 3 + 2)
+
+    def test_summarization_is_triggered_by_the_token_budget(self, mock_count_message_tokens):
+        self.workflow.execute("Hello")
+        self.assertEqual(len(self.llm.calls), 1)
+
+        result = self.workflow.execute("How are you?")
+
+        self.assertEqual(len(self.llm.calls), 3)
+        self.assertEqual(
+            [message.content for message in self.llm.calls[-1][:-1]],
+            ["Hello", "Test summary", "How are you?", "Test summary"],
+        )
+        self.assertEqual(result["summary"], "Test summary")
+        self.assertEqual(len(result["messages"]), 2)  # Summary + retained message
+        self.assertEqual(result["summarized_messages"], 2)
+        self.assertEqual(result["token_count"], 0)
+
+    def test_only_messages_not_yet_summarized_are_summarized(self, mock_count_message_tokens):
+        self.workflow.execute("Hello")
+        self.workflow.execute("How are you?")
+        self.workflow.execute("Tell me a long story")
+
+        self.assertEqual(len(self.llm.calls), 5)
+        self.assertEqual(
+            [message.content for message in self.llm.calls[-1][:-1]],
+            ["Tell me a long story", "Test summary"],
+        )
+        self.assertIn("Test summary", self.llm.calls[-1][-1].content)
+
+
+class TestConversationalWorkflowBackgroundSummarization(TestCase):
+    def setUp(self):
+        self.workflow = MockConversationalWorkflow(
+            llm=MockLLM(spec=FakeChatModel),
+            checkpointer=InMemorySaver(),
+            config={"configurable": {"thread_id": "1"}},
+            max_messages=3,
+            retained_messages=1,
+            background_summarization=True,
+        )
+
+    def test_conversation_is_not_summarized_in_the_turn(self):
+        self.workflow.execute("Hello")
+        result = self.workflow.execute("How are you?")
+
+        self.assertEqual(len(result["messages"]), 4)
+        self.assertNotIn("summary", result)
+        self.assertTrue(self.workflow.should_summarize(result))
+
+    def test_summarize_thread(self):
+        self.assertIsNone(self.workflow.summarize_thread())
+        self.workflow.execute("Hello")
+        self.workflow.execute("How are you?")
+
+        self.assertIsNotNone(self.workflow.summarize_thread())
+
+        state = self.workflow.workflow_chain.get_state(self.workflow.config).values
+        self.assertEqual(state["summary"], "Test summary")
+        self.assertEqual(len(state["messages"]), 2)  # Summary + retained message
+        self.assertFalse(self.workflow.should_summarize(state))
+        self.assertIsNone(self.workflow.summarize_thread())
+
+    def test_summary_is_saved_under_the_update_lock(self):
+        self.workflow.execute("Hello")
+        self.workflow.execute("How are you?")
+        events = []
+
+        @contextmanager
+        def update_lock():
+            events.append("locked")
+            yield True
+            events.append("released")
+
+        def summarize(*args, **kwargs):
+            events.append("summarized")
+            return AIMessage(content="Test summary")
+
+        with patch.object(MockLLM, "invoke", side_effect=summarize), patch.object(
+            self.workflow.workflow_chain,
+            "update_state",
+            side_effect=lambda *args, **kwargs: events.append("saved"),
+        ):
+            self.assertIsNotNone(self.workflow.summarize_thread(update_lock=update_lock))
+
+        # The summary is generated without holding the lock.
+        self.assertEqual(events, ["summarized", "locked", "saved", "released"])
+
+    def test_summary_is_discarded_when_the_thread_stays_busy(self):
+        self.workflow.execute("Hello")
+        self.workflow.execute("How are you?")
+
+        @contextmanager
+        def update_lock():
+            yield False
+
+        self.assertIsNone(self.workflow.summarize_thread(update_lock=update_lock))
+
+        state = self.workflow.workflow_chain.get_state(self.workflow.config).values
+        self.assertNotIn("summary", state)
+        self.assertEqual(len(state["messages"]), 4)
+
+    def test_messages_added_while_summarizing_are_kept(self):
+        state = {
+            "messages": [
+                HumanMessage(content="Hello", id="1"),
+                AIMessage(content="Hi there", id="2"),
+            ]
+        }
+        new_message = HumanMessage(content="How are you?", id="3")
+
+        result = self.workflow.get_summarized_state(state, "Summary", new_messages=[new_message])
+
+        # Remove messages + summary + retained message + new message
+        self.assertEqual(len(result["messages"]), 6)
+        self.assertEqual(result["messages"][-1].content, "How are you?")
+        self.assertEqual(result["summarized_messages"], 2)
+
+
+class SummarizationLLM(MagicMock):
+    def invoke(self, messages, *args, **kwargs):
+        self.calls.append(messages)
+        return AIMessage(
+            content="Cheap summary",
+            usage_metadata={"input_tokens": 10, "output_tokens": 2, "total_tokens": 12},
+        )
+
+
+@patch.object(
+    MockConversationalWorkflow,
+    "count_message_tokens",
+    side_effect=lambda message: len(message.text.split()),
+)
+class TestConversationalWorkflowSummarizationLLM(TestCase):
+    def setUp(self):
+        self.llm = RecordingLLM(spec=FakeChatModel)
+        self.llm.calls = []
+        self.summarization_llm = SummarizationLLM(spec=FakeChatModel)
+        self.summarization_llm.calls = []
+        self.state = {
+            "messages": [
+                HumanMessage(content="Hello there"),
+                AIMessage(content="Hi"),
+                HumanMessage(content="How are you?"),
+            ]
+        }
+
+    def get_workflow(self, **kwargs):
+        return MockConversationalWorkflow(
+            llm=self.llm,
+            checkpointer=None,
+            config={},
+            summarization_llm=self.summarization_llm,
+            **kwargs,
+        )
+
+    def test_summarization_llm_and_usage(self, mock_count_message_tokens):
+        result = self.get_workflow().workflow_node_summarize_conversation(self.state)
+
+        self.assertEqual(self.llm.calls, [])
+        self.assertEqual(len(self.summarization_llm.calls), 1)
+        self.assertEqual(result["summary"], "Cheap summary")
+        self.assertEqual(
+            result["summary_usage"], {"input_tokens": 10, "output_tokens": 2, "total_tokens": 12}
+        )
+
+    def test_usage_is_counted_when_not_reported(self, mock_count_message_tokens):
+        workflow = self.get_workflow()
+        workflow.summarization_llm = self.llm
+
+        result = workflow.workflow_node_summarize_conversation(self.state)
+
+        prompt_tokens = len(self.llm.calls[0][-1].content.split())
+        self.assertEqual(result["summary_usage"]["input_tokens"], 2 + 1 + 3 + prompt_tokens)
+        self.assertEqual(result["summary_usage"]["output_tokens"], 2)
+
+    def test_max_input_tokens_leaves_out_the_oldest_messages(self, mock_count_message_tokens):
+        workflow = self.get_workflow(summarization_max_input_tokens=100)
+        prompt_tokens = len(workflow.get_summarization_messages(self.state)[-1].content.split())
+
+        workflow.summarization_max_input_tokens = prompt_tokens + 4
+        messages = workflow.get_summarization_messages(self.state)
+        self.assertEqual([message.content for message in messages[:-1]], ["Hi", "How are you?"])
+
+        workflow.summarization_max_input_tokens = prompt_tokens + 1
+        messages = workflow.get_summarization_messages(self.state)
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(len(messages[0].content.split()), 1)
@@ -1,10 +1,21 @@
-from unittest.mock import MagicMock
+import asyncio
+import gc
+import weakref
+from unittest.mock import AsyncMock, MagicMock
 
 from django.test import TestCase
-from langchain_core.language_models.fake_chat_models import FakeChatModel
-from langchain_core.messages import AIMessage
+from langchain_core.language_models.fake_chat_models import (
+    FakeChatModel,
+    GenericFakeChatModel,
+)
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import InMemorySaver
 
 from baseapp_ai_langkit.base.interfaces.llm_node import LLMNodeInterface
+from baseapp_ai_langkit.base.workers.messages_worker import MessagesWorker
+from baseapp_ai_langkit.base.workflows.base_workflow import (
+    clear_workflow_chain_cache,
+)
 from baseapp_ai_langkit.base.workflows.general_chat_workflow import GeneralChatWorkflow
 
 
@@ -63,3 +74,131 @@ class TestGeneralChatWorkflow(TestCase):
 
         with self.assertRaises(Exception):
             self.workflow.execute("Test prompt")
+
+
+class TestGeneralChatWorkflowAsync(TestCase):
+    def test_aexecute_uses_async_nodes(self):
+        node = MagicMock(spec=LLMNodeInterface)
+        node.ainvoke = AsyncMock(return_value=AIMessage(content="Async response"))
+        workflow = GeneralChatWorkflow(
+            llm=MockLLM(spec=FakeChatModel),
+            checkpointer=None,
+            nodes={"node1": node},
+            config={},
+        )
+
+        result = asyncio.run(workflow.aexecute("Test prompt"))
+
+        self.assertEqual(result["messages"][-1].content, "Async response")
+        node.ainvoke.assert_awaited_once()
+        node.invoke.assert_not_called()
+
+
+class TestGeneralChatWorkflowStream(TestCase):
+    def test_stream_yields_the_last_node_tokens(self):
+        def create_worker(response):
+            return MessagesWorker(
+                llm=GenericFakeChatModel(messages=iter([AIMessage(content=response)])),
+                config={},
+            )
+
+        workflow = GeneralChatWorkflow(
+            llm=MockLLM(spec=FakeChatModel),
+            checkpointer=None,
+            nodes={"draft": create_worker("Draft"), "answer": create_worker("Hello there")},
+            config={},
+        )
+
+        chunks = list(workflow.stream("Test prompt"))
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunk.content for chunk, _ in chunks), "Hello there")
+        self.assertEqual({metadata["langgraph_node"] for _, metadata in chunks}, {"answer"})
+
+
+class TestGeneralChatWorkflowChainCache(TestCase):
+    def setUp(self):
+        clear_workflow_chain_cache()
+        self.checkpointer = InMemorySaver()
+
+    def create_workflow(self, response, thread_id="1", nodes=("answer",), **kwargs):
+        return GeneralChatWorkflow(
+            llm=MockLLM(spec=FakeChatModel),
+            checkpointer=self.checkpointer,
+            nodes={
+                key: MessagesWorker(
+                    llm=GenericFakeChatModel(messages=iter([AIMessage(content=response)])),
+                    config={},
+                )
+                for key in nodes
+            },
+            config={"configurable": {"thread_id": thread_id}},
+            **kwargs,
+        )
+
+    def test_compiled_graph_is_reused_with_the_running_workflow_nodes(self):
+        first = self.create_workflow("First")
+        second = self.create_workflow("Second", thread_id="2")
+
+        self.assertIs(first.workflow_chain, second.workflow_chain)
+        self.assertEqual(first.execute("Hi")["messages"][-1].content, "First")
+        self.assertEqual(second.execute("Hi")["messages"][-1].content, "Second")
+
+    def test_shared_graph_runs_the_nodes_of_the_workflow_in_the_run_config(self):
+        first = self.create_workflow("First")
+        second = self.create_workflow("Second", thread_id="2")
+        messages = {"messages": [HumanMessage(content="Hi")]}
+
+        result = first.workflow_chain.invoke(messages, second.get_run_config())
+        self.assertEqual(result["messages"][-1].content, "Second")
+
+        with self.assertRaises(RuntimeError):
+            first.workflow_chain.invoke(messages, first.config)
+
+    def test_shared_graph_does_not_keep_its_builder_alive(self):
+        workflow = self.create_workflow("First")
+        workflow_chain = workflow.workflow_chain
+        builder = weakref.ref(workflow)
+
+        del workflow
+        gc.collect()
+
+        self.assertIsNone(builder())
+        self.assertIs(self.create_workflow("Second").workflow_chain, workflow_chain)
+
+    def test_compiled_graph_is_reused_by_async_workflows(self):
+        self.create_workflow("First")
+        workflow = self.create_workflow("Second")
+
+        result = asyncio.run(workflow.aexecute("Hi"))
+
+        self.assertEqual(result["messages"][-1].content, "Second")
+
+    def test_different_graphs_are_not_shared(self):
+        workflow = self.create_workflow("First")
+
+        self.assertIsNot(
+            self.create_workflow("Second", nodes=("draft", "answer")).workflow_chain,
+            workflow.workflow_chain,
+        )
+        self.checkpointer = InMemorySaver()
+        self.assertIsNot(self.create_workflow("Second").workflow_chain, workflow.workflow_chain)
+
+    def test_workflows_with_actions_not_dispatched_are_not_shared(self):
+        class CustomWorkflow(GeneralChatWorkflow):
+            def setup_workflow_chain(self):
+                self.workflow.add_node("custom", lambda state: state)
+                super().setup_workflow_chain()
+
+        def create_workflow():
+            return CustomWorkflow(
+                llm=MockLLM(spec=FakeChatModel),
+                checkpointer=None,
+                nodes={"answer": MockNode(spec=LLMNodeInterface)},
+                config={},
+            )
+
+        workflow = create_workflow()
+        other = create_workflow()
+
+        self.assertIsNot(workflow.workflow_chain, other.workflow_chain)
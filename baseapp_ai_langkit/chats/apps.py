@@ -1,7 +1,30 @@
+import logging
+
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+logger = logging.getLogger(__name__)
 
 
 class BaseappAILangkitChatsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "baseapp_ai_langkit.chats"
     label = "baseapp_ai_langkit_chats"
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        post_migrate.connect(self.setup_checkpointer, sender=self)
+
+    def setup_checkpointer(self, using, **kwargs):
+        from django.db import connections
+
+        from .checkpointer import LangGraphCheckpointer
+
+        if connections[using].vendor != "postgresql":
+            return
+        try:
+            LangGraphCheckpointer(db_alias=using).setup_schema()
+        except Exception as e:
+            # The tables are still migrated on first use (or with the setup_checkpointer command).
+            logger.warning(f"Could not set up the LangGraph checkpointer tables: {e}")
@@ -0,0 +1,196 @@
+"""
+Write-through cache of the latest checkpoint of each thread, in front of the Postgres savers.
+Enabled by setting `BASEAPP_AI_LANGKIT_CHECKPOINTER_CACHE` to a Django cache alias.
+
+The cache must be shared by every process writing checkpoints (e.g. a Redis cache shared by the
+web and Celery workers): a process only invalidates its own copy of the cache, so with a local
+memory cache the others would keep loading a checkpoint that is no longer the latest one.
+"""
+
+import functools
+import logging
+from typing import Iterable, Optional, Tuple, Type
+
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    CheckpointTuple,
+    get_serializable_checkpoint_metadata,
+)
+
+from baseapp_ai_langkit import app_settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "baseapp_ai_langkit:checkpoint"
+
+
+class CheckpointCacheMixin:
+    """
+    Caches the latest checkpoint of each thread when it's saved, so loading it again (at the
+    start of every chat turn) doesn't query Postgres nor decode the blobs. Postgres stays the
+    durable store: saving pending writes or deleting the thread invalidates the cached
+    checkpoint, and cache misses load it from Postgres.
+
+    Must be mixed in before a checkpoint saver class.
+    """
+
+    def __init__(self, *args, cache_alias: str, cache_timeout: Optional[int] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        check_cache_backend(cache_alias)
+        self.cache = caches[cache_alias]
+        self.cache_timeout = (
+            app_settings.CHECKPOINTER_CACHE_TIMEOUT if cache_timeout is None else cache_timeout
+        )
+
+    def get_cache_key(self, config: RunnableConfig) -> str:
+        configurable = config["configurable"]
+        return get_checkpoint_cache_key(
+            configurable["thread_id"], configurable.get("checkpoint_ns", "")
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        key = self.get_cache_key(config)
+        if checkpoint_tuple := self._get_cached_tuple(self.cache.get(key), config):
+            return checkpoint_tuple
+        checkpoint_tuple = super().get_tuple(config)
+        if checkpoint_tuple and not config["configurable"].get("checkpoint_id"):
+            self.cache.set(key, self._dump_tuple(checkpoint_tuple), self.cache_timeout)
+        return checkpoint_tuple
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        key = self.get_cache_key(config)
+        if checkpoint_tuple := self._get_cached_tuple(await self.cache.aget(key), config):
+            return checkpoint_tuple
+        checkpoint_tuple = await super().aget_tuple(config)
+        if checkpoint_tuple and not config["configurable"].get("checkpoint_id"):
+            await self.cache.aset(key, self._dump_tuple(checkpoint_tuple), self.cache_timeout)
+        return checkpoint_tuple
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        next_config = super().put(config, checkpoint, metadata, new_versions)
+        self.cache.set(
+            self.get_cache_key(next_config),
+            self._dump_put_tuple(config, next_config, checkpoint, metadata),
+            self.cache_timeout,
+        )
+        return next_config
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        next_config = await super().aput(config, checkpoint, metadata, new_versions)
+        await self.cache.aset(
+            self.get_cache_key(next_config),
+            self._dump_put_tuple(config, next_config, checkpoint, metadata),
+            self.cache_timeout,
+        )
+        return next_config
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        # Writes can be saved after the next checkpoint, only invalidate the cached one if it's
+        # the checkpoint they belong to.
+        key = self.get_cache_key(config)
+        if self._is_cached_checkpoint(self.cache.get(key), config):
+            self.cache.delete(key)
+        return super().put_writes(config, writes, task_id, task_path)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        key = self.get_cache_key(config)
+        if self._is_cached_checkpoint(await self.cache.aget(key), config):
+            await self.cache.adelete(key)
+        return await super().aput_writes(config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        self.cache.delete(self.get_cache_key({"configurable": {"thread_id": thread_id}}))
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await super().adelete_thread(thread_id)
+        await self.cache.adelete(self.get_cache_key({"configurable": {"thread_id": thread_id}}))
+
+    def _get_cached_tuple(self, value, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        if value is None:
+            return None
+        if config["configurable"].get("checkpoint_id") and not self._is_cached_checkpoint(
+            value, config
+        ):
+            return None
+        return self._load_tuple(value)
+
+    def _is_cached_checkpoint(self, value, config: RunnableConfig) -> bool:
+        return value is not None and value[0] == config["configurable"].get("checkpoint_id")
+
+    def _dump_put_tuple(self, config, next_config, checkpoint, metadata):
+        parent_config = None
+        if parent_checkpoint_id := config["configurable"].get("checkpoint_id"):
+            parent_config = {
+                "configurable": {
+                    **next_config["configurable"],
+                    "checkpoint_id": parent_checkpoint_id,
+                }
+            }
+        return self._dump_tuple(
+            CheckpointTuple(
+                config=next_config,
+                checkpoint=checkpoint,
+                metadata=get_serializable_checkpoint_metadata(config, metadata),
+                parent_config=parent_config,
+                pending_writes=[],
+            )
+        )
+
+    def _dump_tuple(self, checkpoint_tuple: CheckpointTuple):
+        # Store it with the saver's serializer rather than pickling it, next to its id so it can
+        # be checked without loading it.
+        return (
+            checkpoint_tuple.config["configurable"]["checkpoint_id"],
+            *self.serde.dumps_typed(checkpoint_tuple._asdict()),
+        )
+
+    def _load_tuple(self, value) -> CheckpointTuple:
+        data = self.serde.loads_typed((value[1], value[2]))
+        data["pending_writes"] = [tuple(write) for write in data["pending_writes"] or []]
+        return CheckpointTuple(**data)
+
+
+def get_checkpoint_cache_key(thread_id: str, checkpoint_ns: str = "") -> str:
+    return f"{KEY_PREFIX}:{thread_id}:{checkpoint_ns}"
+
+
+def clear_cached_checkpoints(threads: Iterable[Tuple[str, str]]) -> None:
+    """
+    Remove the cached checkpoints of the given (thread id, checkpoint namespace) pairs, e.g.
+    after deleting them from Postgres outside of the savers.
+    """
+    if not app_settings.CHECKPOINTER_CACHE:
+        return
+    caches[app_settings.CHECKPOINTER_CACHE].delete_many(
+        [get_checkpoint_cache_key(thread_id, checkpoint_ns) for thread_id, checkpoint_ns in threads]
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def check_cache_backend(cache_alias: str) -> None:
+    """
+    Warn (once per alias) when the checkpoint cache can't be shared by the processes.
+    """
+    cache = caches[cache_alias]
+    if isinstance(cache, LocMemCache):
+        logger.warning(
+            f"The checkpoint cache '{cache_alias}' is a local memory cache, so the processes "
+            "don't see each other's checkpoints and may load stale ones. Use a shared cache."
+        )
+    elif isinstance(cache, DummyCache):
+        logger.warning(
+            f"The checkpoint cache '{cache_alias}' is a dummy cache, which never caches "
+            "anything. Unset BASEAPP_AI_LANGKIT_CHECKPOINTER_CACHE to disable the cache."
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def get_cached_saver_class(
+    saver_class: Type[BaseCheckpointSaver],
+) -> Type[BaseCheckpointSaver]:
+    return type(f"Cached{saver_class.__name__}", (CheckpointCacheMixin, saver_class), {})
@@ -0,0 +1,226 @@
+"""
+Retention of the LangGraph checkpoint tables. Every chat turn stores new checkpoints, pending
+writes and channel blobs for the session's thread, which are never deleted by the savers.
+`CheckpointRetention` deletes, in batches:
+
+- every checkpoint of the threads inactive for longer than the TTL;
+- the checkpoints of each thread older than the last `keep_last` ones, and their writes;
+- the channel blobs no longer referenced by any checkpoint of their thread.
+
+The cached checkpoints of the expired threads are removed from the checkpoint cache. Pruning
+never deletes the latest checkpoint of a thread, nor the blobs it references, so it leaves the
+cache valid.
+"""
+
+import logging
+from datetime import timedelta
+from typing import Optional
+
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+
+from baseapp_ai_langkit import app_settings
+from baseapp_ai_langkit.chats.checkpoint_cache import clear_cached_checkpoints
+from baseapp_ai_langkit.chats.connection_pools import get_connection_pool
+
+logger = logging.getLogger(__name__)
+
+EXPIRE_INACTIVE_THREADS_SQL = """
+WITH expired AS (
+    SELECT thread_id
+    FROM checkpoints
+    GROUP BY thread_id
+    HAVING max((checkpoint->>'ts')::timestamptz) < %(cutoff)s
+    LIMIT %(batch_size)s
+),
+deleted_writes AS (
+    DELETE FROM checkpoint_writes AS w USING expired AS e
+    WHERE w.thread_id = e.thread_id
+    RETURNING pg_column_size(w.*) AS size
+),
+deleted_blobs AS (
+    DELETE FROM checkpoint_blobs AS b USING expired AS e
+    WHERE b.thread_id = e.thread_id
+    RETURNING pg_column_size(b.*) AS size
+),
+deleted_checkpoints AS (
+    DELETE FROM checkpoints AS c USING expired AS e
+    WHERE c.thread_id = e.thread_id
+    RETURNING c.thread_id, c.checkpoint_ns, pg_column_size(c.*) AS size
+)
+SELECT
+    (
+        SELECT coalesce(jsonb_agg(DISTINCT jsonb_build_array(thread_id, checkpoint_ns)), '[]')
+        FROM deleted_checkpoints
+    ) AS expired_checkpoints,
+    (SELECT count(*) FROM expired) AS threads,
+    (SELECT count(*) FROM deleted_checkpoints) AS checkpoints,
+    (SELECT count(*) FROM deleted_writes) AS writes,
+    (SELECT count(*) FROM deleted_blobs) AS blobs,
+    (SELECT coalesce(sum(size), 0) FROM deleted_checkpoints)
+        + (SELECT coalesce(sum(size), 0) FROM deleted_writes)
+        + (SELECT coalesce(sum(size), 0) FROM deleted_blobs) AS bytes
+"""
+
+PRUNE_OLD_CHECKPOINTS_SQL = """
+WITH doomed AS (
+    SELECT thread_id, checkpoint_ns, checkpoint_id
+    FROM (
+        SELECT
+            thread_id,
+            checkpoint_ns,
+            checkpoint_id,
+            row_number() OVER (
+                PARTITION BY thread_id, checkpoint_ns ORDER BY checkpoint_id DESC
+            ) AS position
+        FROM checkpoints
+    ) AS ranked
+    WHERE position > %(keep_last)s
+    LIMIT %(batch_size)s
+),
+deleted_writes AS (
+    DELETE FROM checkpoint_writes AS w USING doomed AS d
+    WHERE w.thread_id = d.thread_id
+        AND w.checkpoint_ns = d.checkpoint_ns
+        AND w.checkpoint_id = d.checkpoint_id
+    RETURNING pg_column_size(w.*) AS size
+),
+deleted_checkpoints AS (
+    DELETE FROM checkpoints AS c USING doomed AS d
+    WHERE c.thread_id = d.thread_id
+        AND c.checkpoint_ns = d.checkpoint_ns
+        AND c.checkpoint_id = d.checkpoint_id
+    RETURNING pg_column_size(c.*) AS size
+)
+SELECT
+    (SELECT count(*) FROM deleted_checkpoints) AS checkpoints,
+    (SELECT count(*) FROM deleted_writes) AS writes,
+    (SELECT coalesce(sum(size), 0) FROM deleted_checkpoints)
+        + (SELECT coalesce(sum(size), 0) FROM deleted_writes) AS bytes
+"""
+
+# Blobs are written before their checkpoint, so only threads without recent activity are
+# checked, otherwise the blobs of a checkpoint being saved could be deleted.
+PRUNE_ORPHAN_BLOBS_SQL = """
+WITH idle_threads AS (
+    SELECT thread_id
+    FROM checkpoints
+    GROUP BY thread_id
+    HAVING max((checkpoint->>'ts')::timestamptz) < %(active_cutoff)s
+),
+orphans AS (
+    SELECT b.thread_id, b.checkpoint_ns, b.channel, b.version
+    FROM checkpoint_blobs AS b
+    JOIN idle_threads AS t ON t.thread_id = b.thread_id
+    WHERE NOT EXISTS (
+        SELECT 1
+        FROM checkpoints AS c
+        WHERE c.thread_id = b.thread_id
+            AND c.checkpoint_ns = b.checkpoint_ns
+            AND c.checkpoint->'channel_versions'->>b.channel = b.version
+    )
+    LIMIT %(batch_size)s
+),
+deleted_blobs AS (
+    DELETE FROM checkpoint_blobs AS b USING orphans AS o
+    WHERE b.thread_id = o.thread_id
+        AND b.checkpoint_ns = o.checkpoint_ns
+        AND b.channel = o.channel
+        AND b.version = o.version
+    RETURNING pg_column_size(b.*) AS size
+)
+SELECT
+    (SELECT count(*) FROM deleted_blobs) AS blobs,
+    (SELECT coalesce(sum(size), 0) FROM deleted_blobs) AS bytes
+"""
+
+
+class CheckpointRetention:
+    """
+    Apply the checkpoint retention policy to a database. Each batch runs in its own
+    transaction, so the job can be interrupted and resumed at any time.
+
+    Args:
+        db_alias (str): The alias of the database in Django's settings.
+        keep_last (int): Checkpoints to keep per thread. 0 keeps all of them.
+        ttl (timedelta): Delete the threads without checkpoints newer than this. None keeps them.
+        batch_size (int): Maximum rows selected for deletion per statement.
+        active_grace (timedelta): Skip the orphan blobs of threads active within this period.
+    """
+
+    def __init__(
+        self,
+        db_alias: str = DEFAULT_DB_ALIAS,
+        keep_last: Optional[int] = None,
+        ttl: Optional[timedelta] = None,
+        batch_size: Optional[int] = None,
+        active_grace: timedelta = timedelta(minutes=10),
+    ):
+        self.db_alias = db_alias
+        self.keep_last = (
+            app_settings.CHECKPOINTER_RETENTION_KEEP_LAST if keep_last is None else keep_last
+        )
+        if ttl is None and app_settings.CHECKPOINTER_RETENTION_TTL_DAYS:
+            ttl = timedelta(days=app_settings.CHECKPOINTER_RETENTION_TTL_DAYS)
+        self.ttl = ttl
+        self.batch_size = batch_size or app_settings.CHECKPOINTER_RETENTION_BATCH_SIZE
+        self.active_grace = active_grace
+
+    def run(self) -> dict:
+        """
+        Run the retention policy and return the number of deleted rows and reclaimed bytes.
+        """
+        metrics = {
+            "threads_expired": 0,
+            "checkpoints_deleted": 0,
+            "writes_deleted": 0,
+            "blobs_deleted": 0,
+            "bytes_reclaimed": 0,
+        }
+        if self.ttl:
+            self._add_metrics(metrics, self.expire_inactive_threads())
+        if self.keep_last:
+            self._add_metrics(metrics, self.prune_old_checkpoints())
+        self._add_metrics(metrics, self.prune_orphan_blobs())
+        logger.info(f"Checkpoint retention on database '{self.db_alias}': {metrics}")
+        return metrics
+
+    def expire_inactive_threads(self) -> dict:
+        return self._run_in_batches(
+            EXPIRE_INACTIVE_THREADS_SQL, {"cutoff": timezone.now() - self.ttl}, "threads"
+        )
+
+    def prune_old_checkpoints(self) -> dict:
+        return self._run_in_batches(
+            PRUNE_OLD_CHECKPOINTS_SQL, {"keep_last": self.keep_last}, "checkpoints"
+        )
+
+    def prune_orphan_blobs(self) -> dict:
+        return self._run_in_batches(
+            PRUNE_ORPHAN_BLOBS_SQL,
+            {"active_cutoff": timezone.now() - self.active_grace},
+            "blobs",
+        )
+
+    def _run_in_batches(self, sql: str, params: dict, batch_key: str) -> dict:
+        """
+        Run the statement until it selects less rows than the batch size, summing its results.
+        """
+        totals = {}
+        params = {**params, "batch_size": self.batch_size}
+        with get_connection_pool(self.db_alias).connection() as connection:
+            while True:
+                row = connection.execute(sql, params).fetchone()
+                if expired_checkpoints := row.pop("expired_checkpoints", None):
+                    clear_cached_checkpoints(expired_checkpoints)
+                for key, value in row.items():
+                    totals[key] = totals.get(key, 0) + int(value)
+                if row[batch_key] < self.batch_size:
+                    return totals
+
+    def _add_metrics(self, metrics: dict, totals: dict):
+        metrics["threads_expired"] += totals.get("threads", 0)
+        metrics["checkpoints_deleted"] += totals.get("checkpoints", 0)
+        metrics["writes_deleted"] += totals.get("writes", 0)
+        metrics["blobs_deleted"] += totals.get("blobs", 0)
+        metrics["bytes_reclaimed"] += totals.get("bytes", 0)
@@ -0,0 +1,71 @@
+"""
+Serializers for the LangGraph checkpoint blobs and writes. The serializer used by the
+checkpointers is set with `BASEAPP_AI_LANGKIT_CHECKPOINTER_SERDE`.
+"""
+
+import threading
+import zlib
+from typing import Any, Tuple
+
+from django.utils.module_loading import import_string
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from baseapp_ai_langkit import app_settings
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+ZSTD_SUFFIX = "+zstd"
+ZLIB_SUFFIX = "+zlib"
+
+_zstd_local = threading.local()
+
+
+def _get_zstd_compressor():
+    # Compressors and decompressors can't be used by several threads at the same time.
+    if not hasattr(_zstd_local, "compressor"):
+        _zstd_local.compressor = zstandard.ZstdCompressor(level=3)
+        _zstd_local.decompressor = zstandard.ZstdDecompressor()
+    return _zstd_local.compressor, _zstd_local.decompressor
+
+
+class CompressedJsonPlusSerializer(JsonPlusSerializer):
+    """
+    JsonPlusSerializer storing the msgpack payloads larger than `min_size` bytes compressed with
+    zstd (zlib if `zstandard` isn't installed), tagged as "msgpack+zstd" or "msgpack+zlib".
+    Any other type, including the rows written before compression was enabled, is loaded by
+    JsonPlusSerializer as is.
+    """
+
+    def __init__(self, *args, min_size: int = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.min_size = (
+            app_settings.CHECKPOINTER_SERDE_COMPRESSION_MIN_SIZE if min_size is None else min_size
+        )
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        type_, data = super().dumps_typed(obj)
+        if type_ != "msgpack" or len(data) < self.min_size:
+            return type_, data
+        if zstandard is not None:
+            compressor, _ = _get_zstd_compressor()
+            return type_ + ZSTD_SUFFIX, compressor.compress(data)
+        return type_ + ZLIB_SUFFIX, zlib.compress(data)
+
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        type_, data_ = data
+        if type_.endswith(ZSTD_SUFFIX):
+            if zstandard is None:
+                raise RuntimeError("Install `zstandard` to load zstd compressed checkpoints.")
+            _, decompressor = _get_zstd_compressor()
+            return super().loads_typed((type_[: -len(ZSTD_SUFFIX)], decompressor.decompress(data_)))
+        if type_.endswith(ZLIB_SUFFIX):
+            return super().loads_typed((type_[: -len(ZLIB_SUFFIX)], zlib.decompress(data_)))
+        return super().loads_typed(data)
+
+
+def get_checkpoint_serde() -> SerializerProtocol:
+    return import_string(app_settings.CHECKPOINTER_SERDE)()
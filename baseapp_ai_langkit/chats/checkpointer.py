@@ -1,7 +1,44 @@
+import threading
+
 import psycopg
-from django.conf import settings
 from django.db import DEFAULT_DB_ALIAS
 from langgraph.checkpoint.postgres import PostgresSaver
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+from psycopg.types.json import Jsonb
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
+
+from baseapp_ai_langkit import app_settings
+from baseapp_ai_langkit.chats.checkpoint_cache import get_cached_saver_class
+from baseapp_ai_langkit.chats.checkpoint_serde import get_checkpoint_serde
+from baseapp_ai_langkit.chats.connection_pools import (
+    CONNECTION_KWARGS,
+    aget_async_connection_pool,
+    get_connection_pool,
+    get_conninfo,
+)
+
+# Databases whose checkpoint tables are known to be migrated in this process.
+_migrated_db_aliases = set()
+_migrated_db_aliases_lock = threading.Lock()
+
+
+def patch_legacy_checkpoint_row(value):
+    """
+    Old checkpoints (v2) don't have 'channel_values' field in the database row, while new
+    checkpoints (v4) require it. Provide a default empty dict/list for missing 'channel_values'
+    so the savers can load old checkpoints.
+    """
+    # Ensure channel_values in the row is never None (compatibility with old checkpoints)
+    if value.get("channel_values") is None:
+        value["channel_values"] = []
+
+    # Ensure checkpoint dict has channel_values field
+    checkpoint = value.get("checkpoint", {})
+    if isinstance(checkpoint, dict):
+        if "channel_values" not in checkpoint or checkpoint.get("channel_values") is None:
+            checkpoint = {**checkpoint, "channel_values": {}}
+            value["checkpoint"] = checkpoint
+    return value
 
 
 class CompatiblePostgresSaver(PostgresSaver):
@@ -20,51 +57,181 @@ class CompatiblePostgresSaver(PostgresSaver):
         The parent method calls _load_blobs(value["channel_values"]) which fails if
         channel_values is None. We ensure it's never None before calling the parent.
         """
-        # Ensure channel_values in the row is never None (compatibility with old checkpoints)
-        if value.get("channel_values") is None:
-            value["channel_values"] = []
+        # Call parent method with patched value
+        return super()._load_checkpoint_tuple(patch_legacy_checkpoint_row(value))
 
-        # Ensure checkpoint dict has channel_values field
-        checkpoint = value.get("checkpoint", {})
-        if isinstance(checkpoint, dict):
-            if "channel_values" not in checkpoint or checkpoint.get("channel_values") is None:
-                checkpoint = {**checkpoint, "channel_values": {}}
-                value["checkpoint"] = checkpoint
 
-        # Call parent method with patched value
-        return super()._load_checkpoint_tuple(value)
+class AsyncCompatiblePostgresSaver(AsyncPostgresSaver):
+    """
+    Async counterpart of `CompatiblePostgresSaver`.
+    """
+
+    async def _load_checkpoint_tuple(self, value):
+        return await super()._load_checkpoint_tuple(patch_legacy_checkpoint_row(value))
+
+
+# Delete the checkpoints preceding the one just saved, their writes and the blobs of channel
+# versions it doesn't reference.
+DELETE_PREVIOUS_CHECKPOINT_WRITES_SQL = """
+DELETE FROM checkpoint_writes
+WHERE thread_id = %s AND checkpoint_ns = %s AND checkpoint_id < %s
+"""
+DELETE_PREVIOUS_CHECKPOINTS_SQL = """
+DELETE FROM checkpoints
+WHERE thread_id = %s AND checkpoint_ns = %s AND checkpoint_id < %s
+"""
+DELETE_UNREFERENCED_BLOBS_SQL = """
+DELETE FROM checkpoint_blobs
+WHERE thread_id = %s AND checkpoint_ns = %s
+    AND (channel, version) NOT IN (SELECT key, value FROM jsonb_each_text(%s))
+"""
+
+
+def get_delete_previous_checkpoints_queries(config, checkpoint):
+    thread_id = config["configurable"]["thread_id"]
+    checkpoint_ns = config["configurable"]["checkpoint_ns"]
+    return [
+        (DELETE_PREVIOUS_CHECKPOINT_WRITES_SQL, (thread_id, checkpoint_ns, checkpoint["id"])),
+        (DELETE_PREVIOUS_CHECKPOINTS_SQL, (thread_id, checkpoint_ns, checkpoint["id"])),
+        (
+            DELETE_UNREFERENCED_BLOBS_SQL,
+            (thread_id, checkpoint_ns, Jsonb(checkpoint["channel_versions"])),
+        ),
+    ]
+
+
+class ShallowCompatiblePostgresSaver(CompatiblePostgresSaver):
+    """
+    Keeps only the latest checkpoint of each thread: saving a checkpoint deletes the previous
+    ones, with their writes and blobs. Only the channels that changed are written, as in
+    PostgresSaver. It uses the same tables, so it can be enabled on existing threads.
+
+    Workflows run it with `durability="exit"`, so a single checkpoint is saved per run.
+    """
+
+    durability = "exit"
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        next_config = super().put(config, checkpoint, metadata, new_versions)
+        with self._cursor(pipeline=True) as cur:
+            for query, params in get_delete_previous_checkpoints_queries(config, checkpoint):
+                cur.execute(query, params)
+        return next_config
+
+
+class AsyncShallowCompatiblePostgresSaver(AsyncCompatiblePostgresSaver):
+    """
+    Async counterpart of `ShallowCompatiblePostgresSaver`.
+    """
+
+    durability = "exit"
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        next_config = await super().aput(config, checkpoint, metadata, new_versions)
+        async with self._cursor(pipeline=True) as cur:
+            for query, params in get_delete_previous_checkpoints_queries(config, checkpoint):
+                await cur.execute(query, params)
+        return next_config
+
+
+def get_saver(saver_class, connection):
+    """
+    Instantiate the saver with the configured serializer, and in front of the checkpoint cache
+    if `BASEAPP_AI_LANGKIT_CHECKPOINTER_CACHE` is set.
+    """
+    kwargs = {"serde": get_checkpoint_serde()}
+    if app_settings.CHECKPOINTER_CACHE:
+        saver_class = get_cached_saver_class(saver_class)
+        kwargs["cache_alias"] = app_settings.CHECKPOINTER_CACHE
+    return saver_class(connection, **kwargs)
 
 
 class LangGraphCheckpointer:
     db_alias: str
+    shallow: bool
     checkpointer: PostgresSaver
 
-    def __init__(self, db_alias=DEFAULT_DB_ALIAS):
+    def __init__(self, db_alias=DEFAULT_DB_ALIAS, shallow=None):
         """
-        Initialize the LangGraph checkpointer using psycopg.
+        Initialize the LangGraph checkpointer using a process-wide psycopg connection pool.
 
         :Args
             db_alias: The alias of the database in Django's settings.
+            shallow: Keep only the latest checkpoint of each thread. Defaults to
+                `BASEAPP_AI_LANGKIT_CHECKPOINTER_SHALLOW`.
         """
         self.db_alias = db_alias
+        self.shallow = app_settings.CHECKPOINTER_SHALLOW if shallow is None else shallow
 
     def setup(self):
-        """Set up the PostgresSaver using psycopg's connection."""
+        """
+        Set up the PostgresSaver using the database's connection pool.
+
+        The checkpoint tables are migrated by the `setup_checkpointer` command and after
+        `migrate` runs. If they weren't migrated in this process yet, and
+        `BASEAPP_AI_LANGKIT_CHECKPOINTER_AUTO_SETUP` is enabled, the migrations check runs
+        once here, so following calls only borrow a connection from the pool.
+        """
         # Use CompatiblePostgresSaver instead of PostgresSaver for backward compatibility
-        self.checkpointer = CompatiblePostgresSaver(self._get_connection())
-        self.checkpointer.setup()
+        saver_class = ShallowCompatiblePostgresSaver if self.shallow else CompatiblePostgresSaver
+        self.checkpointer = get_saver(saver_class, self._get_connection_pool())
+        if app_settings.CHECKPOINTER_AUTO_SETUP and self.db_alias not in _migrated_db_aliases:
+            with _migrated_db_aliases_lock:
+                if self.db_alias not in _migrated_db_aliases:
+                    self.checkpointer.setup()
+                    _migrated_db_aliases.add(self.db_alias)
+
+    def setup_schema(self):
+        """
+        Create or migrate the checkpoint tables, using a dedicated connection that is closed
+        right after (so it doesn't keep a pool open, e.g. when called from `post_migrate`).
+        """
+        with psycopg.connect(get_conninfo(self.db_alias), **CONNECTION_KWARGS) as connection:
+            CompatiblePostgresSaver(connection).setup()
+        with _migrated_db_aliases_lock:
+            _migrated_db_aliases.add(self.db_alias)
 
     def get_checkpointer(self) -> PostgresSaver:
         if not self.checkpointer:
             raise RuntimeError("Call `setup()` before getting the checkpointer.")
         return self.checkpointer
 
-    def _get_connection(self):
-        db_settings = settings.DATABASES[self.db_alias]
+    def _get_connection_pool(self) -> ConnectionPool:
+        return get_connection_pool(self.db_alias)
+
+
+class AsyncLangGraphCheckpointer:
+    """
+    Async counterpart of `LangGraphCheckpointer`, to be used with the workflows `ainvoke`.
+    The saver is bound to the event loop it was set up in.
+    """
+
+    db_alias: str
+    shallow: bool
+    checkpointer: AsyncPostgresSaver
+
+    def __init__(self, db_alias=DEFAULT_DB_ALIAS, shallow=None):
+        self.db_alias = db_alias
+        self.shallow = app_settings.CHECKPOINTER_SHALLOW if shallow is None else shallow
 
-        dsn = (
-            f"postgresql://{db_settings['USER']}:{db_settings['PASSWORD']}"
-            f"@{db_settings['HOST']}:{db_settings['PORT']}/{db_settings['NAME']}"
+    async def setup(self):
+        """
+        Set up the AsyncPostgresSaver using the database's async connection pool. The checkpoint
+        tables are migrated here only once per process, as in `LangGraphCheckpointer.setup`.
+        """
+        saver_class = (
+            AsyncShallowCompatiblePostgresSaver if self.shallow else AsyncCompatiblePostgresSaver
         )
+        self.checkpointer = get_saver(saver_class, await self._get_connection_pool())
+        if app_settings.CHECKPOINTER_AUTO_SETUP and self.db_alias not in _migrated_db_aliases:
+            await self.checkpointer.setup()
+            with _migrated_db_aliases_lock:
+                _migrated_db_aliases.add(self.db_alias)
+
+    def get_checkpointer(self) -> AsyncPostgresSaver:
+        if not self.checkpointer:
+            raise RuntimeError("Call `setup()` before getting the checkpointer.")
+        return self.checkpointer
 
-        return psycopg.connect(dsn, autocommit=True)
+    async def _get_connection_pool(self) -> AsyncConnectionPool:
+        return await aget_async_connection_pool(self.db_alias)
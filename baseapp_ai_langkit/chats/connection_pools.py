@@ -0,0 +1,155 @@
+"""
+Process-wide psycopg connection pools used by the LangGraph checkpointers, keyed by the Django
+database alias, so chat turns borrow an already open connection instead of opening (and
+leaking) a new one every time.
+"""
+
+import asyncio
+import atexit
+import logging
+import threading
+import weakref
+from typing import Dict
+
+from django.conf import settings
+from psycopg.conninfo import make_conninfo
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
+
+from baseapp_ai_langkit import app_settings
+from baseapp_ai_langkit.base.utils.event_loops import on_loop_shutdown
+
+logger = logging.getLogger(__name__)
+
+_connection_pools: Dict[str, ConnectionPool] = {}
+# Async pools are bound to the event loop they were opened in, so they're kept by loop, then by
+# database alias, and closed when their loop shuts down.
+_async_connection_pools: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_connection_pools_lock = threading.Lock()
+
+# Connection settings required by the LangGraph Postgres savers.
+CONNECTION_KWARGS = {
+    "autocommit": True,
+    "prepare_threshold": 0,
+    "row_factory": dict_row,
+}
+
+
+def get_conninfo(db_alias: str) -> str:
+    db_settings = settings.DATABASES[db_alias]
+    params = {
+        "dbname": db_settings.get("NAME"),
+        "user": db_settings.get("USER"),
+        "password": db_settings.get("PASSWORD"),
+        "host": db_settings.get("HOST"),
+        "port": db_settings.get("PORT"),
+    }
+    return make_conninfo(**{key: str(value) for key, value in params.items() if value})
+
+
+def _get_pool_kwargs(db_alias: str) -> dict:
+    return dict(
+        conninfo=get_conninfo(db_alias),
+        min_size=app_settings.CHECKPOINTER_POOL_MIN_SIZE,
+        max_size=app_settings.CHECKPOINTER_POOL_MAX_SIZE,
+        timeout=app_settings.CHECKPOINTER_POOL_TIMEOUT,
+        max_idle=app_settings.CHECKPOINTER_POOL_MAX_IDLE,
+        kwargs=CONNECTION_KWARGS,
+        name=f"langgraph-checkpointer-{db_alias}",
+        open=False,
+    )
+
+
+def get_connection_pool(db_alias: str) -> ConnectionPool:
+    """
+    Get (creating and opening it on first use) the connection pool of the given database.
+    Connections are health checked when borrowed from the pool.
+    """
+    pool = _connection_pools.get(db_alias)
+    if pool is not None:
+        return pool
+
+    with _connection_pools_lock:
+        pool = _connection_pools.get(db_alias)
+        if pool is None:
+            pool = ConnectionPool(
+                check=ConnectionPool.check_connection, **_get_pool_kwargs(db_alias)
+            )
+            pool.open()
+            _connection_pools[db_alias] = pool
+            logger.info(f"Opened checkpointer connection pool for database '{db_alias}'")
+    return pool
+
+
+async def aget_async_connection_pool(db_alias: str) -> AsyncConnectionPool:
+    """
+    Async counterpart of `get_connection_pool`. Async pools are bound to the event loop they
+    were opened in, so each loop gets its own pools, closed when the loop shuts down (e.g. at
+    the end of `asyncio.run` or `async_to_sync`).
+    """
+    loop = asyncio.get_running_loop()
+    pool = _async_connection_pools.get(loop, {}).get(db_alias)
+    if pool is not None:
+        return pool
+
+    _discard_stale_async_connection_pools()
+    pool = AsyncConnectionPool(
+        check=AsyncConnectionPool.check_connection, **_get_pool_kwargs(db_alias)
+    )
+    await pool.open()
+
+    with _connection_pools_lock:
+        watch_shutdown = loop not in _async_connection_pools
+        loop_pools = _async_connection_pools.setdefault(loop, {})
+        existing_pool = loop_pools.get(db_alias)
+        if existing_pool is None:
+            loop_pools[db_alias] = pool
+
+    if existing_pool is not None:
+        # Another coroutine opened a pool meanwhile.
+        await pool.close()
+        return existing_pool
+    if watch_shutdown:
+        await on_loop_shutdown(aclose_async_connection_pools)
+    logger.info(f"Opened async checkpointer connection pool for database '{db_alias}'")
+    return pool
+
+
+def _discard_stale_async_connection_pools() -> None:
+    """
+    Forget the pools of the loops closed without shutting down their async generators. They
+    can't be closed from another loop, so they're only dropped and their connections are closed
+    when they're garbage collected.
+    """
+    with _connection_pools_lock:
+        stale_loops = [loop for loop in _async_connection_pools.keys() if loop.is_closed()]
+        for loop in stale_loops:
+            del _async_connection_pools[loop]
+    if stale_loops:
+        logger.warning(
+            f"Discarded the async checkpointer connection pools of {len(stale_loops)} closed "
+            "event loop(s)"
+        )
+
+
+def close_connection_pools() -> None:
+    """
+    Close the connection pools. Registered to run at exit; async pools are closed when their
+    event loop shuts down, or with `aclose_async_connection_pools` from that loop.
+    """
+    with _connection_pools_lock:
+        pools = list(_connection_pools.values())
+        _connection_pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+async def aclose_async_connection_pools() -> None:
+    loop = asyncio.get_running_loop()
+    with _connection_pools_lock:
+        pools = list(_async_connection_pools.pop(loop, {}).values())
+    for pool in pools:
+        await pool.close()
+
+
+atexit.register(close_connection_pools)
@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from baseapp_ai_langkit.chats.checkpoint_retention import CheckpointRetention
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete old LangGraph checkpoints, the checkpoints of inactive threads and the "
+        "orphaned channel blobs. Defaults to the BASEAPP_AI_LANGKIT_CHECKPOINTER_RETENTION_* "
+        "settings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--keep-last", type=int, help="Checkpoints to keep per thread.")
+        parser.add_argument(
+            "--ttl-days", type=int, help="Delete the threads inactive for this many days."
+        )
+        parser.add_argument("--batch-size", type=int)
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        ttl = timedelta(days=options["ttl_days"]) if options["ttl_days"] else None
+        metrics = CheckpointRetention(
+            db_alias=options["database"],
+            keep_last=options["keep_last"],
+            ttl=ttl,
+            batch_size=options["batch_size"],
+        ).run()
+        for key, value in metrics.items():
+            self.stdout.write(f"{key}: {value}")
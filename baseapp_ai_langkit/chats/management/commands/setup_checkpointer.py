@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from baseapp_ai_langkit.chats.checkpointer import LangGraphCheckpointer
+
+
+class Command(BaseCommand):
+    help = "Create or migrate the LangGraph checkpoint tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="The database to set up. Defaults to the 'default' database.",
+        )
+
+    def handle(self, *args, **options):
+        LangGraphCheckpointer(db_alias=options["database"]).setup_schema()
+        self.stdout.write(
+            self.style.SUCCESS(f"Checkpoint tables are up to date on '{options['database']}'.")
+        )
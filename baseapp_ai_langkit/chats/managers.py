@@ -1,6 +1,15 @@
-from django.db import models
+from abc import ABCMeta, abstractmethod
+from datetime import datetime
+from typing import Any, Tuple
+
+from django.core.cache import caches
+from django.db import models, transaction
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from baseapp_ai_langkit import app_settings
+from baseapp_ai_langkit.chats.thread_locks import acquire_transaction_lock
+
 
 class ChatSessionManager(models.Manager):
     def get_session_or_error(self, session_id):
@@ -21,7 +30,65 @@ class ChatSessionManager(models.Manager):
             return self.create(user=user)
 
     def get_or_create_user_session(self, user):
-        if user.chat_sessions.exists():
-            return user.chat_sessions.latest()
-        else:
-            return self.create(user=user)
+        """
+        Get the latest session of the user, creating one if there is none.
+
+        Concurrent first requests of a user are serialized with a transaction level advisory
+        lock on the user (on Postgres), so a single session is created. It doesn't block other
+        writes to the user row, but it's held until the outermost transaction ends: with
+        `ATOMIC_REQUESTS`, until the end of the request (including the chat turn), so the other
+        first requests of the same user wait for it rather than creating their own session.
+        """
+        session = self.get_latest_user_session(user)
+        if session:
+            return session
+        with transaction.atomic(using=self.db):
+            acquire_transaction_lock(str(user.pk), "user_session", db_alias=self.db)
+            return self.get_latest_user_session(user) or self.create(user=user)
+
+    def get_latest_user_session(self, user):
+        return self.filter(user=user).order_by("-created").first()
+
+
+class CachedActiveManager(models.Manager, metaclass=ABCMeta):
+    """
+    Caches the active rows of models that rarely change and are read on every chat widget load.
+    The cache is invalidated by the signals in `chats/signals.py`.
+    """
+
+    cache_key: str
+
+    @abstractmethod
+    def get_active(self) -> Any:
+        """
+        Load the active rows from the database.
+        """
+
+    def get_active_cached(self) -> Tuple[Any, datetime]:
+        """
+        Get the active rows, and when they were cached (used as their last modification time,
+        since deleted rows leave no trace).
+        """
+        cache = caches[app_settings.CHATS_CACHE]
+        cached = cache.get(self.cache_key)
+        if cached is None:
+            cached = (self.get_active(), timezone.now().replace(microsecond=0))
+            cache.set(self.cache_key, cached, app_settings.CHATS_CACHE_TIMEOUT)
+        return cached
+
+    def invalidate_cache(self):
+        caches[app_settings.CHATS_CACHE].delete(self.cache_key)
+
+
+class ChatIdentityManager(CachedActiveManager):
+    cache_key = "baseapp_ai_langkit:chats:active_chat_identity"
+
+    def get_active(self):
+        return self.filter(is_active=True).first()
+
+
+class ChatPrePromptedQuestionManager(CachedActiveManager):
+    cache_key = "baseapp_ai_langkit:chats:active_chat_pre_prompted_questions"
+
+    def get_active(self):
+        return list(self.filter(is_active=True))
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("baseapp_ai_langkit_chats", "0002_alter_chatprepromptedquestion_prompt"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="chatmessage",
+            index=models.Index(fields=["session", "-created"], name="chatmessage_session_created"),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("baseapp_ai_langkit_chats", "0003_chatmessage_session_created_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="chatsession",
+            index=models.Index(fields=["user", "-created"], name="chatsession_user_created"),
+        ),
+    ]
@@ -6,7 +6,11 @@ from django.db import models
 from model_utils import Choices
 from model_utils.models import TimeStampedModel
 
-from .managers import ChatSessionManager
+from .managers import (
+    ChatIdentityManager,
+    ChatPrePromptedQuestionManager,
+    ChatSessionManager,
+)
 
 User = get_user_model()
 
@@ -22,6 +26,10 @@ class ChatSession(TimeStampedModel):
 
     class Meta:
         get_latest_by = "created"
+        indexes = [
+            # Latest session of a user (see `ChatSessionManager.get_or_create_user_session`).
+            models.Index(fields=["user", "-created"], name="chatsession_user_created"),
+        ]
 
 
 class ChatMessage(TimeStampedModel):
@@ -31,6 +39,12 @@ class ChatMessage(TimeStampedModel):
     role = models.CharField(max_length=10, choices=ROLE_CHOICES)
     content = models.TextField()
 
+    class Meta:
+        indexes = [
+            # Message history of a session, newest first (see `BaseChatViewSet.list`).
+            models.Index(fields=["session", "-created"], name="chatmessage_session_created"),
+        ]
+
 
 class ChatIdentity(TimeStampedModel):
     name = models.CharField(max_length=255)
@@ -47,6 +61,8 @@ class ChatIdentity(TimeStampedModel):
 
     is_active = models.BooleanField(default=True)
 
+    objects = ChatIdentityManager()
+
     def __str__(self):
         return self.name
 
@@ -86,6 +102,8 @@ class ChatPrePromptedQuestion(TimeStampedModel):
     )
     is_active = models.BooleanField(default=True)
 
+    objects = ChatPrePromptedQuestionManager()
+
     def __str__(self):
         return self.title
 
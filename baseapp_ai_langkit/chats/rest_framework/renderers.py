@@ -0,0 +1,24 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer
+
+
+def format_server_sent_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+class ServerSentEventRenderer(BaseRenderer):
+    """
+    Allows `text/event-stream` requests to be negotiated. Streaming views return the events
+    themselves, other responses (e.g. validation errors) are rendered as a single error event.
+    """
+
+    media_type = "text/event-stream"
+    format = "sse"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return format_server_sent_event("error", data).encode(self.charset)
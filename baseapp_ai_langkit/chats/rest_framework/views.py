@@ -1,9 +1,23 @@
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 from rest_framework import permissions, status, viewsets
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 
 from baseapp_ai_langkit.base.interfaces.base_runner import BaseChatInterface
-from baseapp_ai_langkit.base.interfaces.exceptions import LLMChatInterfaceException
+from baseapp_ai_langkit.base.interfaces.exceptions import (
+    ChatSessionBusyException,
+    LLMChatInterfaceException,
+)
 from baseapp_ai_langkit.chats.models import (
     ChatIdentity,
     ChatMessage,
@@ -11,6 +25,7 @@ from baseapp_ai_langkit.chats.models import (
 )
 from baseapp_ai_langkit.chats.runners.default_chat_runner import DefaultChatRunner
 
+from .renderers import ServerSentEventRenderer, format_server_sent_event
 from .serializers import (
     ChatCreateSerializer,
     ChatIdentitySerializer,
@@ -27,6 +42,18 @@ class ChatMessagePagination(PageNumberPagination):
     max_page_size = 100
 
 
+class ChatMessageCursorPagination(CursorPagination):
+    """
+    Keyset pagination over the (session, -created) index, so every page costs the same however
+    far back in the history it is, and no COUNT query is needed.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "-created"
+
+
 class BaseChatViewSet(viewsets.ViewSet):
     """
     ViewSet designed to be extendable for customizing how your LLM Chat behaves.
@@ -40,17 +67,34 @@ class BaseChatViewSet(viewsets.ViewSet):
     well as handle the session validation.
     - `get_create_serializer`: The serializer used to validate the data of the create endpoint, as
     well as handle the session validation and creation.
+    - `cursor_pagination_class`: The pagination used for the list endpoint when requested with
+    `?pagination=cursor` (or a `cursor` param). Page number pagination is used otherwise.
+    - `persist_user_message_before_run`: Save the user message before running the chat runner,
+    so it's kept even if the runner fails. By default both messages are saved together after it.
+    - `send_message_signals`: Save the messages one by one, sending their `pre_save` and
+    `post_save` signals. By default they're saved with a single `bulk_create`, which doesn't send
+    them. Either way the messages are validated with `get_message_serializer` first.
 
     Everything else is customizable as well.
     """
 
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = ChatMessagePagination
+    cursor_pagination_class = ChatMessageCursorPagination
     chat_runner: BaseChatInterface = DefaultChatRunner
+    persist_user_message_before_run: bool = False
+    send_message_signals: bool = False
 
     def get_queryset(self, session):
         return ChatMessage.objects.filter(session=session).order_by("-created")
 
+    def get_paginator(self, request):
+        if request.query_params.get("pagination") == "cursor" or (
+            self.cursor_pagination_class.cursor_query_param in request.query_params
+        ):
+            return self.cursor_pagination_class()
+        return self.pagination_class()
+
     def get_list_serializer(self, *args, **kwargs):
         return ChatListSerializer(*args, **kwargs)
 
@@ -63,6 +107,25 @@ class BaseChatViewSet(viewsets.ViewSet):
     def get_session_serializer(self, *args, **kwargs):
         return ChatSessionSerializer(*args, **kwargs)
 
+    def build_message(self, session, role: str, content: str) -> ChatMessage:
+        """
+        Validate the message with the message serializer and build it, without saving it.
+        """
+        serializer = self.get_message_serializer(
+            data={"session": session.id, "role": role, "content": content}
+        )
+        serializer.is_valid(raise_exception=True)
+        return ChatMessage(**serializer.validated_data)
+
+    def save_messages(self, messages: list[ChatMessage]):
+        if self.send_message_signals:
+            with transaction.atomic():
+                for message in messages:
+                    message.save()
+            return messages
+        # A single INSERT, bulk_create runs it in a transaction.
+        return ChatMessage.objects.bulk_create(messages)
+
     def list(self, request):
         serializer = self.get_list_serializer(
             data=request.query_params, context={"request": request}
@@ -76,74 +139,162 @@ class BaseChatViewSet(viewsets.ViewSet):
             session = serializer.get_or_create_user_session()
 
         messages = self.get_queryset(session)
-        paginator = self.pagination_class()
+        paginator = self.get_paginator(request)
         paginated_messages = paginator.paginate_queryset(messages, request)
         serializer = self.get_message_serializer(paginated_messages, many=True)
         return paginator.get_paginated_response(serializer.data)
 
+    def get_create_session(self, serializer):
+        if serializer.validated_data.get("session_id"):
+            return serializer.get_or_create_session()
+        return serializer.get_or_create_user_session()
+
     def create(self, request):
         serializer = self.get_create_serializer(data=request.data, context={"request": request})
         serializer.is_valid(raise_exception=True)
-        if serializer.validated_data.get("session_id"):
-            session = serializer.get_or_create_session()
-        else:
-            session = serializer.get_or_create_user_session()
+        session = self.get_create_session(serializer)
 
         input_content = serializer.validated_data.get("content")
+        user_message = self.build_message(session, ChatMessage.ROLE_CHOICES.user, input_content)
+        if self.persist_user_message_before_run:
+            user_message.save()
 
         try:
             output_content = self.chat_runner(session=session, user_input=input_content).safe_run()
+        except ChatSessionBusyException as e:
+            return Response(
+                {"error": str(e), "code": "chat_session_busy"},
+                status=status.HTTP_409_CONFLICT,
+            )
         except LLMChatInterfaceException as e:
             return Response(
                 {"error": str(e), "code": "chat_runner_error"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        data = {
-            "session": session.id,
-            "role": ChatMessage.ROLE_CHOICES.user,
-            "content": input_content,
-        }
-        user_message_serializer = self.get_message_serializer(data=data)
-        user_message_serializer.is_valid(raise_exception=True)
-        user_message_serializer.save()
-
-        data = {
-            "session": session.id,
-            "role": ChatMessage.ROLE_CHOICES.assistant,
-            "content": output_content,
-        }
-        assistant_message_serializer = self.get_message_serializer(data=data)
-        assistant_message_serializer.is_valid(raise_exception=True)
-        assistant_message_serializer.save()
+        assistant_message = self.build_message(
+            session, ChatMessage.ROLE_CHOICES.assistant, output_content
+        )
+        if self.persist_user_message_before_run:
+            self.save_messages([assistant_message])
+        else:
+            self.save_messages([user_message, assistant_message])
 
         session_serializer = self.get_session_serializer(session)
 
         response_data = {
             "session": session_serializer.data,
-            "user_message": user_message_serializer.data,
-            "assistant_message": assistant_message_serializer.data,
+            "user_message": self.get_message_serializer(user_message).data,
+            "assistant_message": self.get_message_serializer(assistant_message).data,
         }
 
         return Response(response_data, status=status.HTTP_201_CREATED)
 
+    @action(
+        detail=False,
+        methods=["post"],
+        renderer_classes=[ServerSentEventRenderer, JSONRenderer],
+    )
+    def stream(self, request):
+        """
+        Same as `create`, but the answer is streamed as Server-Sent Events while it's generated:
+        `token` events with the text chunks, then a `done` event with the same data `create`
+        responds with, once the messages are saved. Runner failures send an `error` event.
+        """
+        serializer = self.get_create_serializer(data=request.data, context={"request": request})
+        serializer.is_valid(raise_exception=True)
+        session = self.get_create_session(serializer)
 
-class ChatIdentityViewSet(viewsets.ViewSet):
+        input_content = serializer.validated_data.get("content")
+        user_message = self.build_message(session, ChatMessage.ROLE_CHOICES.user, input_content)
+        if self.persist_user_message_before_run:
+            user_message.save()
+        runner = self.chat_runner(session=session, user_input=input_content)
+
+        def event_stream():
+            tokens = []
+            try:
+                for token in runner.safe_stream():
+                    tokens.append(token)
+                    yield format_server_sent_event("token", {"content": token})
+            except ChatSessionBusyException as e:
+                yield format_server_sent_event(
+                    "error", {"error": str(e), "code": "chat_session_busy"}
+                )
+                return
+            except LLMChatInterfaceException as e:
+                yield format_server_sent_event(
+                    "error", {"error": str(e), "code": "chat_runner_error"}
+                )
+                return
+
+            try:
+                assistant_message = self.build_message(
+                    session, ChatMessage.ROLE_CHOICES.assistant, "".join(tokens)
+                )
+            except ValidationError as e:
+                yield format_server_sent_event(
+                    "error", {"error": e.detail, "code": "invalid_message"}
+                )
+                return
+            if self.persist_user_message_before_run:
+                self.save_messages([assistant_message])
+            else:
+                self.save_messages([user_message, assistant_message])
+
+            yield format_server_sent_event(
+                "done",
+                {
+                    "session": self.get_session_serializer(session).data,
+                    "user_message": self.get_message_serializer(user_message).data,
+                    "assistant_message": self.get_message_serializer(assistant_message).data,
+                },
+            )
+
+        response = StreamingHttpResponse(event_stream(), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        # Disable the response buffering of nginx.
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+
+class ConditionalResponseMixin:
+    """
+    Responds with the ETag (a hash of the data) and Last-Modified headers, or with a 304 when
+    the client's copy is still fresh.
+    """
+
+    def get_conditional_response(self, request, data, last_modified):
+        etag = quote_etag(
+            hashlib.md5(
+                json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True).encode(),
+                usedforsecurity=False,
+            ).hexdigest()
+        )
+        last_modified = int(last_modified.timestamp())
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = Response(data)
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        return response
+
+
+class ChatIdentityViewSet(ConditionalResponseMixin, viewsets.ViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def list(self, request):
-        try:
-            identity = ChatIdentity.objects.get(is_active=True)
-            serializer = ChatIdentitySerializer(identity)
-            return Response(serializer.data)
-        except ChatIdentity.DoesNotExist:
+        identity, last_modified = ChatIdentity.objects.get_active_cached()
+        if identity is None:
             return Response(status=status.HTTP_404_NOT_FOUND)
+        serializer = ChatIdentitySerializer(identity)
+        return self.get_conditional_response(request, serializer.data, last_modified)
 
 
-class ChatPrePromptedQuestionViewSet(viewsets.ViewSet):
+class ChatPrePromptedQuestionViewSet(ConditionalResponseMixin, viewsets.ViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def list(self, request):
-        queryset = ChatPrePromptedQuestion.objects.filter(is_active=True)
-        serializer = ChatPrePromptedQuestionSerializer(queryset, many=True)
-        return Response(serializer.data)
+        questions, last_modified = ChatPrePromptedQuestion.objects.get_active_cached()
+        serializer = ChatPrePromptedQuestionSerializer(questions, many=True)
+        return self.get_conditional_response(request, serializer.data, last_modified)
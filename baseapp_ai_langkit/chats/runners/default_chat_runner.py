@@ -1,10 +1,22 @@
+from typing import ContextManager, Iterator, Optional
+
+from asgiref.sync import sync_to_async
+from langchain_core.messages import AIMessage
 from langchain_openai import ChatOpenAI
 from langgraph.checkpoint.postgres import PostgresSaver
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 
+from baseapp_ai_langkit import app_settings
 from baseapp_ai_langkit.base.interfaces.base_runner import BaseChatInterface
+from baseapp_ai_langkit.base.utils.llm_clients import get_llm, get_summarization_llm
 from baseapp_ai_langkit.base.workers.messages_worker import MessagesWorker
 from baseapp_ai_langkit.base.workflows.general_chat_workflow import GeneralChatWorkflow
-from baseapp_ai_langkit.chats.checkpointer import LangGraphCheckpointer
+from baseapp_ai_langkit.chats.checkpointer import (
+    AsyncLangGraphCheckpointer,
+    LangGraphCheckpointer,
+)
+from baseapp_ai_langkit.chats.tasks import summarize_conversation
+from baseapp_ai_langkit.chats.thread_locks import try_thread_lock
 
 
 class DefaultChatRunner(BaseChatInterface):
@@ -23,21 +35,95 @@ class DefaultChatRunner(BaseChatInterface):
         response = self.process_workflow()
         return response
 
+    def stream(self) -> Iterator[str]:
+        self.llm = self.initialize_llm()
+        self.nodes = self.get_nodes(llm=self.llm, config=self.config)
+        self.checkpointer = self.create_checkpointer()
+        workflow = self.get_workflow()
+        for message_chunk, _ in workflow.stream(self.user_input):
+            if isinstance(message_chunk, AIMessage) and isinstance(message_chunk.content, str):
+                yield message_chunk.content
+        if workflow.background_summarization:
+            self.maybe_schedule_summarization(
+                workflow, workflow.workflow_chain.get_state(self.config).values
+            )
+
+    async def arun(self) -> str:
+        self.llm = self.initialize_llm()
+        # Loading the prompt overrides hits the database.
+        self.nodes = await sync_to_async(self.get_nodes)(llm=self.llm, config=self.config)
+        self.checkpointer = await self.acreate_checkpointer()
+        response = await self.aprocess_workflow()
+        return response
+
+    def summarize(self) -> bool:
+        """
+        Summarize the session's conversation if it needs it. Called by the
+        `summarize_conversation` task when the summarization runs in the background.
+        """
+        self.llm = self.initialize_llm()
+        self.nodes = self.get_nodes(llm=self.llm, config=self.config)
+        self.checkpointer = self.create_checkpointer()
+        workflow = self.get_workflow()
+        return workflow.summarize_thread(update_lock=self.lock_summary_update) is not None
+
+    def lock_summary_update(self) -> ContextManager[bool]:
+        """
+        Lock the session's turns while the summary is saved. It waits for the running turn like
+        a queued turn would, and the summary is discarded if it's still running after
+        `CHATS_TURN_LOCK_TIMEOUT`.
+        """
+        return try_thread_lock(
+            str(self.session.id), "turn", timeout=app_settings.CHATS_TURN_LOCK_TIMEOUT
+        )
+
+    def maybe_schedule_summarization(self, workflow: GeneralChatWorkflow, state: dict):
+        if workflow.background_summarization and workflow.should_summarize(state):
+            runner_class = self.__class__
+            summarize_conversation.delay(
+                f"{runner_class.__module__}.{runner_class.__qualname__}", str(self.session.id)
+            )
+
     def initialize_llm(self) -> ChatOpenAI:
-        return ChatOpenAI(model="gpt-4o-mini", temperature=0)
+        return get_llm(ChatOpenAI, model="gpt-4o-mini", temperature=0)
+
+    def initialize_summarization_llm(self) -> Optional[ChatOpenAI]:
+        """
+        The llm summarizing the conversation. None summarizes it with the chat llm.
+        """
+        return get_summarization_llm(ChatOpenAI)
 
     def create_checkpointer(self) -> PostgresSaver:
         checkpointer_wrapper = LangGraphCheckpointer()
         checkpointer_wrapper.setup()
         return checkpointer_wrapper.get_checkpointer()
 
+    async def acreate_checkpointer(self) -> AsyncPostgresSaver:
+        checkpointer_wrapper = AsyncLangGraphCheckpointer()
+        await checkpointer_wrapper.setup()
+        return checkpointer_wrapper.get_checkpointer()
+
     def process_workflow(self):
-        workflow = GeneralChatWorkflow(
+        workflow = self.get_workflow()
+        response = workflow.execute(self.user_input)
+        self.maybe_schedule_summarization(workflow, response)
+        return response["messages"][-1].content
+
+    async def aprocess_workflow(self):
+        workflow = self.get_workflow()
+        response = await workflow.aexecute(self.user_input)
+        await sync_to_async(self.maybe_schedule_summarization)(workflow, response)
+        return response["messages"][-1].content
+
+    def get_workflow(self) -> GeneralChatWorkflow:
+        return GeneralChatWorkflow(
             llm=self.llm,
             config=self.config,
             checkpointer=self.checkpointer,
             nodes=self.nodes,
+            max_tokens=app_settings.CHATS_SUMMARIZATION_MAX_TOKENS or None,
+            background_summarization=app_settings.CHATS_BACKGROUND_SUMMARIZATION,
+            summarization_llm=self.initialize_summarization_llm(),
+            summarization_max_input_tokens=app_settings.CHATS_SUMMARIZATION_MAX_INPUT_TOKENS
+            or None,
         )
-
-        response = workflow.execute(self.user_input)
-        return response["messages"][-1].content
@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from baseapp_ai_langkit.base.utils.cache_invalidation import (
+    invalidate_now_and_on_commit,
+)
+from baseapp_ai_langkit.chats.models import ChatIdentity, ChatPrePromptedQuestion
+
+
+@receiver(
+    post_save,
+    sender=ChatIdentity,
+    dispatch_uid="baseapp_ai_langkit.chats.signals.invalidate_chat_identity_cache_on_save",
+)
+@receiver(
+    post_delete,
+    sender=ChatIdentity,
+    dispatch_uid="baseapp_ai_langkit.chats.signals.invalidate_chat_identity_cache_on_delete",
+)
+@receiver(
+    post_save,
+    sender=ChatPrePromptedQuestion,
+    dispatch_uid="baseapp_ai_langkit.chats.signals.invalidate_pre_prompted_question_cache_on_save",
+)
+@receiver(
+    post_delete,
+    sender=ChatPrePromptedQuestion,
+    dispatch_uid=(
+        "baseapp_ai_langkit.chats.signals.invalidate_pre_prompted_question_cache_on_delete"
+    ),
+)
+def invalidate_active_cache(sender, using: str, **kwargs):
+    invalidate_now_and_on_commit(sender.objects.invalidate_cache, using)
@@ -0,0 +1,46 @@
+import logging
+
+from celery import shared_task
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.module_loading import import_string
+
+from baseapp_ai_langkit.chats.checkpoint_retention import CheckpointRetention
+from baseapp_ai_langkit.chats.models import ChatSession
+from baseapp_ai_langkit.chats.thread_locks import try_thread_lock
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def prune_checkpoints(db_alias: str = DEFAULT_DB_ALIAS) -> dict:
+    """
+    Apply the checkpoint retention policy. Meant to be scheduled periodically (e.g. with
+    Celery beat).
+    """
+    return CheckpointRetention(db_alias=db_alias).run()
+
+
+@shared_task
+def summarize_conversation(runner_class_path: str, session_id: str) -> bool:
+    """
+    Summarize the conversation of a chat session with the given runner (see
+    `DefaultChatRunner.summarize`). Skipped if the session is already being summarized.
+
+    The runner only holds the session's turn lock while it saves the summary, not while the
+    summary is generated (see `ConversationalWorkflow.summarize_thread`).
+
+    The locks are session level advisory locks, which are reentrant for the same database
+    connection: with `CELERY_TASK_ALWAYS_EAGER` the task runs in the turn that scheduled it,
+    which already holds the turn lock, so it summarizes the conversation right away.
+    """
+    try:
+        session = ChatSession.objects.get(pk=session_id)
+    except ChatSession.DoesNotExist:
+        return False
+
+    with try_thread_lock(str(session.id), "summarization") as acquired:
+        if not acquired:
+            logger.info(f"Chat session {session.id} is already being summarized.")
+            return False
+        runner_class = import_string(runner_class_path)
+        return runner_class(session=session, user_input="").summarize()
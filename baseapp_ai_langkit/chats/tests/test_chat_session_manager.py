@@ -0,0 +1,55 @@
+from unittest import skipUnless
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test import TestCase
+
+from baseapp_ai_langkit.chats.models import ChatSession
+from baseapp_ai_langkit.chats.tests.factories import ChatSessionFactory
+from baseapp_ai_langkit.chats.thread_locks import (
+    TRY_LOCK_SQL,
+    UNLOCK_SQL,
+    get_thread_lock_key,
+)
+from baseapp_ai_langkit.tests.factories import UserFactory
+
+
+class TestChatSessionManager(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+
+    def test_get_latest_user_session_in_a_single_query(self):
+        ChatSessionFactory(user=self.user)
+        latest = ChatSessionFactory(user=self.user)
+        ChatSessionFactory()
+
+        with self.assertNumQueries(1):
+            session = ChatSession.objects.get_or_create_user_session(self.user)
+
+        self.assertEqual(str(session.id), str(latest.id))
+
+    def test_create_user_session(self):
+        session = ChatSession.objects.get_or_create_user_session(self.user)
+
+        self.assertEqual(session.user, self.user)
+        self.assertEqual(ChatSession.objects.get_or_create_user_session(self.user), session)
+        self.assertEqual(self.user.chat_sessions.count(), 1)
+
+
+@skipUnless(connection.vendor == "postgresql", "The locks require PostgreSQL.")
+class TestChatSessionManagerOnPostgres(TestCase):
+    def test_session_creation_locks_the_user_until_the_transaction_ends(self):
+        user = UserFactory()
+        other_connection = connections.create_connection(DEFAULT_DB_ALIAS)
+        self.addCleanup(other_connection.close)
+        lock_key = get_thread_lock_key(str(user.pk), "user_session")
+
+        # The test runs in a transaction, like a request with ATOMIC_REQUESTS.
+        ChatSession.objects.get_or_create_user_session(user)
+
+        with other_connection.cursor() as cursor:
+            cursor.execute(TRY_LOCK_SQL, [lock_key])
+            self.assertFalse(cursor.fetchone()[0])
+            # Only the user's session creation is locked.
+            cursor.execute(TRY_LOCK_SQL, [get_thread_lock_key(str(user.pk), "turn")])
+            self.assertTrue(cursor.fetchone()[0])
+            cursor.execute(UNLOCK_SQL, [get_thread_lock_key(str(user.pk), "turn")])
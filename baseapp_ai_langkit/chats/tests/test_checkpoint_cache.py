@@ -0,0 +1,114 @@
+import asyncio
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import START, MessagesState, StateGraph
+
+from baseapp_ai_langkit.chats.checkpoint_cache import get_cached_saver_class
+from baseapp_ai_langkit.chats.checkpointer import (
+    CompatiblePostgresSaver,
+    LangGraphCheckpointer,
+)
+
+CachedInMemorySaver = get_cached_saver_class(InMemorySaver)
+
+
+class TestCheckpointCache(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.saver = CachedInMemorySaver(cache_alias="default")
+        self.config = {"configurable": {"thread_id": "1"}}
+
+        llm = FakeListChatModel(responses=["Hi!", "Fine."])
+        workflow = StateGraph(MessagesState)
+        workflow.add_node("llm", lambda state: {"messages": [llm.invoke(state["messages"])]})
+        workflow.add_edge(START, "llm")
+        self.graph = workflow.compile(checkpointer=self.saver)
+
+    def test_latest_checkpoint_is_loaded_from_the_cache(self):
+        self.graph.invoke({"messages": [HumanMessage(content="Hello")]}, self.config)
+        stored = InMemorySaver.get_tuple(self.saver, self.config)
+
+        with patch.object(InMemorySaver, "get_tuple") as mock_get_tuple:
+            cached = self.saver.get_tuple(self.config)
+
+        mock_get_tuple.assert_not_called()
+        self.assertEqual(cached.config, stored.config)
+        self.assertEqual(cached.parent_config, stored.parent_config)
+        self.assertEqual(cached.checkpoint["channel_values"], stored.checkpoint["channel_values"])
+        self.assertEqual(
+            cached.checkpoint["channel_versions"], stored.checkpoint["channel_versions"]
+        )
+
+    def test_following_turns_use_the_cached_state(self):
+        self.graph.invoke({"messages": [HumanMessage(content="Hello")]}, self.config)
+        result = self.graph.invoke(
+            {"messages": [HumanMessage(content="How are you?")]}, self.config
+        )
+
+        self.assertEqual(
+            [message.content for message in result["messages"]],
+            ["Hello", "Hi!", "How are you?", "Fine."],
+        )
+
+    def test_specific_checkpoint_bypasses_the_cache(self):
+        self.graph.invoke({"messages": [HumanMessage(content="Hello")]}, self.config)
+        first = list(self.saver.list(self.config))[-1]
+
+        self.assertEqual(self.saver.get_tuple(first.config).config, first.config)
+
+    def test_writes_and_delete_thread_invalidate_the_cache(self):
+        self.graph.invoke({"messages": [HumanMessage(content="Hello")]}, self.config)
+        latest_config = self.saver.get_tuple(self.config).config
+        key = self.saver.get_cache_key(self.config)
+
+        self.saver.put_writes(latest_config, [("messages", [])], task_id="task")
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(len(self.saver.get_tuple(self.config).pending_writes), 1)
+
+        self.saver.delete_thread("1")
+        self.assertIsNone(cache.get(key))
+        self.assertIsNone(self.saver.get_tuple(self.config))
+
+    def test_async_methods(self):
+        async def run():
+            await self.graph.ainvoke(
+                {"messages": [HumanMessage(content="Hello")]}, self.config, durability="exit"
+            )
+            with patch.object(InMemorySaver, "aget_tuple") as mock_aget_tuple:
+                checkpoint_tuple = await self.saver.aget_tuple(self.config)
+            mock_aget_tuple.assert_not_called()
+            return checkpoint_tuple
+
+        checkpoint_tuple = asyncio.run(run())
+
+        self.assertEqual(len(checkpoint_tuple.checkpoint["channel_values"]["messages"]), 2)
+
+    @override_settings(
+        CACHES={
+            "local": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+            "dummy": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        }
+    )
+    def test_warns_about_caches_not_shared_by_the_processes(self):
+        for alias in ("local", "dummy"):
+            with self.assertLogs("baseapp_ai_langkit.chats.checkpoint_cache", "WARNING") as logs:
+                CachedInMemorySaver(cache_alias=alias)
+                CachedInMemorySaver(cache_alias=alias)
+            self.assertEqual(len(logs.records), 1)
+            self.assertIn(f"'{alias}'", logs.output[0])
+
+    @override_settings(BASEAPP_AI_LANGKIT_CHECKPOINTER_CACHE="default")
+    @patch("baseapp_ai_langkit.chats.checkpointer.get_connection_pool")
+    def test_checkpointer_uses_the_cache_when_enabled(self, mock_get_connection_pool):
+        with override_settings(BASEAPP_AI_LANGKIT_CHECKPOINTER_AUTO_SETUP=False):
+            checkpointer = LangGraphCheckpointer()
+            checkpointer.setup()
+
+        saver = checkpointer.get_checkpointer()
+        self.assertIsInstance(saver, CompatiblePostgresSaver)
+        self.assertIsInstance(saver, get_cached_saver_class(CompatiblePostgresSaver))
@@ -0,0 +1,187 @@
+import uuid
+from datetime import timedelta
+from io import StringIO
+from unittest import skipUnless
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from langgraph.checkpoint.base import create_checkpoint, empty_checkpoint
+
+from baseapp_ai_langkit.chats.checkpoint_cache import get_checkpoint_cache_key
+from baseapp_ai_langkit.chats.checkpoint_retention import (
+    EXPIRE_INACTIVE_THREADS_SQL,
+    PRUNE_OLD_CHECKPOINTS_SQL,
+    PRUNE_ORPHAN_BLOBS_SQL,
+    CheckpointRetention,
+)
+from baseapp_ai_langkit.chats.checkpointer import LangGraphCheckpointer
+from baseapp_ai_langkit.chats.tasks import prune_checkpoints
+
+
+@patch("baseapp_ai_langkit.chats.checkpoint_retention.get_connection_pool")
+class TestCheckpointRetention(TestCase):
+    def mock_results(self, mock_get_connection_pool, results):
+        connection = mock_get_connection_pool.return_value.connection.return_value.__enter__()
+
+        def execute(sql, params):
+            return MagicMock(fetchone=MagicMock(return_value=results[sql].pop(0)))
+
+        connection.execute.side_effect = execute
+        return connection
+
+    def test_run_in_batches(self, mock_get_connection_pool):
+        connection = self.mock_results(
+            mock_get_connection_pool,
+            {
+                EXPIRE_INACTIVE_THREADS_SQL: [
+                    {
+                        "expired_checkpoints": [["1", ""]],
+                        "threads": 1,
+                        "checkpoints": 12,
+                        "writes": 3,
+                        "blobs": 4,
+                        "bytes": 100,
+                    },
+                ],
+                PRUNE_OLD_CHECKPOINTS_SQL: [
+                    {"checkpoints": 2, "writes": 1, "bytes": 50},
+                    {"checkpoints": 1, "writes": 0, "bytes": 20},
+                ],
+                PRUNE_ORPHAN_BLOBS_SQL: [{"blobs": 0, "bytes": 0}],
+            },
+        )
+
+        metrics = CheckpointRetention(keep_last=5, ttl=timedelta(days=30), batch_size=2).run()
+
+        self.assertEqual(
+            metrics,
+            {
+                "threads_expired": 1,
+                "checkpoints_deleted": 15,
+                "writes_deleted": 4,
+                "blobs_deleted": 4,
+                "bytes_reclaimed": 170,
+            },
+        )
+        self.assertEqual(connection.execute.call_count, 4)
+        params = connection.execute.call_args_list[1].args[1]
+        self.assertEqual(params, {"keep_last": 5, "batch_size": 2})
+
+    @override_settings(BASEAPP_AI_LANGKIT_CHECKPOINTER_CACHE="default")
+    def test_expired_threads_are_removed_from_the_cache(self, mock_get_connection_pool):
+        self.mock_results(
+            mock_get_connection_pool,
+            {
+                EXPIRE_INACTIVE_THREADS_SQL: [
+                    {
+                        "expired_checkpoints": [["1", ""], ["1", "child"]],
+                        "threads": 1,
+                        "checkpoints": 2,
+                        "writes": 0,
+                        "blobs": 0,
+                        "bytes": 10,
+                    },
+                ],
+                PRUNE_ORPHAN_BLOBS_SQL: [{"blobs": 0, "bytes": 0}],
+            },
+        )
+        for key in ("1", "2"):
+            cache.set(get_checkpoint_cache_key(key), "checkpoint")
+        cache.set(get_checkpoint_cache_key("1", "child"), "checkpoint")
+
+        CheckpointRetention(keep_last=0, ttl=timedelta(days=30)).run()
+
+        self.assertIsNone(cache.get(get_checkpoint_cache_key("1")))
+        self.assertIsNone(cache.get(get_checkpoint_cache_key("1", "child")))
+        self.assertEqual(cache.get(get_checkpoint_cache_key("2")), "checkpoint")
+
+    @override_settings(BASEAPP_AI_LANGKIT_CHECKPOINTER_RETENTION_KEEP_LAST=0)
+    def test_run_with_retention_disabled_only_prunes_orphan_blobs(self, mock_get_connection_pool):
+        connection = self.mock_results(
+            mock_get_connection_pool, {PRUNE_ORPHAN_BLOBS_SQL: [{"blobs": 3, "bytes": 30}]}
+        )
+
+        metrics = prune_checkpoints()
+
+        self.assertEqual(metrics["blobs_deleted"], 3)
+        self.assertEqual(metrics["checkpoints_deleted"], 0)
+        connection.execute.assert_called_once()
+        mock_get_connection_pool.assert_called_once_with("default")
+
+    def test_ttl_setting(self, mock_get_connection_pool):
+        self.assertIsNone(CheckpointRetention().ttl)
+        with self.settings(BASEAPP_AI_LANGKIT_CHECKPOINTER_RETENTION_TTL_DAYS=7):
+            self.assertEqual(CheckpointRetention().ttl, timedelta(days=7))
+
+    @patch("baseapp_ai_langkit.chats.checkpoint_retention.CheckpointRetention.run")
+    def test_prune_checkpoints_command(self, mock_run, mock_get_connection_pool):
+        mock_run.return_value = {"checkpoints_deleted": 2}
+        out = StringIO()
+
+        call_command("prune_checkpoints", "--keep-last=3", "--ttl-days=30", stdout=out)
+
+        mock_run.assert_called_once()
+        self.assertIn("checkpoints_deleted: 2", out.getvalue())
+
+
+@skipUnless(connection.vendor == "postgresql", "The checkpoint tables require PostgreSQL.")
+class TestCheckpointRetentionQueries(TestCase):
+    def setUp(self):
+        checkpointer = LangGraphCheckpointer(shallow=False)
+        checkpointer.setup_schema()
+        checkpointer.setup()
+        self.saver = checkpointer.get_checkpointer()
+        self.active_thread = str(uuid.uuid4())
+        self.inactive_thread = str(uuid.uuid4())
+
+    def tearDown(self):
+        # The savers use their own connections, so the rows aren't rolled back.
+        self.saver.delete_thread(self.active_thread)
+        self.saver.delete_thread(self.inactive_thread)
+
+    def put_checkpoints(self, thread_id, count, ts=None):
+        config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+        checkpoint = empty_checkpoint()
+        for step in range(count):
+            checkpoint = create_checkpoint(checkpoint, None, step)
+            checkpoint["channel_values"] = {"messages": [f"Message {step}"]}
+            checkpoint["channel_versions"] = {"messages": str(step)}
+            if ts:
+                checkpoint["ts"] = ts.isoformat()
+            config = self.saver.put(config, checkpoint, {"step": step}, {"messages": str(step)})
+            self.saver.put_writes(config, [("messages", [f"Write {step}"])], task_id="task")
+
+    def count_rows(self, table, thread_id):
+        with self.saver.conn.connection() as conn:
+            row = conn.execute(
+                f"SELECT count(*) AS count FROM {table} WHERE thread_id = %s", (thread_id,)
+            ).fetchone()
+        return row["count"]
+
+    def test_run(self):
+        self.put_checkpoints(self.active_thread, 4)
+        self.put_checkpoints(self.inactive_thread, 2, ts=timezone.now() - timedelta(days=60))
+
+        cache.set(get_checkpoint_cache_key(self.inactive_thread), "checkpoint")
+
+        with self.settings(BASEAPP_AI_LANGKIT_CHECKPOINTER_CACHE="default"):
+            metrics = CheckpointRetention(
+                keep_last=2, ttl=timedelta(days=30), batch_size=1, active_grace=timedelta(0)
+            ).run()
+
+        self.assertEqual(metrics["threads_expired"], 1)
+        self.assertEqual(metrics["checkpoints_deleted"], 4)
+        self.assertEqual(metrics["writes_deleted"], 4)
+        self.assertEqual(metrics["blobs_deleted"], 4)
+        self.assertGreater(metrics["bytes_reclaimed"], 0)
+        self.assertIsNone(cache.get(get_checkpoint_cache_key(self.inactive_thread)))
+
+        for table in ("checkpoints", "checkpoint_writes", "checkpoint_blobs"):
+            self.assertEqual(self.count_rows(table, self.inactive_thread), 0)
+            self.assertEqual(self.count_rows(table, self.active_thread), 2)
+        state = self.saver.get_tuple({"configurable": {"thread_id": self.active_thread}})
+        self.assertEqual(state.checkpoint["channel_values"], {"messages": ["Message 3"]})
@@ -0,0 +1,64 @@
+import zlib
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from baseapp_ai_langkit.chats import checkpoint_serde
+from baseapp_ai_langkit.chats.checkpoint_serde import (
+    CompressedJsonPlusSerializer,
+    get_checkpoint_serde,
+)
+
+
+class TestCompressedJsonPlusSerializer(TestCase):
+    def setUp(self):
+        self.messages = [
+            HumanMessage(content="Hello " * 500, id="1"),
+            AIMessage(content="Hi! How can I help you?", id="2"),
+        ]
+
+    def test_large_values_are_compressed(self):
+        serde = CompressedJsonPlusSerializer(min_size=100)
+        plain_type, plain_data = JsonPlusSerializer().dumps_typed(self.messages)
+
+        type_, data = serde.dumps_typed(self.messages)
+
+        self.assertEqual(plain_type, "msgpack")
+        self.assertEqual(type_, "msgpack+zstd")
+        self.assertLess(len(data), len(plain_data))
+        self.assertEqual(serde.loads_typed((type_, data)), self.messages)
+
+    def test_small_values_are_not_compressed(self):
+        serde = CompressedJsonPlusSerializer(min_size=100)
+
+        self.assertEqual(serde.dumps_typed({"a": 1})[0], "msgpack")
+        self.assertEqual(serde.dumps_typed(None), ("null", b""))
+
+    def test_zlib_fallback(self):
+        serde = CompressedJsonPlusSerializer(min_size=0)
+
+        with patch.object(checkpoint_serde, "zstandard", None):
+            type_, data = serde.dumps_typed(self.messages)
+
+        self.assertEqual(type_, "msgpack+zlib")
+        self.assertEqual(serde.loads_typed((type_, data)), self.messages)
+        self.assertEqual(zlib.decompress(data), JsonPlusSerializer().dumps_typed(self.messages)[1])
+
+    def test_loads_legacy_values(self):
+        serde = CompressedJsonPlusSerializer()
+        legacy = JsonPlusSerializer().dumps_typed(self.messages)
+
+        self.assertEqual(serde.loads_typed(legacy), self.messages)
+        self.assertEqual(serde.loads_typed(("json", b'{"summary": "test"}')), {"summary": "test"})
+
+    @override_settings(
+        BASEAPP_AI_LANGKIT_CHECKPOINTER_SERDE=(
+            "langgraph.checkpoint.serde.jsonplus.JsonPlusSerializer"
+        )
+    )
+    def test_get_checkpoint_serde_setting(self):
+        serde = get_checkpoint_serde()
+
+        self.assertIs(type(serde), JsonPlusSerializer)
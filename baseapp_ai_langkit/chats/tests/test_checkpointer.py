@@ -1,8 +1,17 @@
-from unittest.mock import MagicMock, patch
+import asyncio
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
-from django.test import TestCase
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 
-from baseapp_ai_langkit.chats.checkpointer import CompatiblePostgresSaver
+from baseapp_ai_langkit.chats import checkpointer as checkpointer_module
+from baseapp_ai_langkit.chats.checkpointer import (
+    AsyncCompatiblePostgresSaver,
+    AsyncLangGraphCheckpointer,
+    CompatiblePostgresSaver,
+    LangGraphCheckpointer,
+    ShallowCompatiblePostgresSaver,
+)
 
 
 class TestCompatiblePostgresSaver(TestCase):
@@ -183,3 +192,130 @@ class TestCompatiblePostgresSaver(TestCase):
         # Verify parent method was called with patched value
         mock_parent.assert_called_once_with(value)
         self.assertEqual(result, expected_result)
+
+
+@patch("baseapp_ai_langkit.chats.checkpointer.get_connection_pool")
+@patch("baseapp_ai_langkit.chats.checkpointer.CompatiblePostgresSaver")
+class TestLangGraphCheckpointerSetup(TestCase):
+    def setUp(self):
+        checkpointer_module._migrated_db_aliases.clear()
+
+    def tearDown(self):
+        checkpointer_module._migrated_db_aliases.clear()
+
+    def test_setup_migrates_once_per_process(self, mock_saver_class, mock_get_connection_pool):
+        LangGraphCheckpointer().setup()
+        LangGraphCheckpointer().setup()
+
+        self.assertEqual(mock_saver_class.call_count, 2)
+        mock_saver_class.return_value.setup.assert_called_once()
+
+    @override_settings(BASEAPP_AI_LANGKIT_CHECKPOINTER_AUTO_SETUP=False)
+    def test_setup_without_auto_setup(self, mock_saver_class, mock_get_connection_pool):
+        LangGraphCheckpointer().setup()
+
+        mock_saver_class.return_value.setup.assert_not_called()
+
+    @patch("baseapp_ai_langkit.chats.checkpointer.get_conninfo", return_value="dbname=test")
+    @patch("baseapp_ai_langkit.chats.checkpointer.psycopg.connect")
+    def test_setup_schema(
+        self, mock_connect, mock_get_conninfo, mock_saver_class, mock_get_connection_pool
+    ):
+        LangGraphCheckpointer().setup_schema()
+
+        connection = mock_connect.return_value.__enter__.return_value
+        mock_saver_class.assert_called_once_with(connection)
+        mock_saver_class.return_value.setup.assert_called_once()
+        mock_get_connection_pool.assert_not_called()
+        self.assertIn("default", checkpointer_module._migrated_db_aliases)
+
+        LangGraphCheckpointer().setup()
+        mock_saver_class.return_value.setup.assert_called_once()
+
+    @patch("baseapp_ai_langkit.chats.checkpointer.LangGraphCheckpointer.setup_schema")
+    def test_setup_checkpointer_command(
+        self, mock_setup_schema, mock_saver_class, mock_get_connection_pool
+    ):
+        call_command("setup_checkpointer", stdout=MagicMock())
+
+        mock_setup_schema.assert_called_once()
+
+
+class TestAsyncCompatiblePostgresSaver(TestCase):
+    @patch(
+        "baseapp_ai_langkit.chats.checkpointer.AsyncPostgresSaver._load_checkpoint_tuple",
+        new_callable=AsyncMock,
+    )
+    def test_load_checkpoint_tuple_with_old_format(self, mock_parent):
+        value = {"checkpoint": {"ts": "2024-01-01T00:00:00"}, "channel_values": None}
+
+        async def load():
+            # The async saver must be created within an event loop.
+            saver = AsyncCompatiblePostgresSaver(MagicMock())
+            return await saver._load_checkpoint_tuple(value)
+
+        result = asyncio.run(load())
+
+        self.assertEqual(value["channel_values"], [])
+        self.assertEqual(value["checkpoint"]["channel_values"], {})
+        mock_parent.assert_awaited_once_with(value)
+        self.assertEqual(result, mock_parent.return_value)
+
+
+@patch("baseapp_ai_langkit.chats.checkpointer.aget_async_connection_pool", new_callable=AsyncMock)
+@patch("baseapp_ai_langkit.chats.checkpointer.AsyncCompatiblePostgresSaver")
+class TestAsyncLangGraphCheckpointerSetup(TestCase):
+    def setUp(self):
+        checkpointer_module._migrated_db_aliases.clear()
+
+    def tearDown(self):
+        checkpointer_module._migrated_db_aliases.clear()
+
+    def test_setup_migrates_once_per_process(self, mock_saver_class, mock_get_connection_pool):
+        mock_saver_class.return_value.setup = AsyncMock()
+
+        async def setup():
+            checkpointer = AsyncLangGraphCheckpointer()
+            await checkpointer.setup()
+            await AsyncLangGraphCheckpointer().setup()
+            return checkpointer
+
+        checkpointer = asyncio.run(setup())
+
+        mock_get_connection_pool.assert_awaited_with("default")
+        mock_saver_class.assert_called_with(mock_get_connection_pool.return_value, serde=ANY)
+        mock_saver_class.return_value.setup.assert_awaited_once()
+        self.assertIs(checkpointer.get_checkpointer(), mock_saver_class.return_value)
+
+
+class TestShallowCompatiblePostgresSaver(TestCase):
+    @patch("baseapp_ai_langkit.chats.checkpointer.PostgresSaver.put")
+    def test_put_deletes_previous_checkpoints(self, mock_parent_put):
+        saver = ShallowCompatiblePostgresSaver(MagicMock())
+        saver._cursor = MagicMock()
+        cursor = saver._cursor.return_value.__enter__.return_value
+        config = {"configurable": {"thread_id": "1", "checkpoint_ns": ""}}
+        checkpoint = {"id": "checkpoint-2", "channel_versions": {"messages": "2"}}
+
+        result = saver.put(config, checkpoint, {}, {"messages": "2"})
+
+        self.assertEqual(result, mock_parent_put.return_value)
+        self.assertEqual(cursor.execute.call_count, 3)
+        queries = [call.args[0] for call in cursor.execute.call_args_list]
+        self.assertIn("DELETE FROM checkpoint_writes", queries[0])
+        self.assertIn("DELETE FROM checkpoints", queries[1])
+        self.assertIn("DELETE FROM checkpoint_blobs", queries[2])
+        self.assertEqual(cursor.execute.call_args_list[1].args[1], ("1", "", "checkpoint-2"))
+
+    @patch("baseapp_ai_langkit.chats.checkpointer.get_connection_pool")
+    def test_shallow_checkpointer(self, mock_get_connection_pool):
+        checkpointer_module._migrated_db_aliases.add("default")
+        self.addCleanup(checkpointer_module._migrated_db_aliases.clear)
+
+        checkpointer = LangGraphCheckpointer(shallow=True)
+        checkpointer.setup()
+
+        self.assertIsInstance(checkpointer.get_checkpointer(), ShallowCompatiblePostgresSaver)
+        self.assertEqual(checkpointer.get_checkpointer().durability, "exit")
+        with self.settings(BASEAPP_AI_LANGKIT_CHECKPOINTER_SHALLOW=True):
+            self.assertTrue(LangGraphCheckpointer().shallow)
@@ -0,0 +1,125 @@
+import asyncio
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
+
+from django.test import TestCase, override_settings
+
+from baseapp_ai_langkit.chats import connection_pools
+from baseapp_ai_langkit.chats.checkpoint_serde import CompressedJsonPlusSerializer
+from baseapp_ai_langkit.chats.checkpointer import LangGraphCheckpointer
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": "langkit",
+        "USER": "user",
+        "PASSWORD": "p@ss word",
+        "HOST": "db",
+        "PORT": 5432,
+    }
+}
+
+
+@override_settings(DATABASES=DATABASES)
+class TestConnectionPools(TestCase):
+    def setUp(self):
+        connection_pools._connection_pools.clear()
+        connection_pools._async_connection_pools.clear()
+
+    def tearDown(self):
+        connection_pools._connection_pools.clear()
+        connection_pools._async_connection_pools.clear()
+
+    def test_get_conninfo(self):
+        conninfo = connection_pools.get_conninfo("default")
+
+        self.assertIn("dbname=langkit", conninfo)
+        self.assertIn("password='p@ss word'", conninfo)
+        self.assertIn("port=5432", conninfo)
+
+    @override_settings(
+        BASEAPP_AI_LANGKIT_CHECKPOINTER_POOL_MIN_SIZE=2,
+        BASEAPP_AI_LANGKIT_CHECKPOINTER_POOL_MAX_SIZE=5,
+    )
+    @patch("baseapp_ai_langkit.chats.connection_pools.ConnectionPool")
+    def test_get_connection_pool_is_reused(self, mock_pool_class):
+        pool = connection_pools.get_connection_pool("default")
+
+        self.assertIs(connection_pools.get_connection_pool("default"), pool)
+        mock_pool_class.assert_called_once()
+        kwargs = mock_pool_class.call_args.kwargs
+        self.assertEqual(kwargs["min_size"], 2)
+        self.assertEqual(kwargs["max_size"], 5)
+        self.assertEqual(kwargs["check"], mock_pool_class.check_connection)
+        self.assertTrue(kwargs["kwargs"]["autocommit"])
+        pool.open.assert_called_once()
+
+    @patch("baseapp_ai_langkit.chats.connection_pools.ConnectionPool")
+    def test_close_connection_pools(self, mock_pool_class):
+        pool = connection_pools.get_connection_pool("default")
+
+        connection_pools.close_connection_pools()
+
+        pool.close.assert_called_once()
+        self.assertEqual(connection_pools._connection_pools, {})
+
+    @patch("baseapp_ai_langkit.chats.connection_pools.AsyncConnectionPool")
+    def test_aget_async_connection_pool_is_reused_within_the_loop(self, mock_pool_class):
+        mock_pool_class.side_effect = lambda **kwargs: MagicMock(
+            open=AsyncMock(), close=AsyncMock()
+        )
+
+        async def get_pools():
+            first = await connection_pools.aget_async_connection_pool("default")
+            second = await connection_pools.aget_async_connection_pool("default")
+            await connection_pools.aclose_async_connection_pools()
+            return first, second
+
+        first, second = asyncio.run(get_pools())
+
+        self.assertIs(first, second)
+        first.open.assert_awaited_once()
+        first.close.assert_awaited_once()
+        self.assertEqual(dict(connection_pools._async_connection_pools), {})
+
+    @patch("baseapp_ai_langkit.chats.connection_pools.AsyncConnectionPool")
+    def test_async_connection_pools_are_closed_when_their_loop_shuts_down(self, mock_pool_class):
+        mock_pool_class.side_effect = lambda **kwargs: MagicMock(
+            open=AsyncMock(), close=AsyncMock()
+        )
+
+        first = asyncio.run(connection_pools.aget_async_connection_pool("default"))
+        first.close.assert_awaited_once()
+        second = asyncio.run(connection_pools.aget_async_connection_pool("default"))
+
+        self.assertIsNot(first, second)
+        second.close.assert_awaited_once()
+        self.assertEqual(dict(connection_pools._async_connection_pools), {})
+
+    @patch("baseapp_ai_langkit.chats.connection_pools.AsyncConnectionPool")
+    def test_pools_of_closed_loops_are_discarded(self, mock_pool_class):
+        mock_pool_class.side_effect = lambda **kwargs: MagicMock(
+            open=AsyncMock(), close=AsyncMock()
+        )
+        loop = asyncio.new_event_loop()
+        stale_pool = loop.run_until_complete(connection_pools.aget_async_connection_pool("default"))
+        # Closed without shutting down its async generators.
+        loop.close()
+
+        pool = asyncio.run(connection_pools.aget_async_connection_pool("default"))
+
+        self.assertIsNot(pool, stale_pool)
+        stale_pool.close.assert_not_called()
+        self.assertNotIn(loop, connection_pools._async_connection_pools)
+
+    @patch("baseapp_ai_langkit.chats.checkpointer.CompatiblePostgresSaver")
+    @patch("baseapp_ai_langkit.chats.checkpointer.get_connection_pool")
+    def test_checkpointer_uses_connection_pool(self, mock_get_connection_pool, mock_saver_class):
+        checkpointer = LangGraphCheckpointer()
+        checkpointer.setup()
+
+        mock_get_connection_pool.assert_called_once_with("default")
+        mock_saver_class.assert_called_once_with(mock_get_connection_pool.return_value, serde=ANY)
+        self.assertIsInstance(
+            mock_saver_class.call_args.kwargs["serde"], CompressedJsonPlusSerializer
+        )
+        self.assertIs(checkpointer.get_checkpointer(), mock_saver_class.return_value)
@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from rest_framework import status
 from rest_framework.reverse import reverse
 from rest_framework.test import APITestCase
@@ -9,6 +10,7 @@ from baseapp_ai_langkit.tests.factories import UserFactory
 class TestChatIdentityViewSet(APITestCase):
     def setUp(self):
         self.url = reverse("v1:llm-chat-identity-list")
+        cache.clear()
 
         self.user = UserFactory()
         self.client.force_authenticate(user=self.user)
@@ -26,3 +28,33 @@ class TestChatIdentityViewSet(APITestCase):
         response = self.client.get(self.url)
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_active_chat_is_cached(self):
+        active_chat = ChatIdentityFactory(is_active=True)
+        self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.data["id"], active_chat.id)
+
+    def test_cache_is_invalidated_on_save(self):
+        active_chat = ChatIdentityFactory(is_active=True, name="Old name")
+        self.client.get(self.url)
+
+        active_chat.name = "New name"
+        active_chat.save()
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data["name"], "New name")
+
+    def test_conditional_get(self):
+        ChatIdentityFactory(is_active=True)
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+        self.assertIn("Last-Modified", response)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
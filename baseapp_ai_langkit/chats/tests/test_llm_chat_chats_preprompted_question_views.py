@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from rest_framework import status
 from rest_framework.reverse import reverse
 from rest_framework.test import APITestCase
@@ -9,6 +10,7 @@ from baseapp_ai_langkit.tests.factories import UserFactory
 class TestChatPrePromptedQuestionViewSet(APITestCase):
     def setUp(self):
         self.url = reverse("v1:llm-chat-pre-prompted-question-list")
+        cache.clear()
 
         self.user = UserFactory()
         self.client.force_authenticate(user=self.user)
@@ -28,3 +30,16 @@ class TestChatPrePromptedQuestionViewSet(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data, [])
+
+    def test_cache_is_invalidated_on_delete(self):
+        question = ChatPrePromptedQuestionFactory(is_active=True)
+        ChatPrePromptedQuestionFactory(is_active=True)
+        first_response = self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+        question.delete()
+        response = self.client.get(self.url)
+
+        self.assertEqual(len(response.data), 1)
+        self.assertNotEqual(response["ETag"], first_response["ETag"])
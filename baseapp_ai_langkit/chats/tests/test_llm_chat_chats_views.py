@@ -1,12 +1,19 @@
+import json
 import uuid
 from unittest.mock import patch
 
-from rest_framework import status
+from django.db.models.signals import post_save
+from rest_framework import serializers, status
 from rest_framework.reverse import reverse
 from rest_framework.test import APITestCase
 
-from baseapp_ai_langkit.base.interfaces.exceptions import LLMChatInterfaceException
+from baseapp_ai_langkit.base.interfaces.exceptions import (
+    ChatSessionBusyException,
+    LLMChatInterfaceException,
+)
 from baseapp_ai_langkit.chats.models import ChatMessage
+from baseapp_ai_langkit.chats.rest_framework.serializers import ChatMessageSerializer
+from baseapp_ai_langkit.chats.rest_framework.views import BaseChatViewSet
 from baseapp_ai_langkit.chats.tests.factories import (
     ChatMessageFactory,
     ChatSessionFactory,
@@ -14,6 +21,17 @@ from baseapp_ai_langkit.chats.tests.factories import (
 from baseapp_ai_langkit.tests.factories import UserFactory
 
 
+class RejectingChatMessageSerializer(ChatMessageSerializer):
+    def validate_content(self, value):
+        if value == "Forbidden":
+            raise serializers.ValidationError("Forbidden content.")
+        return value
+
+
+def get_rejecting_message_serializer(self, *args, **kwargs):
+    return RejectingChatMessageSerializer(*args, **kwargs)
+
+
 class TestBaseChatViewSet(APITestCase):
     def setUp(self):
         self.url = reverse("v1:llm-chat-list")
@@ -62,6 +80,27 @@ class TestBaseChatViewSet(APITestCase):
         self.assertEqual(len(response.data["results"]), 0)
         self.assertIsNotNone(tmp_user.chat_sessions.first())
 
+    def test_list_messages_with_cursor_pagination(self):
+        messages = [
+            ChatMessageFactory(session=self.session, content=f"Message {i}") for i in range(5)
+        ]
+        ChatMessageFactory(content="Another session")
+
+        response = self.client.get(
+            self.url,
+            {"session_id": str(self.session.id), "pagination": "cursor", "page_size": 2},
+        )
+        contents = []
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            contents += [message["content"] for message in response.data["results"]]
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+
+        self.assertEqual(contents, [message.content for message in reversed(messages)])
+
     @patch("baseapp_ai_langkit.chats.rest_framework.views.BaseChatViewSet.chat_runner.safe_run")
     def test_create_message(self, mock_chat_runner):
         mock_chat_runner.return_value = "Hello from LLM!"
@@ -181,3 +220,180 @@ class TestBaseChatViewSet(APITestCase):
         self.assertEqual(response.data["code"], "chat_runner_error")
 
         self.assertEqual(ChatMessage.objects.filter(session=self.session).count(), 0)
+
+    @patch("baseapp_ai_langkit.chats.rest_framework.views.BaseChatViewSet.chat_runner.safe_run")
+    def test_chat_session_busy(self, mock_chat_runner):
+        mock_chat_runner.side_effect = ChatSessionBusyException("Chat session is busy.")
+
+        response = self.client.post(
+            self.url, {"content": "Hello!", "session_id": str(self.session.id)}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["code"], "chat_session_busy")
+        self.assertEqual(ChatMessage.objects.filter(session=self.session).count(), 0)
+
+    @patch("baseapp_ai_langkit.chats.rest_framework.views.BaseChatViewSet.chat_runner.safe_run")
+    def test_create_message_saves_messages_in_a_single_query(self, mock_chat_runner):
+        mock_chat_runner.return_value = "Hello from LLM!"
+
+        with patch(
+            "baseapp_ai_langkit.chats.models.ChatMessage.objects.bulk_create",
+            wraps=ChatMessage.objects.bulk_create,
+        ) as mock_bulk_create:
+            response = self.client.post(
+                self.url, {"content": "Hello!", "session_id": str(self.session.id)}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        mock_bulk_create.assert_called_once()
+        messages = list(ChatMessage.objects.filter(session=self.session).order_by("created"))
+        self.assertEqual([message.role for message in messages], ["user", "assistant"])
+        self.assertEqual(response.data["user_message"]["id"], messages[0].id)
+        self.assertEqual(response.data["assistant_message"]["id"], messages[1].id)
+
+    @patch("baseapp_ai_langkit.chats.rest_framework.views.BaseChatViewSet.chat_runner.safe_run")
+    @patch.object(BaseChatViewSet, "get_message_serializer", get_rejecting_message_serializer)
+    def test_create_validates_messages_with_the_message_serializer(self, mock_chat_runner):
+        mock_chat_runner.return_value = "Forbidden"
+
+        response = self.client.post(
+            self.url, {"content": "Hello!", "session_id": str(self.session.id)}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["content"], ["Forbidden content."])
+        self.assertEqual(ChatMessage.objects.filter(session=self.session).count(), 0)
+
+    @patch("baseapp_ai_langkit.chats.rest_framework.views.BaseChatViewSet.chat_runner.safe_run")
+    @patch.object(BaseChatViewSet, "send_message_signals", True)
+    def test_send_message_signals(self, mock_chat_runner):
+        mock_chat_runner.return_value = "Hello from LLM!"
+        saved_messages = []
+
+        def receiver(sender, instance, created, **kwargs):
+            saved_messages.append((instance.role, created))
+
+        post_save.connect(receiver, sender=ChatMessage)
+        self.addCleanup(post_save.disconnect, receiver, sender=ChatMessage)
+
+        response = self.client.post(
+            self.url, {"content": "Hello!", "session_id": str(self.session.id)}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(saved_messages, [("user", True), ("assistant", True)])
+
+    @patch("baseapp_ai_langkit.chats.rest_framework.views.BaseChatViewSet.chat_runner.safe_run")
+    @patch(
+        "baseapp_ai_langkit.chats.rest_framework.views.BaseChatViewSet"
+        ".persist_user_message_before_run",
+        True,
+    )
+    def test_persist_user_message_before_run(self, mock_chat_runner):
+        mock_chat_runner.side_effect = LLMChatInterfaceException("Something went wrong!")
+
+        response = self.client.post(
+            self.url, {"content": "Hello!", "session_id": str(self.session.id)}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        messages = ChatMessage.objects.filter(session=self.session)
+        self.assertEqual([message.content for message in messages], ["Hello!"])
+
+        mock_chat_runner.side_effect = None
+        mock_chat_runner.return_value = "Hello from LLM!"
+        response = self.client.post(
+            self.url, {"content": "Hello again!", "session_id": str(self.session.id)}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(ChatMessage.objects.filter(session=self.session).count(), 3)
+        self.assertEqual(response.data["user_message"]["content"], "Hello again!")
+
+
+class TestBaseChatViewSetStream(APITestCase):
+    def setUp(self):
+        self.url = reverse("v1:llm-chat-stream")
+
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+        self.session = ChatSessionFactory(user=self.user)
+
+    def get_events(self, response):
+        content = b"".join(response.streaming_content).decode()
+        events = []
+        for block in content.strip().split("\n\n"):
+            event, data = block.split("\n")
+            events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+        return events
+
+    @patch("baseapp_ai_langkit.chats.rest_framework.views.BaseChatViewSet.chat_runner.safe_stream")
+    def test_stream_message(self, mock_safe_stream):
+        mock_safe_stream.return_value = iter(["Hello ", "from ", "LLM!"])
+
+        response = self.client.post(
+            self.url,
+            {"session_id": str(self.session.id), "content": "Hello!"},
+            HTTP_ACCEPT="text/event-stream",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        events = self.get_events(response)
+        self.assertEqual(
+            [data["content"] for event, data in events if event == "token"],
+            ["Hello ", "from ", "LLM!"],
+        )
+        event, data = events[-1]
+        self.assertEqual(event, "done")
+        self.assertEqual(data["user_message"]["content"], "Hello!")
+        self.assertEqual(data["assistant_message"]["content"], "Hello from LLM!")
+        self.assertEqual(
+            list(
+                ChatMessage.objects.filter(session=self.session)
+                .order_by("created")
+                .values_list("role", "content")
+            ),
+            [("user", "Hello!"), ("assistant", "Hello from LLM!")],
+        )
+
+    @patch("baseapp_ai_langkit.chats.rest_framework.views.BaseChatViewSet.chat_runner.safe_stream")
+    def test_stream_runner_exception(self, mock_safe_stream):
+        def safe_stream():
+            yield "Hello"
+            raise LLMChatInterfaceException("Something went wrong!")
+
+        mock_safe_stream.return_value = safe_stream()
+
+        response = self.client.post(
+            self.url, {"session_id": str(self.session.id), "content": "Hello!"}
+        )
+
+        events = self.get_events(response)
+        self.assertEqual(events[-1][0], "error")
+        self.assertEqual(events[-1][1]["code"], "chat_runner_error")
+        self.assertEqual(ChatMessage.objects.filter(session=self.session).count(), 0)
+
+    @patch("baseapp_ai_langkit.chats.rest_framework.views.BaseChatViewSet.chat_runner.safe_stream")
+    @patch.object(BaseChatViewSet, "get_message_serializer", get_rejecting_message_serializer)
+    def test_stream_invalid_message(self, mock_safe_stream):
+        mock_safe_stream.return_value = iter(["Forbidden"])
+
+        response = self.client.post(
+            self.url, {"session_id": str(self.session.id), "content": "Hello!"}
+        )
+
+        events = self.get_events(response)
+        self.assertEqual(events[-1][0], "error")
+        self.assertEqual(events[-1][1]["code"], "invalid_message")
+        self.assertEqual(events[-1][1]["error"], {"content": ["Forbidden content."]})
+        self.assertEqual(ChatMessage.objects.filter(session=self.session).count(), 0)
+
+    def test_stream_missing_content(self):
+        response = self.client.post(
+            self.url, {"session_id": str(self.session.id)}, HTTP_ACCEPT="text/event-stream"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(response.content.startswith(b"event: error\n"))
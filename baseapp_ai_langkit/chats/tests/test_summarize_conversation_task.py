@@ -0,0 +1,76 @@
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase, override_settings
+
+from baseapp_ai_langkit.chats.runners.default_chat_runner import DefaultChatRunner
+from baseapp_ai_langkit.chats.tasks import summarize_conversation
+from baseapp_ai_langkit.chats.tests.factories import ChatSessionFactory
+
+RUNNER_PATH = "baseapp_ai_langkit.chats.runners.default_chat_runner.DefaultChatRunner"
+
+
+def mock_thread_lock(acquired: bool):
+    @contextmanager
+    def try_thread_lock(thread_id, scope, timeout=0):
+        yield acquired
+
+    return patch("baseapp_ai_langkit.chats.tasks.try_thread_lock", try_thread_lock)
+
+
+class TestSummarizeConversationTask(TestCase):
+    def setUp(self):
+        self.session = ChatSessionFactory()
+
+    @patch.object(DefaultChatRunner, "summarize", return_value=True)
+    def test_summarize_conversation(self, mock_summarize):
+        with mock_thread_lock(True):
+            self.assertTrue(summarize_conversation(RUNNER_PATH, str(self.session.id)))
+
+        mock_summarize.assert_called_once()
+
+    @patch.object(DefaultChatRunner, "summarize")
+    def test_skipped_when_already_being_summarized(self, mock_summarize):
+        with mock_thread_lock(False):
+            self.assertFalse(summarize_conversation(RUNNER_PATH, str(self.session.id)))
+
+        mock_summarize.assert_not_called()
+
+    @override_settings(BASEAPP_AI_LANGKIT_CHATS_TURN_LOCK_TIMEOUT=5)
+    @patch("baseapp_ai_langkit.chats.runners.default_chat_runner.try_thread_lock")
+    def test_runner_locks_the_turns_while_saving_the_summary(self, mock_try_thread_lock):
+        runner = DefaultChatRunner(session=self.session, user_input="")
+        workflow = MagicMock()
+        workflow.summarize_thread.return_value = {"summary": "Summary"}
+
+        with patch.object(DefaultChatRunner, "get_workflow", return_value=workflow), patch.object(
+            DefaultChatRunner, "create_checkpointer"
+        ):
+            self.assertTrue(runner.summarize())
+
+        update_lock = workflow.summarize_thread.call_args.kwargs["update_lock"]
+        self.assertIs(update_lock(), mock_try_thread_lock.return_value)
+        mock_try_thread_lock.assert_called_once_with(str(self.session.id), "turn", timeout=5)
+
+    @patch("baseapp_ai_langkit.chats.runners.default_chat_runner.summarize_conversation")
+    def test_runner_schedules_the_summarization(self, mock_task):
+        runner = DefaultChatRunner(session=self.session, user_input="Hello")
+        workflow = MagicMock(background_summarization=True)
+
+        workflow.should_summarize.return_value = False
+        runner.maybe_schedule_summarization(workflow, {"messages": []})
+        mock_task.delay.assert_not_called()
+
+        workflow.should_summarize.return_value = True
+        runner.maybe_schedule_summarization(workflow, {"messages": []})
+        mock_task.delay.assert_called_once_with(RUNNER_PATH, str(self.session.id))
+
+    @override_settings(BASEAPP_AI_LANGKIT_CHATS_SUMMARIZATION_MAX_TOKENS=2000)
+    @patch("baseapp_ai_langkit.chats.runners.default_chat_runner.GeneralChatWorkflow")
+    def test_runner_uses_the_token_budget(self, mock_workflow_class):
+        runner = DefaultChatRunner(session=self.session, user_input="Hello")
+        runner.llm, runner.checkpointer, runner.nodes = MagicMock(), MagicMock(), {}
+
+        runner.get_workflow()
+
+        self.assertEqual(mock_workflow_class.call_args.kwargs["max_tokens"], 2000)
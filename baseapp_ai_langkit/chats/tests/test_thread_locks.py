@@ -0,0 +1,153 @@
+import threading
+import time
+from unittest import skipIf, skipUnless
+from unittest.mock import patch
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test import TestCase, override_settings
+
+from baseapp_ai_langkit.base.interfaces.base_runner import BaseChatInterface
+from baseapp_ai_langkit.base.interfaces.exceptions import ChatSessionBusyException
+from baseapp_ai_langkit.chats.models import ChatSession
+from baseapp_ai_langkit.chats.tests.factories import ChatSessionFactory
+from baseapp_ai_langkit.chats.thread_locks import (
+    SHOW_LOCK_TIMEOUT_SQL,
+    TRY_LOCK_SQL,
+    UNLOCK_SQL,
+    acquire_thread_lock,
+    get_thread_lock_key,
+    release_thread_lock,
+    try_thread_lock,
+)
+
+
+class DummyChatRunner(BaseChatInterface):
+    def run(self):
+        return "Hello!"
+
+
+@patch("baseapp_ai_langkit.base.interfaces.base_runner.release_thread_lock")
+@patch("baseapp_ai_langkit.base.interfaces.base_runner.acquire_thread_lock")
+class TestChatSessionLock(TestCase):
+    def setUp(self):
+        self.session = ChatSessionFactory()
+        self.runner = DummyChatRunner(session=self.session, user_input="Hi")
+
+    @override_settings(BASEAPP_AI_LANGKIT_CHATS_TURN_LOCK_TIMEOUT=5)
+    def test_turns_are_queued(self, mock_acquire, mock_release):
+        mock_acquire.return_value = True
+
+        self.assertEqual(self.runner.safe_run(), "Hello!")
+
+        mock_acquire.assert_called_once_with(str(self.session.id), "turn", timeout=5)
+        mock_release.assert_called_once_with(str(self.session.id), "turn")
+
+    @override_settings(BASEAPP_AI_LANGKIT_CHATS_CONCURRENT_TURNS="reject")
+    def test_busy_session_is_rejected(self, mock_acquire, mock_release):
+        mock_acquire.return_value = False
+
+        with self.assertRaises(ChatSessionBusyException):
+            self.runner.safe_run()
+
+        mock_acquire.assert_called_once_with(str(self.session.id), "turn", timeout=0)
+        mock_release.assert_not_called()
+
+    @override_settings(BASEAPP_AI_LANGKIT_CHATS_CONCURRENT_TURNS="allow")
+    def test_concurrent_turns_allowed(self, mock_acquire, mock_release):
+        self.assertEqual(list(self.runner.safe_stream()), ["Hello!"])
+
+        mock_acquire.assert_not_called()
+        mock_release.assert_not_called()
+
+    def test_lock_is_released_on_errors(self, mock_acquire, mock_release):
+        mock_acquire.return_value = True
+
+        with patch.object(DummyChatRunner, "run", side_effect=ValueError):
+            with self.assertRaises(Exception):
+                self.runner.safe_run()
+
+        mock_release.assert_called_once()
+
+
+class TestThreadLocks(TestCase):
+    @skipIf(connection.vendor == "postgresql", "Postgres locks.")
+    def test_other_databases_do_not_lock(self):
+        with try_thread_lock("1", "turn") as acquired:
+            self.assertTrue(acquired)
+
+
+@skipUnless(connection.vendor == "postgresql", "The locks require PostgreSQL.")
+class TestThreadLocksOnPostgres(TestCase):
+    def setUp(self):
+        self.session = ChatSessionFactory()
+        self.runner = DummyChatRunner(session=self.session, user_input="Hi")
+        self.lock_key = get_thread_lock_key(str(self.session.id), "turn")
+        # Another process' connection.
+        self.other_connection = connections.create_connection(DEFAULT_DB_ALIAS)
+        self.addCleanup(self.other_connection.close)
+
+    def lock_from_other_connection(self):
+        with self.other_connection.cursor() as cursor:
+            cursor.execute(TRY_LOCK_SQL, [self.lock_key])
+            self.assertTrue(cursor.fetchone()[0])
+
+    def unlock_from_other_connection(self):
+        with self.other_connection.cursor() as cursor:
+            cursor.execute(UNLOCK_SQL, [self.lock_key])
+            return cursor.fetchone()[0]
+
+    @override_settings(BASEAPP_AI_LANGKIT_CHATS_CONCURRENT_TURNS="reject")
+    def test_busy_session_is_rejected(self):
+        self.lock_from_other_connection()
+
+        with self.assertRaises(ChatSessionBusyException):
+            self.runner.safe_run()
+
+    @override_settings(BASEAPP_AI_LANGKIT_CHATS_TURN_LOCK_TIMEOUT=1)
+    def test_queued_turn_times_out(self):
+        self.lock_from_other_connection()
+        start = time.monotonic()
+
+        with self.assertRaises(ChatSessionBusyException):
+            list(self.runner.safe_stream())
+
+        self.assertGreaterEqual(time.monotonic() - start, 1)
+
+    def test_turn_runs_once_the_lock_is_released(self):
+        self.lock_from_other_connection()
+        self.assertTrue(self.unlock_from_other_connection())
+
+        self.assertEqual(self.runner.safe_run(), "Hello!")
+
+        # The turn released its lock.
+        self.lock_from_other_connection()
+        self.assertTrue(self.unlock_from_other_connection())
+
+    def test_lock_timeout_keeps_the_transaction_usable(self):
+        self.lock_from_other_connection()
+
+        # The test runs in a transaction, like a request with ATOMIC_REQUESTS.
+        self.assertFalse(acquire_thread_lock(str(self.session.id), "turn", timeout=0.2))
+
+        self.assertTrue(ChatSession.objects.filter(pk=self.session.pk).exists())
+        with connection.cursor() as cursor:
+            cursor.execute(SHOW_LOCK_TIMEOUT_SQL)
+            self.assertEqual(cursor.fetchone()[0], "0")
+
+    def test_waiting_lock_is_acquired_when_released(self):
+        self.lock_from_other_connection()
+        self.other_connection.inc_thread_sharing()
+        self.addCleanup(self.other_connection.dec_thread_sharing)
+        timer = threading.Timer(0.3, self.unlock_from_other_connection)
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+        self.assertTrue(acquire_thread_lock(str(self.session.id), "turn", timeout=5))
+        release_thread_lock(str(self.session.id), "turn")
+
+    def test_try_thread_lock(self):
+        self.lock_from_other_connection()
+        with try_thread_lock(str(self.session.id), "turn") as acquired:
+            self.assertFalse(acquired)
+        with try_thread_lock(str(self.session.id), "summarization") as acquired:
+            self.assertTrue(acquired)
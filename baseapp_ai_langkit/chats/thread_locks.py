@@ -0,0 +1,105 @@
+"""
+Postgres advisory locks on the chat threads, serializing the work done on a thread (e.g. its
+turns or its background summarization) across processes and hosts.
+
+The locks are session level locks of the Django database connection of the current thread, so
+they're released at the latest when the connection is closed, except the ones taken with
+`acquire_transaction_lock`, released when the current transaction ends. Other databases than
+Postgres (e.g. SQLite in tests) don't lock.
+
+Session level locks require the connection to stay the same Postgres session between the lock
+and the unlock, so they don't work behind a pooler in transaction pooling mode (e.g. PgBouncer's
+`pool_mode = transaction`): connect the Django database to Postgres directly, or through session
+pooling.
+"""
+
+import contextlib
+from typing import Iterator
+
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+
+LOCK_SQL = "SELECT pg_advisory_lock(hashtextextended(%s, 0))"
+TRY_LOCK_SQL = "SELECT pg_try_advisory_lock(hashtextextended(%s, 0))"
+UNLOCK_SQL = "SELECT pg_advisory_unlock(hashtextextended(%s, 0))"
+TRANSACTION_LOCK_SQL = "SELECT pg_advisory_xact_lock(hashtextextended(%s, 0))"
+SHOW_LOCK_TIMEOUT_SQL = "SHOW lock_timeout"
+SET_LOCK_TIMEOUT_SQL = "SELECT set_config('lock_timeout', %s, false)"
+
+# SQLSTATE of the error raised when the lock timeout expires.
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+def get_thread_lock_key(thread_id: str, scope: str) -> str:
+    return f"baseapp_ai_langkit:{scope}:{thread_id}"
+
+
+def acquire_thread_lock(
+    thread_id: str, scope: str, timeout: float = 0, db_alias: str = DEFAULT_DB_ALIAS
+) -> bool:
+    """
+    Lock the thread for the given scope, waiting up to `timeout` seconds for it to be released
+    if it's locked. Returns whether the lock was acquired.
+
+    Postgres queues the waiting sessions and wakes them up when the lock is released, bounded by
+    its `lock_timeout`, which is restored once the lock is acquired or the timeout expires.
+    """
+    connection = connections[db_alias]
+    if connection.vendor != "postgresql":
+        return True
+
+    key = get_thread_lock_key(thread_id, scope)
+    with connection.cursor() as cursor:
+        if timeout <= 0:
+            cursor.execute(TRY_LOCK_SQL, [key])
+            return cursor.fetchone()[0]
+
+        cursor.execute(SHOW_LOCK_TIMEOUT_SQL)
+        previous_lock_timeout = cursor.fetchone()[0]
+        try:
+            # In a savepoint, so the timeout error doesn't break the current transaction.
+            with transaction.atomic(using=db_alias):
+                cursor.execute(SET_LOCK_TIMEOUT_SQL, [f"{max(int(timeout * 1000), 1)}ms"])
+                cursor.execute(LOCK_SQL, [key])
+            return True
+        except OperationalError as e:
+            if getattr(e.__cause__, "sqlstate", None) != LOCK_NOT_AVAILABLE:
+                raise
+            return False
+        finally:
+            cursor.execute(SET_LOCK_TIMEOUT_SQL, [previous_lock_timeout])
+
+
+def release_thread_lock(thread_id: str, scope: str, db_alias: str = DEFAULT_DB_ALIAS):
+    connection = connections[db_alias]
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(UNLOCK_SQL, [get_thread_lock_key(thread_id, scope)])
+
+
+def acquire_transaction_lock(thread_id: str, scope: str, db_alias: str = DEFAULT_DB_ALIAS):
+    """
+    Lock the thread for the given scope until the current transaction ends, waiting for it to be
+    released if it's locked. Must be called in a transaction.
+    """
+    connection = connections[db_alias]
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(TRANSACTION_LOCK_SQL, [get_thread_lock_key(thread_id, scope)])
+
+
+@contextlib.contextmanager
+def try_thread_lock(
+    thread_id: str, scope: str, timeout: float = 0, db_alias: str = DEFAULT_DB_ALIAS
+) -> Iterator[bool]:
+    """
+    Try to lock the thread for the given scope (see `acquire_thread_lock`) while the block runs,
+    yielding whether the lock was acquired.
+    """
+    acquired = acquire_thread_lock(thread_id, scope, timeout=timeout, db_alias=db_alias)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            release_thread_lock(thread_id, scope, db_alias=db_alias)
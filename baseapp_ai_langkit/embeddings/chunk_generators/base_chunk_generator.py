@@ -1,6 +1,11 @@
 import typing
 from abc import ABC, abstractmethod
 
+from baseapp_ai_langkit.base.utils.distance_metrics import (
+    normalize_vectors,
+    requires_normalized_vectors,
+)
+from baseapp_ai_langkit.embeddings.conf import app_settings
 from baseapp_ai_langkit.embeddings.models import EmbeddableModelMixin, GenericChunk
 
 
@@ -24,3 +29,15 @@ class BaseChunkGenerator(ABC):
             List[GenericChunk]: A list of GenericChunks.
         """
         pass
+
+    def embed_documents(
+        self, embeddings_model, texts: typing.List[str]
+    ) -> typing.List[typing.List[float]]:
+        """
+        Embed the given texts. The vectors are L2-normalized when the configured distance metric
+        requires it (`BASEAPP_AI_LANGKIT_EMBEDDINGS_DISTANCE_METRIC`).
+        """
+        embeddings = embeddings_model.embed_documents(texts)
+        if requires_normalized_vectors(app_settings.DISTANCE_METRIC):
+            embeddings = normalize_vectors(embeddings)
+        return embeddings
@@ -65,7 +65,7 @@ class DefaultChunkGenerator(BaseChunkGenerator):
 
                 text_chunks = [text_chunk for text_chunk in text_chunks if len(text_chunk) > 0]
                 text_chunk_embedding_pairs = zip(
-                    text_chunks, embeddings_model.embed_documents(text_chunks)
+                    text_chunks, self.embed_documents(embeddings_model, text_chunks)
                 )
 
                 with transaction.atomic():
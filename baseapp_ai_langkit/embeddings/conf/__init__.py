@@ -11,6 +11,7 @@ class AppSettings:
     CHUNK_SIZE: int
     CHUNK_OVERLAP: int
     SKIP_EMBEDDING_GENERATION: bool
+    DISTANCE_METRIC: str
 
     def __init__(self, prefix):
         self.prefix = prefix
@@ -22,6 +23,9 @@ class AppSettings:
         self.SKIP_EMBEDDING_GENERATION = self._get_setting(
             name="SKIP_EMBEDDING_GENERATION", expected_type=bool, default=False
         )
+        self.DISTANCE_METRIC = self._get_setting(
+            name="DISTANCE_METRIC", expected_type=str, default="cosine"
+        )
 
     def _get_setting(self, name: str, expected_type: T, default: typing.Any = None) -> T:
         path = "_".join([self.prefix, name])
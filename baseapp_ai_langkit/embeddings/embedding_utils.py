@@ -1,11 +1,19 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Callable, Mapping, Optional, Sequence
+from typing import Any, Callable, Mapping, Optional, Sequence, Union
 
 from django.db.models import QuerySet
-from pgvector.django import CosineDistance
 
+from baseapp_ai_langkit.base.utils.distance_metrics import (
+    DISTANCE_EXPRESSIONS,
+    DistanceMetric,
+    get_distance_expression,
+    normalize_vectors,
+    requires_normalized_vectors,
+    to_cosine_distance_threshold,
+)
+from baseapp_ai_langkit.embeddings.conf import app_settings
 from baseapp_ai_langkit.embeddings.embedding_models import openai_embeddings
 from baseapp_ai_langkit.embeddings.models import GenericChunk
 
@@ -17,8 +25,8 @@ def find_similar_chunks(
     embedding_model: Optional[object] = None,
     queryset: Optional[QuerySet] = None,
     embedding_field: str = "embedding",
-    distance_metric: Optional[Callable[[str, Sequence[float]], Any]] = None,
-    distance_filter: float = 0.5,
+    distance_metric: Optional[Union[str, Callable[[str, Sequence[float]], Any]]] = None,
+    distance_filter: Optional[float] = 0.5,
     filter_kwargs: Optional[Mapping[str, Any]] = None,
     order_by: str = "distance",
     top_k: Optional[int] = None,
@@ -31,8 +39,14 @@ def find_similar_chunks(
         embedding_model: Embedding model instance or zero-arg factory. Defaults to openai_embeddings().
         queryset: Django queryset/manager to search. Defaults to GenericChunk.objects.all().
         embedding_field: Name of the vector field. Defaults to "embedding".
-        distance_metric: Distance function. Defaults to CosineDistance.
-        distance_filter: Max distance (smaller = more similar). Must be > 0. Defaults to 0.5.
+        distance_metric: A DistanceMetric value ("cosine", "inner_product", "l2") or a distance
+            function. Defaults to the BASEAPP_AI_LANGKIT_EMBEDDINGS_DISTANCE_METRIC setting.
+            With "inner_product" the query vector is L2-normalized and the stored vectors must
+            be normalized too (see BaseChunkGenerator.embed_documents).
+        distance_filter: Max distance (smaller = more similar). Must be > 0, or None to rank
+            all the chunks without a threshold. Defaults to 0.5.
+            With "inner_product" it is given as a cosine distance and translated to the
+            negative inner product scale used by the annotated "distance".
         filter_kwargs: Extra filters for the queryset.
         order_by: Field to order by. Defaults to "distance".
         top_k: Limit results; if None returns all. Must be > 0 when provided.
@@ -54,18 +68,7 @@ def find_similar_chunks(
     if not hasattr(model, "embed_query"):
         raise TypeError("embedding_model must have an 'embed_query(text: str) -> vector' method")
 
-    if queryset is None:
-        queryset = GenericChunk.objects.all()
-    else:
-        queryset = queryset.all()  # normalize managers/querysets
-
-    if distance_metric is None:
-        distance_metric = CosineDistance
-
-    if distance_filter <= 0:
-        raise ValueError("distance_filter must be greater than 0")
-    if top_k is not None and top_k <= 0:
-        raise ValueError("top_k must be greater than 0")
+    _validate_search_arguments(distance_filter, top_k)
 
     # Get vector and coerce to plain list[float] for pgvector
     try:
@@ -74,7 +77,66 @@ def find_similar_chunks(
     except Exception as exc:
         raise TypeError("Embedding model returned a non-numeric vector.") from exc
 
-    filters = {"distance__isnull": False, "distance__lt": distance_filter}
+    qs = find_similar_chunks_by_vector(
+        query_vector,
+        queryset=queryset,
+        embedding_field=embedding_field,
+        distance_metric=distance_metric,
+        distance_filter=distance_filter,
+        filter_kwargs=filter_kwargs,
+        order_by=order_by,
+        top_k=top_k,
+    )
+
+    logger.info("similar_chunks qlen=%d top_k=%s dfilt=%s", len(query), top_k, distance_filter)
+    return qs
+
+
+def find_similar_chunks_by_vector(
+    query_vector: Sequence[float],
+    queryset: Optional[QuerySet] = None,
+    embedding_field: str = "embedding",
+    distance_metric: Optional[Union[str, Callable[[str, Sequence[float]], Any]]] = None,
+    distance_filter: Optional[float] = 0.5,
+    filter_kwargs: Optional[Mapping[str, Any]] = None,
+    order_by: str = "distance",
+    top_k: Optional[int] = None,
+) -> QuerySet:
+    """
+    Semantic search over chunks for an already embedded query.
+    See `find_similar_chunks` for the arguments.
+
+    Returns:
+        QuerySet annotated with "distance".
+    """
+    _validate_search_arguments(distance_filter, top_k)
+
+    if queryset is None:
+        queryset = GenericChunk.objects.all()
+    else:
+        queryset = queryset.all()  # normalize managers/querysets
+
+    if distance_metric is None:
+        distance_metric = app_settings.DISTANCE_METRIC
+    if isinstance(distance_metric, str):
+        metric = DistanceMetric(distance_metric)
+        distance_metric = get_distance_expression(metric)
+    else:
+        metric = next(
+            (key for key, value in DISTANCE_EXPRESSIONS.items() if value is distance_metric),
+            None,
+        )
+
+    query_vector = [float(x) for x in query_vector]
+    if metric is not None and requires_normalized_vectors(metric):
+        # Normalized vectors let the inner product rank like cosine without computing norms.
+        query_vector = normalize_vectors([query_vector])[0]
+        if distance_filter is not None:
+            distance_filter = to_cosine_distance_threshold(metric, distance_filter)
+
+    filters = {"distance__isnull": False}
+    if distance_filter is not None:
+        filters["distance__lt"] = distance_filter
     if filter_kwargs:
         filters.update(dict(filter_kwargs))
 
@@ -88,5 +150,11 @@ def find_similar_chunks(
     if top_k is not None:
         qs = qs[:top_k]
 
-    logger.info("similar_chunks qlen=%d top_k=%s dfilt=%.3f", len(query), top_k, distance_filter)
     return qs
+
+
+def _validate_search_arguments(distance_filter: Optional[float], top_k: Optional[int]) -> None:
+    if distance_filter is not None and distance_filter <= 0:
+        raise ValueError("distance_filter must be greater than 0")
+    if top_k is not None and top_k <= 0:
+        raise ValueError("top_k must be greater than 0")
@@ -0,0 +1,201 @@
+"""
+Retrieval quality and latency evaluation.
+
+Measures, for a labeled set of queries (query -> expected objects), the recall@k and MRR of a
+similarity search, how much of the exact (brute-force) top-k the approximate index search
+returns, and the search latency percentiles, under different index search settings
+(`hnsw.ef_search`, `ivfflat.probes`) and `top_k` values.
+
+Only the database search is timed: the queries are embedded once, up front.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+)
+
+import numpy as np
+from django.db import connections, transaction
+
+from baseapp_ai_langkit.embeddings.embedding_utils import find_similar_chunks_by_vector
+
+# A search function receives the query vector and `k`, and returns the ranked results as
+# (result id, object key) tuples. The result id identifies the retrieved row (used to compare
+# with the exact search), the object key identifies the object it belongs to (used to compare
+# with the labels).
+SearchFunction = Callable[[List[float], int], List[Sequence[Hashable]]]
+
+
+def recall_at_k(retrieved: Sequence[Hashable], relevant: Collection[Hashable], k: int) -> float:
+    """
+    Fraction of the relevant items found in the first `k` retrieved items. When there are more
+    relevant items than `k`, it is relative to `k` so a perfect ranking scores 1.
+    """
+    if not relevant:
+        return 0.0
+    found = len(set(retrieved[:k]) & set(relevant))
+    return found / min(len(relevant), k)
+
+
+def reciprocal_rank(retrieved: Sequence[Hashable], relevant: Collection[Hashable]) -> float:
+    for rank, item in enumerate(retrieved, start=1):
+        if item in relevant:
+            return 1 / rank
+    return 0.0
+
+
+def latency_percentiles(latencies_ms: Sequence[float]) -> Dict[str, float]:
+    if not latencies_ms:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+    p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99])
+    return {"p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99)}
+
+
+def unique_in_order(items: Sequence[Hashable]) -> List[Hashable]:
+    return list(dict.fromkeys(items))
+
+
+@contextmanager
+def search_settings(
+    using: str = "default",
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    exact: bool = False,
+) -> Iterator[None]:
+    """
+    Run the enclosed searches in a transaction with the given pgvector search settings. With
+    `exact=True` index scans are disabled, so the search is an exact brute-force scan.
+    Settings are ignored on databases other than PostgreSQL.
+    """
+    with transaction.atomic(using=using):
+        connection = connections[using]
+        if connection.vendor == "postgresql":
+            statements = []
+            if ef_search is not None:
+                statements.append(f"SET LOCAL hnsw.ef_search = {int(ef_search)}")
+            if probes is not None:
+                statements.append(f"SET LOCAL ivfflat.probes = {int(probes)}")
+            if exact:
+                statements.append("SET LOCAL enable_indexscan = off")
+                statements.append("SET LOCAL enable_bitmapscan = off")
+            with connection.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
+        yield
+
+
+def chunks_search_function(
+    queryset=None,
+    distance_metric: Optional[str] = None,
+    distance_filter: Optional[float] = None,
+) -> SearchFunction:
+    """
+    Search `GenericChunk`s with `find_similar_chunks_by_vector`. Objects are identified as
+    "<app_label>.<model>:<object_id>". No distance threshold is applied by default, since its
+    scale depends on the distance metric and the evaluation ranks the top k chunks anyway.
+    """
+
+    def search(vector: List[float], k: int) -> List[Sequence[Hashable]]:
+        chunks = find_similar_chunks_by_vector(
+            vector,
+            queryset=queryset,
+            distance_metric=distance_metric,
+            distance_filter=distance_filter,
+            top_k=k,
+        )
+        return [
+            (chunk_id, f"{app_label}.{model}:{object_id}")
+            for chunk_id, app_label, model, object_id in chunks.values_list(
+                "id", "content_type__app_label", "content_type__model", "object_id"
+            )
+        ]
+
+    return search
+
+
+def vector_store_search_function(vector_store, object_key: Optional[str] = None) -> SearchFunction:
+    """
+    Search a vector store with `similarity_search_by_vector`. Objects are identified by the
+    `object_key` metadata value, or by the document content if not given.
+    """
+
+    def search(vector: List[float], k: int) -> List[Sequence[Hashable]]:
+        results = vector_store.similarity_search_by_vector(vector, k=k)
+        return [
+            (
+                result["content"],
+                (
+                    str((result["metadata"] or {}).get(object_key))
+                    if object_key
+                    else result["content"]
+                ),
+            )
+            for result in results
+        ]
+
+    return search
+
+
+def evaluate(
+    search: SearchFunction,
+    queries: Sequence[Dict[str, Any]],
+    top_k: int,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    repeat: int = 1,
+    using: str = "default",
+) -> Dict[str, float]:
+    """
+    Evaluate the search function over the labeled queries.
+
+    Args:
+        search: The search function to evaluate.
+        queries: Dicts with the query `vector` and the `expected` object keys.
+        top_k: Number of results to retrieve.
+        ef_search: `hnsw.ef_search` to use for the search.
+        probes: `ivfflat.probes` to use for the search.
+        repeat: Times each query is run, to get more stable latencies.
+        using: The database alias.
+
+    Returns:
+        Dict with the mean `recall_at_k`, `mrr` and `exact_recall_at_k` (overlap with the exact
+        brute-force top-k) and the `p50_ms`, `p95_ms` and `p99_ms` search latencies.
+    """
+    recalls, reciprocal_ranks, exact_recalls, latencies_ms = [], [], [], []
+
+    for query in queries:
+        with search_settings(using=using, exact=True):
+            exact_results = search(query["vector"], top_k)
+
+        with search_settings(using=using, ef_search=ef_search, probes=probes):
+            for _ in range(max(repeat, 1)):
+                start = time.perf_counter()
+                results = search(query["vector"], top_k)
+                latencies_ms.append((time.perf_counter() - start) * 1000)
+
+        retrieved_objects = unique_in_order([object_key for _, object_key in results])
+        expected = set(query["expected"])
+        recalls.append(recall_at_k(retrieved_objects, expected, top_k))
+        reciprocal_ranks.append(reciprocal_rank(retrieved_objects, expected))
+        exact_ids = [result_id for result_id, _ in exact_results]
+        exact_recalls.append(
+            recall_at_k([result_id for result_id, _ in results], exact_ids, top_k)
+            if exact_ids
+            else 1.0
+        )
+
+    return {
+        "recall_at_k": float(np.mean(recalls)) if recalls else 0.0,
+        "mrr": float(np.mean(reciprocal_ranks)) if reciprocal_ranks else 0.0,
+        "exact_recall_at_k": float(np.mean(exact_recalls)) if exact_recalls else 0.0,
+        **latency_percentiles(latencies_ms),
+    }
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from baseapp_ai_langkit.base.utils.distance_metrics import (
+    DistanceMetric,
+    get_index_opclass,
+)
+from baseapp_ai_langkit.embeddings.conf import app_settings
+from baseapp_ai_langkit.embeddings.models import GenericChunk
+
+# Created by the migrations, for the cosine distance.
+INDEX_NAME = "baseapp_ai_langkit_genericchunk_embedding_hnsw"
+
+
+def get_embedding_index_name(metric: str) -> str:
+    metric = DistanceMetric(metric)
+    if metric == DistanceMetric.COSINE:
+        return INDEX_NAME
+    return f"{INDEX_NAME}_{metric.value}"
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the HNSW index of the chunk embeddings for a distance metric, without locking "
+        "writes to the table while it's built. The migrations only create the cosine distance "
+        "one, run this after setting BASEAPP_AI_LANGKIT_EMBEDDINGS_DISTANCE_METRIC to another "
+        "metric."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--metric",
+            choices=DistanceMetric.values,
+            help="Distance metric of the index. Defaults to the configured one.",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        metric = options["metric"] or app_settings.DISTANCE_METRIC
+        connection = connections[options["database"]]
+        if connection.vendor != "postgresql":
+            raise CommandError("HNSW indexes require PostgreSQL with pgvector.")
+
+        index_name = get_embedding_index_name(metric)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS {index} ON {table} "
+                "USING hnsw (embedding {opclass})".format(
+                    index=connection.ops.quote_name(index_name),
+                    table=connection.ops.quote_name(GenericChunk._meta.db_table),
+                    opclass=get_index_opclass(metric),
+                )
+            )
+        self.stdout.write(f"Index {index_name} is ready.")
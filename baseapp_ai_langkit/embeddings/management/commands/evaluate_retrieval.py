@@ -0,0 +1,122 @@
+import itertools
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from baseapp_ai_langkit.base.utils.distance_metrics import DistanceMetric
+from baseapp_ai_langkit.embeddings.embedding_models import openai_embeddings
+from baseapp_ai_langkit.embeddings.evaluation import (
+    chunks_search_function,
+    evaluate,
+    vector_store_search_function,
+)
+from baseapp_ai_langkit.vector_stores.models import DefaultVectorStore
+
+
+class Command(BaseCommand):
+    help = (
+        "Evaluate retrieval quality (recall@k, MRR, overlap with the exact search) and latency "
+        "(p50/p95/p99) of the chunks or a vector store over a labeled set of queries, under "
+        "different top_k and index search settings. The dataset is a JSON list of "
+        '{"query": "...", "expected": ["..."]} objects, where expected holds the keys of the '
+        'relevant objects: "<app_label>.<model>:<object_id>" for chunks, the --object-key '
+        "metadata value (or the document content) for vector stores. "
+        "To compare index build parameters (e.g. HNSW m/ef_construction), rebuild the index and "
+        "run the command again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", help="Path to the labeled queries JSON file.")
+        parser.add_argument(
+            "--target", choices=["chunks", "vector_store"], default="chunks", help="What to search."
+        )
+        parser.add_argument("--vector-store", help="Name of the vector store to evaluate.")
+        parser.add_argument(
+            "--object-key",
+            help="Metadata key identifying the object of a vector store document.",
+        )
+        parser.add_argument(
+            "--distance-metric",
+            choices=DistanceMetric.values,
+            help="Distance metric for the chunks search. Defaults to the configured one.",
+        )
+        parser.add_argument("--top-k", nargs="+", type=int, default=[5, 10])
+        parser.add_argument("--ef-search", nargs="+", type=int, default=[None])
+        parser.add_argument("--probes", nargs="+", type=int, default=[None])
+        parser.add_argument(
+            "--repeat", type=int, default=3, help="Times each query is run to measure latency."
+        )
+        parser.add_argument("--database", default="default")
+        parser.add_argument("--json", action="store_true", help="Output the results as JSON.")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["dataset"]) as dataset_file:
+                dataset = json.load(dataset_file)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read the dataset: {e}")
+
+        if options["target"] == "vector_store":
+            if not options["vector_store"]:
+                raise CommandError("--vector-store is required when --target is vector_store.")
+            try:
+                vector_store = DefaultVectorStore.objects.using(options["database"]).get(
+                    name=options["vector_store"]
+                )
+            except DefaultVectorStore.DoesNotExist:
+                raise CommandError(f"Vector store '{options['vector_store']}' not found.")
+            embeddings_model = vector_store.get_embeddings_model()
+            search = vector_store_search_function(vector_store, object_key=options["object_key"])
+        else:
+            embeddings_model = openai_embeddings()
+            search = chunks_search_function(distance_metric=options["distance_metric"])
+
+        # Embed the queries once, so only the search is measured.
+        queries = [
+            {
+                "vector": embeddings_model.embed_query(item["query"]),
+                "expected": [str(expected) for expected in item["expected"]],
+            }
+            for item in dataset
+        ]
+
+        results = []
+        for top_k, ef_search, probes in itertools.product(
+            options["top_k"], options["ef_search"], options["probes"]
+        ):
+            metrics = evaluate(
+                search,
+                queries,
+                top_k=top_k,
+                ef_search=ef_search,
+                probes=probes,
+                repeat=options["repeat"],
+                using=options["database"],
+            )
+            results.append(
+                {
+                    "target": options["target"],
+                    "top_k": top_k,
+                    "ef_search": ef_search,
+                    "probes": probes,
+                    **metrics,
+                }
+            )
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        header = (
+            f"{'top_k':>6} {'ef_search':>9} {'probes':>6} {'recall@k':>9} {'exact@k':>8} "
+            f"{'mrr':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+        )
+        self.stdout.write(self.style.NOTICE(f"{options['target']} ({len(queries)} queries)"))
+        self.stdout.write(header)
+        for result in results:
+            self.stdout.write(
+                f"{result['top_k']:>6} {str(result['ef_search'] or '-'):>9} "
+                f"{str(result['probes'] or '-'):>6} {result['recall_at_k']:>9.3f} "
+                f"{result['exact_recall_at_k']:>8.3f} {result['mrr']:>6.3f} "
+                f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f}"
+            )
@@ -0,0 +1,44 @@
+from django.db import migrations
+
+INDEX_NAME = "baseapp_ai_langkit_genericchunk_embedding_hnsw"
+
+
+def create_embedding_index(apps, schema_editor):
+    """
+    Create the HNSW index of the chunk embeddings for the cosine distance (the default metric),
+    without locking writes to the table while it's built. Indexes for the other metrics are
+    created with the `create_embedding_index` management command.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    GenericChunk = apps.get_model("baseapp_ai_langkit_embeddings", "GenericChunk")
+    schema_editor.execute(
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS {index} ON {table} "
+        "USING hnsw (embedding vector_cosine_ops)".format(
+            index=schema_editor.quote_name(INDEX_NAME),
+            table=schema_editor.quote_name(GenericChunk._meta.db_table),
+        )
+    )
+
+
+def drop_embedding_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "DROP INDEX CONCURRENTLY IF EXISTS {index}".format(
+            index=schema_editor.quote_name(INDEX_NAME)
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("baseapp_ai_langkit_embeddings", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_embedding_index, drop_embedding_index),
+    ]
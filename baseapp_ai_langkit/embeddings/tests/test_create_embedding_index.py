@@ -0,0 +1,39 @@
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from baseapp_ai_langkit.embeddings.management.commands.create_embedding_index import (
+    INDEX_NAME,
+    get_embedding_index_name,
+)
+
+
+def test_get_embedding_index_name():
+    assert get_embedding_index_name("cosine") == INDEX_NAME
+    assert get_embedding_index_name("inner_product") == f"{INDEX_NAME}_inner_product"
+
+
+@patch("baseapp_ai_langkit.embeddings.management.commands.create_embedding_index.connections")
+def test_create_embedding_index_command(mock_connections):
+    connection = MagicMock(vendor="postgresql")
+    connection.ops.quote_name.side_effect = lambda name: f'"{name}"'
+    mock_connections.__getitem__.return_value = connection
+    out = StringIO()
+
+    call_command("create_embedding_index", "--metric=inner_product", stdout=out)
+
+    cursor = connection.cursor.return_value.__enter__.return_value
+    sql = cursor.execute.call_args.args[0]
+    assert sql.startswith(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{INDEX_NAME}_inner_product"')
+    assert "USING hnsw (embedding vector_ip_ops)" in sql
+    assert f"{INDEX_NAME}_inner_product" in out.getvalue()
+
+
+@patch("baseapp_ai_langkit.embeddings.management.commands.create_embedding_index.connections")
+def test_create_embedding_index_command_requires_postgres(mock_connections):
+    mock_connections.__getitem__.return_value = MagicMock(vendor="sqlite")
+
+    with pytest.raises(CommandError):
+        call_command("create_embedding_index")
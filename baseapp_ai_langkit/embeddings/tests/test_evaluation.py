@@ -0,0 +1,125 @@
+import json
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from baseapp_ai_langkit.embeddings.evaluation import (
+    chunks_search_function,
+    evaluate,
+    latency_percentiles,
+    recall_at_k,
+    reciprocal_rank,
+    vector_store_search_function,
+)
+from baseapp_ai_langkit.vector_stores.in_memory import InMemoryVectorStore
+from baseapp_ai_langkit.vector_stores.tests.factories import DefaultVectorStoreFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_recall_at_k():
+    assert recall_at_k(["a", "b", "c"], {"a", "c"}, k=2) == 0.5
+    assert recall_at_k(["a", "b", "c"], {"a", "c"}, k=3) == 1.0
+    assert recall_at_k(["a"], {"a", "b", "c"}, k=1) == 1.0
+    assert recall_at_k(["a"], set(), k=1) == 0.0
+
+
+def test_reciprocal_rank():
+    assert reciprocal_rank(["a", "b", "c"], {"b"}) == 0.5
+    assert reciprocal_rank(["a", "b", "c"], {"d"}) == 0.0
+
+
+def test_latency_percentiles():
+    percentiles = latency_percentiles(list(range(1, 101)))
+
+    assert percentiles["p50_ms"] == pytest.approx(50.5)
+    assert percentiles["p99_ms"] == pytest.approx(99.01)
+    assert latency_percentiles([]) == {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+
+
+def test_evaluate_vector_store():
+    vector_store = InMemoryVectorStore(name="Evaluation")
+    vector_store.add_embeddings(
+        [
+            ("Apples", [1.0, 0.0], {"id": 1}),
+            ("Bananas", [0.8, 0.2], {"id": 2}),
+            ("Cars", [0.0, 1.0], {"id": 3}),
+        ]
+    )
+    queries = [
+        {"vector": [1.0, 0.0], "expected": ["1"]},
+        {"vector": [0.0, 1.0], "expected": ["2"]},
+    ]
+
+    metrics = evaluate(
+        vector_store_search_function(vector_store, object_key="id"), queries, top_k=1, repeat=2
+    )
+
+    assert metrics["recall_at_k"] == 0.5
+    assert metrics["mrr"] == 0.5
+    assert metrics["exact_recall_at_k"] == 1.0
+    assert metrics["p50_ms"] >= 0
+
+
+@pytest.mark.parametrize("distance_metric", ["cosine", "inner_product", "l2"])
+@patch("baseapp_ai_langkit.embeddings.evaluation.find_similar_chunks_by_vector")
+def test_chunks_search_function_has_no_distance_threshold(
+    mock_find_similar_chunks_by_vector, distance_metric
+):
+    search = chunks_search_function(distance_metric=distance_metric)
+
+    search([1.0, 0.0], 3)
+
+    mock_find_similar_chunks_by_vector.assert_called_once_with(
+        [1.0, 0.0],
+        queryset=None,
+        distance_metric=distance_metric,
+        distance_filter=None,
+        top_k=3,
+    )
+
+
+@patch("baseapp_ai_langkit.vector_stores.models.DefaultVectorStore.similarity_search_by_vector")
+@patch("baseapp_ai_langkit.vector_stores.models.DefaultVectorStore.get_embeddings_model")
+def test_evaluate_retrieval_command(
+    mock_get_embeddings_model, mock_similarity_search_by_vector, tmp_path
+):
+    vector_store = DefaultVectorStoreFactory()
+    mock_embeddings_model = MagicMock()
+    mock_embeddings_model.embed_query.return_value = [1.0, 0.0]
+    mock_get_embeddings_model.return_value = mock_embeddings_model
+    mock_similarity_search_by_vector.return_value = [
+        {"content": "Apples", "metadata": {"id": 1}},
+        {"content": "Bananas", "metadata": {"id": 2}},
+    ]
+    dataset = tmp_path / "dataset.json"
+    dataset.write_text(json.dumps([{"query": "Red fruit", "expected": [2]}]))
+    out = StringIO()
+
+    call_command(
+        "evaluate_retrieval",
+        str(dataset),
+        "--target=vector_store",
+        f"--vector-store={vector_store.name}",
+        "--object-key=id",
+        "--top-k",
+        "1",
+        "2",
+        "--json",
+        stdout=out,
+    )
+
+    results = json.loads(out.getvalue())
+    assert [result["top_k"] for result in results] == [1, 2]
+    assert results[1]["recall_at_k"] == 1.0
+    assert results[1]["mrr"] == 0.5
+
+
+def test_evaluate_retrieval_command_requires_vector_store(tmp_path):
+    dataset = tmp_path / "dataset.json"
+    dataset.write_text("[]")
+
+    with pytest.raises(CommandError):
+        call_command("evaluate_retrieval", str(dataset), "--target=vector_store")
@@ -8,6 +8,8 @@ class BaseappAILangkitRunnersConfig(AppConfig):
     label = "baseapp_ai_langkit_runners"
 
     def ready(self):
+        from . import signals  # noqa: F401
+
         post_migrate.connect(self.sync_registry, sender=self)
 
     def sync_registry(self, **kwargs):
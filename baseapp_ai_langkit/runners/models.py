@@ -1,10 +1,13 @@
 import logging
-from typing import Optional, Type
+from typing import Dict, Optional, Type
 
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
 from django.core.exceptions import ValidationError
 from django.db import models
 from model_utils.models import TimeStampedModel
 
+from baseapp_ai_langkit import app_settings
 from baseapp_ai_langkit.base.interfaces.base_runner import BaseRunnerInterface
 from baseapp_ai_langkit.base.interfaces.llm_node import LLMNodeInterface
 from baseapp_ai_langkit.base.prompt_schemas.base_prompt_schema import BasePromptSchema
@@ -12,6 +15,9 @@ from baseapp_ai_langkit.runners.registry import RunnerRegistry
 
 logger = logging.getLogger(__name__)
 
+# Prompt overrides of every runner by its name, invalidated by the signals in `runners/signals.py`.
+PROMPT_OVERRIDES_CACHE_KEY = "baseapp_ai_langkit:runners:prompt_overrides"
+
 
 class LLMRunner(models.Model):
     name = models.CharField(max_length=255, unique=True)
@@ -21,10 +27,10 @@ class LLMRunner(models.Model):
 
     @property
     def runner_class(self) -> Type[BaseRunnerInterface]:
-        for runner_class in RunnerRegistry.get_all():
-            if f"{runner_class.__module__}.{runner_class.__name__}" == self.name:
-                return runner_class
-        raise ValueError(f"Runner {self.name} not found")
+        runner_class = RunnerRegistry.get(self.name)
+        if runner_class is None:
+            raise ValueError(f"Runner {self.name} not found")
+        return runner_class
 
     def get_nodes_dict(self) -> dict[str, Type[LLMNodeInterface]]:
         return self.runner_class.get_available_nodes()
@@ -34,13 +40,50 @@ class LLMRunner(models.Model):
         cls, runner_class: Type[BaseRunnerInterface]
     ) -> Optional[Type[BaseRunnerInterface]]:
         try:
-            runner_instance = cls.objects.get(
-                name=f"{runner_class.__module__}.{runner_class.__name__}"
-            )
+            runner_instance = cls.objects.get(name=RunnerRegistry.get_runner_path(runner_class))
             return runner_instance
         except cls.DoesNotExist:
             return None
 
+    @classmethod
+    def get_prompt_overrides(
+        cls, runner_class: Type[BaseRunnerInterface]
+    ) -> Dict[str, "LLMRunnerNode"]:
+        """
+        The nodes of the runner by their key, with their runner, usage prompt and state modifiers.
+        The nodes of every runner are loaded in a single prefetch and cached (see
+        `BASEAPP_AI_LANGKIT_RUNNER_PROMPTS_CACHE`), so they must be treated as read only. When
+        nothing is cached, only the nodes of the given runner are loaded.
+        """
+        name = RunnerRegistry.get_runner_path(runner_class)
+        cache = caches[app_settings.RUNNER_PROMPTS_CACHE]
+        if not app_settings.RUNNER_PROMPTS_CACHE_TIMEOUT or isinstance(cache, DummyCache):
+            return cls._load_prompt_overrides(name).get(name, {})
+
+        overrides = cache.get(PROMPT_OVERRIDES_CACHE_KEY)
+        if overrides is None:
+            overrides = cls._load_prompt_overrides()
+            cache.set(
+                PROMPT_OVERRIDES_CACHE_KEY, overrides, app_settings.RUNNER_PROMPTS_CACHE_TIMEOUT
+            )
+        return overrides.get(name, {})
+
+    @staticmethod
+    def _load_prompt_overrides(name: Optional[str] = None) -> Dict[str, Dict[str, "LLMRunnerNode"]]:
+        nodes = LLMRunnerNode.objects.select_related("runner", "usage_prompt").prefetch_related(
+            "state_modifiers"
+        )
+        if name is not None:
+            nodes = nodes.filter(runner__name=name)
+        overrides = {}
+        for node in nodes:
+            overrides.setdefault(node.runner.name, {})[node.node] = node
+        return overrides
+
+    @staticmethod
+    def clear_prompt_overrides_cache():
+        caches[app_settings.RUNNER_PROMPTS_CACHE].delete(PROMPT_OVERRIDES_CACHE_KEY)
+
     @classmethod
     def sync_runners(cls):
         runners = RunnerRegistry.get_all()
@@ -50,7 +93,7 @@ class LLMRunner(models.Model):
         existing_state_modifiers = set()
         for runner in runners:
             llm_runner, created = cls.objects.get_or_create(
-                name=f"{runner.__module__}.{runner.__name__}",
+                name=RunnerRegistry.get_runner_path(runner),
             )
             existing_runners.add(llm_runner.id)
             if created:
@@ -1,18 +1,33 @@
-from typing import List, Type
+from typing import Dict, List, Optional, Type
+
+from django.core.exceptions import ImproperlyConfigured
 
 from baseapp_ai_langkit.base.interfaces.base_runner import BaseRunnerInterface
 
 
 class RunnerRegistry:
-    _registry: List[Type[BaseRunnerInterface]] = []
+    # Registered runners by their dotted path, which is also the name of their LLMRunner.
+    _registry: Dict[str, Type[BaseRunnerInterface]] = {}
+
+    @staticmethod
+    def get_runner_path(runner_cls: Type[BaseRunnerInterface]) -> str:
+        return f"{runner_cls.__module__}.{runner_cls.__name__}"
 
     @classmethod
     def register(cls, runner_cls: Type[BaseRunnerInterface]):
-        cls._registry.append(runner_cls)
+        path = cls.get_runner_path(runner_cls)
+        registered = cls._registry.get(path)
+        if registered is not None and registered is not runner_cls:
+            raise ImproperlyConfigured(f"Runner {path} is already registered by a different class.")
+        cls._registry[path] = runner_cls
+
+    @classmethod
+    def get(cls, path: str) -> Optional[Type[BaseRunnerInterface]]:
+        return cls._registry.get(path)
 
     @classmethod
-    def get_all(cls):
-        return cls._registry
+    def get_all(cls) -> List[Type[BaseRunnerInterface]]:
+        return list(cls._registry.values())
 
 
 def register_runner(runner_cls: Type[BaseRunnerInterface]):
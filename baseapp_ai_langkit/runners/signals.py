@@ -0,0 +1,56 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from baseapp_ai_langkit.base.utils.cache_invalidation import (
+    invalidate_now_and_on_commit,
+)
+from baseapp_ai_langkit.runners.models import (
+    LLMRunner,
+    LLMRunnerNode,
+    LLMRunnerNodeStateModifier,
+    LLMRunnerNodeUsagePrompt,
+)
+
+
+@receiver(
+    post_save,
+    sender=LLMRunner,
+    dispatch_uid="baseapp_ai_langkit.runners.signals.clear_prompt_overrides_cache_on_runner_save",
+)
+@receiver(
+    post_delete,
+    sender=LLMRunner,
+    dispatch_uid="baseapp_ai_langkit.runners.signals.clear_prompt_overrides_cache_on_runner_delete",
+)
+@receiver(
+    post_save,
+    sender=LLMRunnerNode,
+    dispatch_uid="baseapp_ai_langkit.runners.signals.clear_prompt_overrides_cache_on_node_save",
+)
+@receiver(
+    post_delete,
+    sender=LLMRunnerNode,
+    dispatch_uid="baseapp_ai_langkit.runners.signals.clear_prompt_overrides_cache_on_node_delete",
+)
+@receiver(
+    post_save,
+    sender=LLMRunnerNodeUsagePrompt,
+    dispatch_uid="baseapp_ai_langkit.runners.signals.clear_prompt_overrides_cache_on_usage_prompt_save",
+)
+@receiver(
+    post_delete,
+    sender=LLMRunnerNodeUsagePrompt,
+    dispatch_uid="baseapp_ai_langkit.runners.signals.clear_prompt_overrides_cache_on_usage_prompt_delete",
+)
+@receiver(
+    post_save,
+    sender=LLMRunnerNodeStateModifier,
+    dispatch_uid="baseapp_ai_langkit.runners.signals.clear_prompt_overrides_cache_on_state_modifier_save",
+)
+@receiver(
+    post_delete,
+    sender=LLMRunnerNodeStateModifier,
+    dispatch_uid="baseapp_ai_langkit.runners.signals.clear_prompt_overrides_cache_on_state_modifier_delete",
+)
+def clear_prompt_overrides_cache(sender, using: str, **kwargs):
+    invalidate_now_and_on_commit(LLMRunner.clear_prompt_overrides_cache, using)
@@ -1,6 +1,6 @@
 from unittest.mock import patch
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from baseapp_ai_langkit.base.agents.tests.factories import LLMFactory
 from baseapp_ai_langkit.base.interfaces.base_runner import BaseRunnerInterface
@@ -8,6 +8,7 @@ from baseapp_ai_langkit.base.interfaces.llm_node import LLMNodeInterface
 from baseapp_ai_langkit.base.prompt_schemas.tests.factories import (
     BasePromptSchemaFactory,
 )
+from baseapp_ai_langkit.runners.models import LLMRunner
 from baseapp_ai_langkit.runners.tests.factories import (
     LLMRunnerFactory,
     LLMRunnerNodeFactory,
@@ -22,6 +23,10 @@ class MockedRunner(BaseRunnerInterface):
 
 
 class TestBaseRunnerInterface(TestCase):
+    def setUp(self):
+        # Rolled back records don't clear the cache.
+        LLMRunner.clear_prompt_overrides_cache()
+
     def test_base_runner_get_nodes_without_db_records(self):
         MockedNode = self._get_mocked_node()
         MockedNode.state_modifier_schema = BasePromptSchemaFactory()
@@ -196,3 +201,64 @@ class TestBaseRunnerInterface(TestCase):
                 pass
 
         return MockedNode
+
+
+class TestPromptOverridesCache(TestCase):
+    def setUp(self):
+        LLMRunner.clear_prompt_overrides_cache()
+        self.node_keys = [f"node_{i}" for i in range(6)]
+        self.runner_record = LLMRunnerFactory(
+            name=f"{MockedRunner.__module__}.{MockedRunner.__name__}"
+        )
+        for node_key in self.node_keys:
+            node = LLMRunnerNodeFactory(runner=self.runner_record, node=node_key)
+            LLMRunnerNodeUsagePromptFactory(runner_node=node)
+            LLMRunnerNodeStateModifierFactory(runner_node=node, index=0)
+
+    def test_prompt_tree_is_prefetched_and_cached(self):
+        with self.assertNumQueries(2):
+            nodes = LLMRunner.get_prompt_overrides(MockedRunner)
+            for node_key in self.node_keys:
+                nodes[node_key].usage_prompt
+                list(nodes[node_key].state_modifiers.all())
+
+        with self.assertNumQueries(0):
+            cached_nodes = LLMRunner.get_prompt_overrides(MockedRunner)
+            self.assertEqual(cached_nodes, nodes)
+            for node_key in self.node_keys:
+                cached_nodes[node_key].usage_prompt
+                list(cached_nodes[node_key].state_modifiers.all())
+
+    def test_cache_is_cleared_on_edit(self):
+        nodes = LLMRunner.get_prompt_overrides(MockedRunner)
+        usage_prompt = nodes["node_0"].usage_prompt
+        usage_prompt.usage_prompt = "edited usage prompt"
+        usage_prompt.save()
+
+        nodes = LLMRunner.get_prompt_overrides(MockedRunner)
+        self.assertEqual(nodes["node_0"].usage_prompt.usage_prompt, "edited usage prompt")
+
+        nodes["node_0"].delete()
+        self.assertNotIn("node_0", LLMRunner.get_prompt_overrides(MockedRunner))
+
+    @override_settings(BASEAPP_AI_LANGKIT_RUNNER_PROMPTS_CACHE_TIMEOUT=0)
+    def test_cache_disabled(self):
+        LLMRunnerNodeFactory(node="other_node")
+        LLMRunner.get_prompt_overrides(MockedRunner)
+
+        with self.assertNumQueries(2) as context:
+            nodes = LLMRunner.get_prompt_overrides(MockedRunner)
+
+        self.assertEqual(set(nodes), set(self.node_keys))
+        # Only the runner's nodes are loaded.
+        self.assertIn(self.runner_record.name, context.captured_queries[0]["sql"])
+
+    @override_settings(
+        CACHES={"dummy": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}},
+        BASEAPP_AI_LANGKIT_RUNNER_PROMPTS_CACHE="dummy",
+    )
+    @patch.object(LLMRunner, "_load_prompt_overrides", return_value={})
+    def test_dummy_cache_loads_only_the_runner(self, mock_load_prompt_overrides):
+        LLMRunner.get_prompt_overrides(MockedRunner)
+
+        mock_load_prompt_overrides.assert_called_once_with(self.runner_record.name)
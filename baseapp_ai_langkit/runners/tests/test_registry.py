@@ -0,0 +1,50 @@
+from unittest.mock import patch
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+
+from baseapp_ai_langkit.base.interfaces.base_runner import BaseRunnerInterface
+from baseapp_ai_langkit.runners.models import LLMRunner
+from baseapp_ai_langkit.runners.registry import RunnerRegistry, register_runner
+
+
+class MockedRunner(BaseRunnerInterface):
+    def run(self) -> str:
+        pass
+
+
+class TestRunnerRegistry(TestCase):
+    def setUp(self):
+        patcher = patch.object(RunnerRegistry, "_registry", {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.path = RunnerRegistry.get_runner_path(MockedRunner)
+
+    def test_register_and_get(self):
+        self.assertIs(register_runner(MockedRunner), MockedRunner)
+
+        self.assertEqual(self.path, f"{__name__}.MockedRunner")
+        self.assertIs(RunnerRegistry.get(self.path), MockedRunner)
+        self.assertIsNone(RunnerRegistry.get("missing.Runner"))
+        self.assertEqual(RunnerRegistry.get_all(), [MockedRunner])
+
+    def test_register_same_class_twice(self):
+        register_runner(MockedRunner)
+        register_runner(MockedRunner)
+
+        self.assertEqual(RunnerRegistry.get_all(), [MockedRunner])
+
+    def test_register_different_class_with_same_path(self):
+        register_runner(MockedRunner)
+        OtherRunner = type("MockedRunner", (MockedRunner,), {"__module__": __name__})
+
+        with self.assertRaises(ImproperlyConfigured):
+            register_runner(OtherRunner)
+        self.assertIs(RunnerRegistry.get(self.path), MockedRunner)
+
+    def test_llm_runner_runner_class(self):
+        register_runner(MockedRunner)
+
+        self.assertIs(LLMRunner(name=self.path).runner_class, MockedRunner)
+        with self.assertRaises(ValueError):
+            LLMRunner(name="missing.Runner").runner_class
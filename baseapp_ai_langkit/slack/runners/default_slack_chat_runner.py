@@ -1,6 +1,10 @@
+from typing import Optional
+
 from langchain_openai import ChatOpenAI
 from langgraph.checkpoint.postgres import PostgresSaver
 
+from baseapp_ai_langkit import app_settings
+from baseapp_ai_langkit.base.utils.llm_clients import get_llm, get_summarization_llm
 from baseapp_ai_langkit.base.workflows.general_chat_workflow import GeneralChatWorkflow
 from baseapp_ai_langkit.chats.checkpointer import LangGraphCheckpointer
 from baseapp_ai_langkit.slack.base.interfaces.slack_chat_runner import (
@@ -30,7 +34,13 @@ class DefaultSlackChatRunner(BaseSlackChatInterface):
         return response
 
     def initialize_llm(self) -> ChatOpenAI:
-        return ChatOpenAI(model="gpt-4o-mini", temperature=0)
+        return get_llm(ChatOpenAI, model="gpt-4o-mini", temperature=0)
+
+    def initialize_summarization_llm(self) -> Optional[ChatOpenAI]:
+        """
+        The llm summarizing the conversation. None summarizes it with the chat llm.
+        """
+        return get_summarization_llm(ChatOpenAI)
 
     def create_checkpointer(self) -> PostgresSaver:
         checkpointer_wrapper = LangGraphCheckpointer()
@@ -43,6 +53,10 @@ class DefaultSlackChatRunner(BaseSlackChatInterface):
             config=self.config,
             nodes=self.nodes,
             checkpointer=self.checkpointer,
+            max_tokens=app_settings.CHATS_SUMMARIZATION_MAX_TOKENS or None,
+            summarization_llm=self.initialize_summarization_llm(),
+            summarization_max_input_tokens=app_settings.CHATS_SUMMARIZATION_MAX_INPUT_TOKENS
+            or None,
         )
 
         response = workflow.execute(self.user_input)
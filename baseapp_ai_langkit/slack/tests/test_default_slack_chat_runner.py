@@ -0,0 +1,34 @@
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase, override_settings
+
+from baseapp_ai_langkit.chats.tests.factories import ChatSessionFactory
+from baseapp_ai_langkit.slack.runners.default_slack_chat_runner import (
+    DefaultSlackChatRunner,
+)
+
+
+class TestDefaultSlackChatRunner(TestCase):
+    @override_settings(
+        BASEAPP_AI_LANGKIT_CHATS_SUMMARIZATION_MAX_TOKENS=2000,
+        BASEAPP_AI_LANGKIT_CHATS_SUMMARIZATION_MAX_INPUT_TOKENS=8000,
+    )
+    @patch("baseapp_ai_langkit.slack.runners.default_slack_chat_runner.GeneralChatWorkflow")
+    def test_workflow_uses_the_summarization_settings(self, mock_workflow_class):
+        runner = DefaultSlackChatRunner(
+            slack_context={}, session=ChatSessionFactory(), user_input="Hello"
+        )
+        runner.llm, runner.checkpointer, runner.nodes = MagicMock(), MagicMock(), {}
+        summarization_llm = MagicMock()
+
+        with patch.object(
+            DefaultSlackChatRunner,
+            "initialize_summarization_llm",
+            return_value=summarization_llm,
+        ):
+            runner.process_workflow()
+
+        kwargs = mock_workflow_class.call_args.kwargs
+        self.assertEqual(kwargs["max_tokens"], 2000)
+        self.assertEqual(kwargs["summarization_max_input_tokens"], 8000)
+        self.assertIs(kwargs["summarization_llm"], summarization_llm)
@@ -5,3 +5,6 @@ class BaseappAILangkitVectorStoresConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "baseapp_ai_langkit.vector_stores"
     label = "baseapp_ai_langkit_vector_stores"
+
+    def ready(self):
+        from . import signals  # noqa
@@ -0,0 +1,105 @@
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+from baseapp_ai_langkit import app_settings
+from baseapp_ai_langkit.base.utils.token_counter import count_tokens, truncate_to_tokens
+
+
+class ContextAssembler:
+    """
+    Packs vector store search results into the context string returned by the vector store
+    tools, keeping it under a token budget.
+
+    Results are expected in rank order (best match first). Chunks that belong to the same
+    object (see `group_by_metadata_keys`) are merged into a single block placed at the rank of
+    its best chunk, so the LLM reads related passages together and the object is only
+    introduced once. Chunks are then added greedily, in rank order, while they fit in the
+    budget; chunks that do not fit are skipped so smaller, lower ranked chunks can still be
+    used. If not even the best chunk fits, it is truncated to the budget.
+
+    Attributes:
+        max_tokens (int): The token budget. Defaults to the
+            `BASEAPP_AI_LANGKIT_VECTOR_STORE_TOOL_MAX_TOKENS` setting.
+        group_by_metadata_keys (Sequence[str]): Metadata keys identifying the object a chunk
+            belongs to. Chunks without any of these keys are never merged.
+        block_separator (str): Separator between blocks of different objects.
+        chunk_separator (str): Separator between merged chunks of the same object.
+        token_counter (Callable[[str], int]): Function used to count tokens.
+    """
+
+    group_by_metadata_keys: Sequence[str] = ("content_type", "object_id")
+    block_separator: str = "\n\n"
+    chunk_separator: str = "\n"
+
+    def __init__(
+        self,
+        max_tokens: Optional[int] = None,
+        group_by_metadata_keys: Optional[Sequence[str]] = None,
+        token_counter: Callable[[str], int] = count_tokens,
+    ):
+        self.max_tokens = (
+            max_tokens if max_tokens is not None else app_settings.VECTOR_STORE_TOOL_MAX_TOKENS
+        )
+        if group_by_metadata_keys is not None:
+            self.group_by_metadata_keys = group_by_metadata_keys
+        self.token_counter = token_counter
+
+    def get_group_key(self, result: Dict[str, Any]) -> Optional[Hashable]:
+        metadata = result.get("metadata") or {}
+        key = tuple(
+            (field, str(metadata[field]))
+            for field in self.group_by_metadata_keys
+            if field in metadata
+        )
+        return key or None
+
+    def group_results(self, results: List[Dict[str, Any]]) -> List[List[str]]:
+        """
+        Group the chunk contents by object, keeping the rank order of each object's best chunk
+        and dropping duplicated chunks.
+        """
+        groups: Dict[Hashable, List[str]] = {}
+        seen_contents = set()
+        for index, result in enumerate(results):
+            content = result["content"]
+            if not content or content in seen_contents:
+                continue
+            seen_contents.add(content)
+            key = self.get_group_key(result)
+            groups.setdefault(key if key is not None else ("__ungrouped__", index), []).append(
+                content
+            )
+        return list(groups.values())
+
+    def pack(self, groups: List[List[str]]) -> List[List[str]]:
+        """
+        Select the chunks of each group that fit in the token budget.
+        """
+        block_separator_tokens = self.token_counter(self.block_separator)
+        chunk_separator_tokens = self.token_counter(self.chunk_separator)
+        remaining = self.max_tokens
+        packed: List[List[str]] = []
+
+        for group in groups:
+            selected = []
+            for chunk in group:
+                separator_tokens = (
+                    chunk_separator_tokens
+                    if selected
+                    else (block_separator_tokens if packed else 0)
+                )
+                chunk_tokens = self.token_counter(chunk) + separator_tokens
+                if chunk_tokens <= remaining:
+                    selected.append(chunk)
+                    remaining -= chunk_tokens
+            if selected:
+                packed.append(selected)
+
+        if not packed and groups:
+            packed.append([truncate_to_tokens(groups[0][0], self.max_tokens)])
+
+        return packed
+
+    def assemble(self, results: List[Dict[str, Any]]) -> str:
+        groups = self.group_results(results)
+        packed = self.pack(groups)
+        return self.block_separator.join(self.chunk_separator.join(chunks) for chunks in packed)
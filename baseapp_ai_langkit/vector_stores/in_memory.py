@@ -0,0 +1,210 @@
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_openai import OpenAIEmbeddings
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryVectorStore:
+    """
+    An in-process vector store, with the same `add_documents`/`similarity_search` API as
+    `AbstractBaseVectorStore` subclasses, meant for unit tests and small corpora (e.g. small
+    per-tenant stores) that don't need Postgres.
+
+    The vectors are L2-normalized on insertion and held in a single contiguous float32 matrix,
+    so a cosine similarity search is a single matrix-vector product followed by a partial sort
+    (`np.argpartition`) of the top `k` scores.
+
+    The store can be persisted to a directory with `persist` and loaded back with `load`. By
+    default the vectors are memory-mapped when loaded, so large stores can be opened without
+    reading the whole matrix into memory.
+
+    Attributes:
+        name (str): The name of the vector store.
+        description (str): An optional description of the vector store.
+    """
+
+    VECTORS_FILENAME = "vectors.npy"
+    DOCUMENTS_FILENAME = "documents.json"
+
+    def __init__(
+        self,
+        name: str,
+        description: Optional[str] = None,
+        embeddings_model=None,
+        initial_capacity: int = 64,
+    ):
+        self.name = name
+        self.description = description
+        self.embeddings_model = embeddings_model
+        self._initial_capacity = max(initial_capacity, 1)
+        self._vectors: Optional[np.ndarray] = None
+        self._size = 0
+        self._contents: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._rows_by_content: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __str__(self) -> str:
+        return self.name
+
+    def __len__(self) -> int:
+        return self._size
+
+    def get_embeddings_model(self):
+        if self.embeddings_model is None:
+            self.embeddings_model = OpenAIEmbeddings()
+        return self.embeddings_model
+
+    def add_documents(self, documents: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Add documents to the vector store. Documents are identified by their content (combined
+        with the metadata, as in `DefaultVectorStore`), so adding an existing document updates
+        its embedding and metadata.
+        """
+        if not documents:
+            return
+
+        contents = []
+        metadatas = []
+        for document, metadata in documents:
+            metadata_str = " ".join(f"{key}: {value}" for key, value in metadata.items())
+            contents.append(f"{document} {metadata_str}")
+            metadatas.append(metadata)
+
+        embeddings = self.get_embeddings_model().embed_documents(contents)
+        self.add_embeddings(list(zip(contents, embeddings, metadatas)))
+
+    def add_embeddings(self, items: List[Tuple[str, List[float], Dict[str, Any]]]) -> None:
+        """
+        Add already embedded documents, as (content, embedding, metadata) tuples.
+        """
+        if not items:
+            return
+
+        vectors = self._normalize(np.asarray([embedding for _, embedding, _ in items]))
+
+        with self._lock:
+            self._ensure_capacity(self._size + len(items), vectors.shape[1])
+            for (content, _, metadata), vector in zip(items, vectors):
+                row = self._rows_by_content.get(content)
+                if row is None:
+                    row = self._size
+                    self._size += 1
+                    self._rows_by_content[content] = row
+                    self._contents.append(content)
+                    self._metadatas.append(metadata)
+                    logger.info(f"Created new embedding for document: {content}")
+                else:
+                    self._metadatas[row] = metadata
+                    logger.info(f"Updated embedding for document: {content}")
+                self._vectors[row] = vector
+
+    def similarity_search(self, query: str, k: int = 4) -> List[Dict[str, Any]]:
+        query_embedding = self.get_embeddings_model().embed_query(query)
+        return self.similarity_search_by_vector(query_embedding, k=k)
+
+    def similarity_search_by_vector(
+        self, embedding: List[float], k: int = 4
+    ) -> List[Dict[str, Any]]:
+        if self._size == 0 or k <= 0:
+            return []
+
+        query_vector = self._normalize(np.asarray(embedding)[np.newaxis, :])[0]
+        scores = self._vectors[: self._size] @ query_vector
+
+        if k < self._size:
+            top_rows = np.argpartition(-scores, k - 1)[:k]
+            top_rows = top_rows[np.argsort(-scores[top_rows], kind="stable")]
+        else:
+            top_rows = np.argsort(-scores, kind="stable")
+
+        return [
+            {
+                "content": self._contents[row],
+                "metadata": self._metadatas[row],
+            }
+            for row in top_rows
+        ]
+
+    def persist(self, path: str) -> None:
+        """
+        Persist the vector store to the given directory.
+        """
+        os.makedirs(path, exist_ok=True)
+        with self._lock:
+            vectors = (
+                self._vectors[: self._size]
+                if self._vectors is not None
+                else np.empty((0, 0), dtype=np.float32)
+            )
+            np.save(os.path.join(path, self.VECTORS_FILENAME), vectors)
+            with open(os.path.join(path, self.DOCUMENTS_FILENAME), "w") as documents_file:
+                json.dump(
+                    {
+                        "name": self.name,
+                        "description": self.description,
+                        "contents": self._contents,
+                        "metadatas": self._metadatas,
+                    },
+                    documents_file,
+                )
+
+    @classmethod
+    def load(cls, path: str, embeddings_model=None, mmap: bool = True) -> "InMemoryVectorStore":
+        """
+        Load a vector store persisted with `persist`. When `mmap` is True the vectors are
+        memory-mapped (read-only) instead of read into memory; they are copied into memory only
+        if documents are added to the store.
+        """
+        with open(os.path.join(path, cls.DOCUMENTS_FILENAME)) as documents_file:
+            documents = json.load(documents_file)
+        vectors = np.load(os.path.join(path, cls.VECTORS_FILENAME), mmap_mode="r" if mmap else None)
+
+        vector_store = cls(
+            name=documents["name"],
+            description=documents["description"],
+            embeddings_model=embeddings_model,
+        )
+        vector_store._contents = documents["contents"]
+        vector_store._metadatas = documents["metadatas"]
+        vector_store._rows_by_content = {
+            content: row for row, content in enumerate(vector_store._contents)
+        }
+        vector_store._size = len(vector_store._contents)
+        vector_store._vectors = vectors if vector_store._size else None
+        return vector_store
+
+    def _ensure_capacity(self, size: int, dimensions: int) -> None:
+        if self._vectors is None:
+            capacity = max(self._initial_capacity, size)
+            self._vectors = np.zeros((capacity, dimensions), dtype=np.float32)
+            return
+
+        if self._vectors.shape[1] != dimensions:
+            raise ValueError(
+                f"Expected embeddings with {self._vectors.shape[1]} dimensions, got {dimensions}."
+            )
+
+        capacity = self._vectors.shape[0]
+        if size <= capacity and self._vectors.flags.writeable:
+            return
+
+        # Grow geometrically so appending documents one by one stays amortized O(1).
+        while capacity < size:
+            capacity *= 2
+        vectors = np.zeros((capacity, dimensions), dtype=np.float32)
+        vectors[: self._size] = self._vectors[: self._size]
+        self._vectors = vectors
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = vectors.astype(np.float32, copy=False)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        # Zero vectors are kept as is, so they score 0 against any query.
+        return vectors / np.where(norms == 0, 1, norms)
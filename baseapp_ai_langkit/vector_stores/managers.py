@@ -0,0 +1,78 @@
+import uuid
+from typing import Optional
+
+from django.core.cache import caches
+from django.db import models, transaction
+
+from baseapp_ai_langkit import app_settings
+
+VECTOR_STORES_CACHE_KEY = "baseapp_ai_langkit:vector_stores"
+
+
+class DefaultVectorStoreManager(models.Manager):
+    """
+    Manager for vector stores, with a cache of the stores resolved by name.
+
+    Vector stores are resolved by name every time a runner builds its tools list, and they
+    rarely change, so the resolved stores are cached to avoid hitting the database on every
+    invocation. The field values are cached in the `VECTOR_STORES_CACHE` Django cache for
+    `VECTOR_STORES_CACHE_TIMEOUT` seconds and a fresh instance is built from them on every hit.
+    The cache is invalidated when a store is saved or deleted (see `signals.py`), so it should
+    be shared by all the processes for them to see each other's changes; otherwise the timeout
+    bounds how long a process may use a stale store.
+    """
+
+    def get_cached(self, name: str) -> Optional[models.Model]:
+        cache = caches[app_settings.VECTOR_STORES_CACHE]
+        cached = cache.get(self._get_cache_key(self.db, "name", name))
+        if cached is None:
+            return None
+        field_names, values = cached
+        return self.model.from_db(self.db, field_names, values)
+
+    def cache(self, vector_store: models.Model) -> None:
+        """
+        Cache the given vector store once the current transaction is committed, so a
+        rolled back store never makes it into the cache.
+        """
+        db = vector_store._state.db or self.db
+        field_names = [field.attname for field in self.model._meta.concrete_fields]
+        values = [getattr(vector_store, field_name) for field_name in field_names]
+
+        def _cache():
+            cache = caches[app_settings.VECTOR_STORES_CACHE]
+            timeout = app_settings.VECTOR_STORES_CACHE_TIMEOUT
+            cache.set_many(
+                {
+                    self._get_cache_key(db, "name", vector_store.name): (field_names, values),
+                    # Remember the name the store was cached under, to invalidate it on rename.
+                    self._get_cache_key(db, "pk", vector_store.pk): vector_store.name,
+                },
+                timeout,
+            )
+
+        transaction.on_commit(_cache, using=db)
+
+    def invalidate_cache(self, vector_store: Optional[models.Model] = None) -> None:
+        """
+        Remove the given vector store (matched by name or primary key, to handle renames)
+        from the cache. Clears the whole cache if no vector store is given.
+        """
+        cache = caches[app_settings.VECTOR_STORES_CACHE]
+        if vector_store is None:
+            cache.set(f"{VECTOR_STORES_CACHE_KEY}:generation", uuid.uuid4().hex, None)
+            return
+        db = vector_store._state.db or self.db
+        pk_key = self._get_cache_key(db, "pk", vector_store.pk)
+        keys = [pk_key, self._get_cache_key(db, "name", vector_store.name)]
+        if cached_name := cache.get(pk_key):
+            keys.append(self._get_cache_key(db, "name", cached_name))
+        cache.delete_many(keys)
+
+    @staticmethod
+    def _get_cache_key(db: str, *parts) -> str:
+        # The generation is changed to clear all the cached stores at once.
+        generation = caches[app_settings.VECTOR_STORES_CACHE].get_or_set(
+            f"{VECTOR_STORES_CACHE_KEY}:generation", uuid.uuid4().hex, None
+        )
+        return ":".join([VECTOR_STORES_CACHE_KEY, generation, db, *map(str, parts)])
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("baseapp_ai_langkit_vector_stores", "0004_defaultvectorstoretool"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="defaultvectorstore",
+            name="distance_metric",
+            field=models.CharField(
+                choices=[
+                    ("cosine", "Cosine distance"),
+                    ("inner_product", "Inner product (normalized vectors)"),
+                    ("l2", "Euclidean distance"),
+                ],
+                default="cosine",
+                help_text="Distance metric used by the similarity search. With inner product the embeddings are stored L2-normalized, so documents added before switching to it must be re-added.",
+                max_length=20,
+            ),
+        ),
+    ]
@@ -5,7 +5,16 @@ from django.db import models
 from langchain_core.tools import Tool
 from langchain_openai import OpenAIEmbeddings
 from model_utils.models import TimeStampedModel
-from pgvector.django import CosineDistance, VectorField
+from pgvector.django import VectorField
+
+from baseapp_ai_langkit.base.utils.distance_metrics import (
+    DistanceMetric,
+    get_distance_expression,
+    normalize_vectors,
+    requires_normalized_vectors,
+)
+from baseapp_ai_langkit.vector_stores.context_assembler import ContextAssembler
+from baseapp_ai_langkit.vector_stores.managers import DefaultVectorStoreManager
 
 logger = logging.getLogger(__name__)
 
@@ -76,7 +85,17 @@ class AbstractBaseVectorStore(TimeStampedModel):
 
 
 class DefaultVectorStore(AbstractBaseVectorStore):
-    # TODO: (Tech Debt) create manager for this model
+    distance_metric = models.CharField(
+        max_length=20,
+        choices=DistanceMetric.choices,
+        default=DistanceMetric.COSINE,
+        help_text=(
+            "Distance metric used by the similarity search. With inner product the embeddings are "
+            "stored L2-normalized, so documents added before switching to it must be re-added."
+        ),
+    )
+
+    objects = DefaultVectorStoreManager()
 
     def get_embeddings_model(self):
         return OpenAIEmbeddings()
@@ -95,6 +114,8 @@ class DefaultVectorStore(AbstractBaseVectorStore):
             metadatas.append(metadata)
 
         embeddings = embeddings_model.embed_documents(contents)
+        if requires_normalized_vectors(self.distance_metric):
+            embeddings = normalize_vectors(embeddings)
 
         for content, embedding, metadata in zip(contents, embeddings, metadatas):
             document_embedding, created = DefaultDocumentEmbedding.objects.update_or_create(
@@ -114,14 +135,23 @@ class DefaultVectorStore(AbstractBaseVectorStore):
 
         query_embedding = embeddings_model.embed_query(query)
 
+        return self.similarity_search_by_vector(query_embedding, k=k)
+
+    def similarity_search_by_vector(
+        self, embedding: List[float], k: int = 4
+    ) -> List[Dict[str, Any]]:
+        if requires_normalized_vectors(self.distance_metric):
+            embedding = normalize_vectors([embedding])[0]
+
+        distance_expression = get_distance_expression(self.distance_metric)
         results = (
             DefaultDocumentEmbedding.objects.annotate(
-                cosine_distance=CosineDistance("embedding", query_embedding)
+                distance=distance_expression("embedding", embedding)
             )
-            .order_by("cosine_distance")
+            .order_by("distance")
             .filter(
                 vector_store=self,
-                cosine_distance__isnull=False,
+                distance__isnull=False,
             )[:k]
         )
 
@@ -153,6 +183,8 @@ class DefaultVectorStoreTool(TimeStampedModel):
         DefaultVectorStore, on_delete=models.CASCADE, related_name="tools"
     )
 
+    context_assembler_class = ContextAssembler
+
     def __str__(self):
         return self.name
 
@@ -165,4 +197,7 @@ class DefaultVectorStoreTool(TimeStampedModel):
 
     def tool_func(self, input_text: str) -> str:
         results = self.vector_store.similarity_search(input_text)
-        return "\n".join([res["content"] for res in results])
+        return self.get_context_assembler().assemble(results)
+
+    def get_context_assembler(self) -> ContextAssembler:
+        return self.context_assembler_class()
@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from baseapp_ai_langkit.base.utils.cache_invalidation import (
+    invalidate_now_and_on_commit,
+)
+from baseapp_ai_langkit.vector_stores.models import DefaultVectorStore
+
+
+@receiver(
+    post_save,
+    sender=DefaultVectorStore,
+    dispatch_uid="baseapp_ai_langkit.vector_stores.signals.invalidate_vector_store_cache_on_save",
+)
+@receiver(
+    post_delete,
+    sender=DefaultVectorStore,
+    dispatch_uid="baseapp_ai_langkit.vector_stores.signals.invalidate_vector_store_cache_on_delete",
+)
+def invalidate_vector_store_cache(sender, instance: DefaultVectorStore, using: str, **kwargs):
+    invalidate_now_and_on_commit(lambda: sender.objects.invalidate_cache(instance), using)
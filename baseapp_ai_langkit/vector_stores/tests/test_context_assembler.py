@@ -0,0 +1,110 @@
+from unittest.mock import MagicMock, patch
+
+from django.test import override_settings
+
+from baseapp_ai_langkit.base.utils.token_counter import count_tokens
+from baseapp_ai_langkit.vector_stores.context_assembler import ContextAssembler
+from baseapp_ai_langkit.vector_stores.models import DefaultVectorStoreTool
+from baseapp_ai_langkit.vector_stores.tools.inline_vector_store_tool import (
+    InlineVectorStoreTool,
+)
+
+
+def word_counter(text: str) -> int:
+    return len(text.split())
+
+
+def make_result(content, **metadata):
+    return {"content": content, "metadata": metadata}
+
+
+def test_assemble_merges_chunks_of_the_same_object():
+    assembler = ContextAssembler(max_tokens=100, token_counter=word_counter)
+    results = [
+        make_result("doc 1 chunk a", content_type=1, object_id=1),
+        make_result("doc 2 chunk a", content_type=1, object_id=2),
+        make_result("doc 1 chunk b", content_type=1, object_id=1),
+        make_result("no metadata chunk"),
+    ]
+
+    context = assembler.assemble(results)
+
+    assert context == "doc 1 chunk a\ndoc 1 chunk b\n\ndoc 2 chunk a\n\nno metadata chunk"
+
+
+def test_assemble_drops_duplicated_chunks():
+    assembler = ContextAssembler(max_tokens=100, token_counter=word_counter)
+    results = [make_result("same chunk"), make_result("same chunk")]
+
+    assert assembler.assemble(results) == "same chunk"
+
+
+def test_assemble_respects_token_budget():
+    assembler = ContextAssembler(max_tokens=6, token_counter=word_counter)
+    results = [
+        make_result("one two three"),
+        make_result("four five six seven"),
+        make_result("eight nine"),
+    ]
+
+    context = assembler.assemble(results)
+
+    assert context == "one two three\n\neight nine"
+    assert word_counter(context) <= 6
+
+
+def test_assemble_truncates_first_chunk_when_nothing_fits():
+    assembler = ContextAssembler(max_tokens=3)
+    results = [make_result("a very long chunk " * 50)]
+
+    context = assembler.assemble(results)
+
+    assert context
+    assert count_tokens(context) <= 3
+
+
+def test_assemble_empty_results():
+    assert ContextAssembler(max_tokens=10).assemble([]) == ""
+
+
+@override_settings(BASEAPP_AI_LANGKIT_VECTOR_STORE_TOOL_MAX_TOKENS=42)
+def test_assembler_default_budget_from_settings():
+    assert ContextAssembler().max_tokens == 42
+
+
+def test_count_tokens_is_cached():
+    count_tokens.cache_clear()
+    count_tokens("some repeated chunk")
+    count_tokens("some repeated chunk")
+
+    assert count_tokens.cache_info().hits == 1
+
+
+def test_inline_vector_store_tool_uses_context_assembler():
+    vector_store = MagicMock()
+    vector_store.similarity_search.return_value = [
+        make_result("first", content_type=1, object_id=1),
+        make_result("second", content_type=1, object_id=1),
+    ]
+    tool = InlineVectorStoreTool(vector_store=vector_store)
+
+    assert tool.tool_func("query") == "first\nsecond"
+    vector_store.similarity_search.assert_called_once_with("query")
+
+
+def test_default_vector_store_tool_uses_its_context_assembler():
+    class WordBudgetAssembler(ContextAssembler):
+        def __init__(self):
+            super().__init__(max_tokens=1, token_counter=word_counter)
+
+    vector_store = MagicMock()
+    vector_store.similarity_search.return_value = [
+        make_result("first", content_type=1, object_id=1),
+        make_result("second", content_type=1, object_id=2),
+    ]
+    tool = DefaultVectorStoreTool(name="tool")
+
+    with patch.object(DefaultVectorStoreTool, "vector_store", vector_store), patch.object(
+        DefaultVectorStoreTool, "context_assembler_class", WordBudgetAssembler
+    ):
+        assert tool.tool_func("query") == "first"
@@ -0,0 +1,103 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from baseapp_ai_langkit.vector_stores.in_memory import InMemoryVectorStore
+from baseapp_ai_langkit.vector_stores.tools.inline_vector_store_tool import (
+    InlineVectorStoreTool,
+)
+
+EMBEDDINGS = {
+    "Apples are red source: fruits": [1.0, 0.0, 0.0],
+    "Bananas are yellow source: fruits": [0.9, 0.1, 0.0],
+    "Cars have wheels source: vehicles": [0.0, 0.0, 1.0],
+}
+
+
+@pytest.fixture
+def embeddings_model():
+    embeddings_model = MagicMock()
+    embeddings_model.embed_documents.side_effect = lambda texts: [EMBEDDINGS[t] for t in texts]
+    embeddings_model.embed_query.return_value = [2.0, 0.0, 0.0]
+    return embeddings_model
+
+
+@pytest.fixture
+def vector_store(embeddings_model):
+    vector_store = InMemoryVectorStore(
+        name="In memory", embeddings_model=embeddings_model, initial_capacity=1
+    )
+    vector_store.add_documents(
+        [
+            ("Apples are red", {"source": "fruits"}),
+            ("Bananas are yellow", {"source": "fruits"}),
+            ("Cars have wheels", {"source": "vehicles"}),
+        ]
+    )
+    return vector_store
+
+
+def test_in_memory_vector_store_add_documents(vector_store):
+    assert len(vector_store) == 3
+    assert np.allclose(np.linalg.norm(vector_store._vectors[:3], axis=1), 1)
+
+
+def test_in_memory_vector_store_add_existing_document_updates_it(vector_store, embeddings_model):
+    vector_store.add_documents([("Cars have wheels", {"source": "vehicles"})])
+
+    assert len(vector_store) == 3
+    embeddings_model.embed_documents.assert_called_with(["Cars have wheels source: vehicles"])
+
+
+def test_in_memory_vector_store_similarity_search(vector_store, embeddings_model):
+    results = vector_store.similarity_search("Red fruit", k=2)
+
+    assert results == [
+        {"content": "Apples are red source: fruits", "metadata": {"source": "fruits"}},
+        {"content": "Bananas are yellow source: fruits", "metadata": {"source": "fruits"}},
+    ]
+    embeddings_model.embed_query.assert_called_once_with("Red fruit")
+
+
+def test_in_memory_vector_store_similarity_search_k_larger_than_size(vector_store):
+    results = vector_store.similarity_search("Red fruit", k=10)
+
+    assert [result["metadata"]["source"] for result in results] == [
+        "fruits",
+        "fruits",
+        "vehicles",
+    ]
+
+
+def test_in_memory_vector_store_similarity_search_empty(embeddings_model):
+    vector_store = InMemoryVectorStore(name="Empty", embeddings_model=embeddings_model)
+
+    assert vector_store.similarity_search("Red fruit") == []
+
+
+def test_in_memory_vector_store_dimensions_mismatch(vector_store):
+    with pytest.raises(ValueError):
+        vector_store.add_embeddings([("Wrong", [1.0, 0.0], {})])
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_in_memory_vector_store_persist_and_load(vector_store, embeddings_model, tmp_path, mmap):
+    vector_store.persist(str(tmp_path))
+
+    loaded = InMemoryVectorStore.load(str(tmp_path), embeddings_model=embeddings_model, mmap=mmap)
+
+    assert loaded.name == "In memory"
+    assert len(loaded) == 3
+    assert loaded.similarity_search("Red fruit", k=1) == vector_store.similarity_search(
+        "Red fruit", k=1
+    )
+
+    loaded.add_embeddings([("Trucks have wheels", [0.0, 0.1, 0.9], {"source": "vehicles"})])
+    assert len(loaded) == 4
+
+
+def test_inline_vector_store_tool_with_in_memory_vector_store(vector_store):
+    tool = InlineVectorStoreTool(vector_store=vector_store, name="Fruits", description="Fruits")
+
+    assert tool.tool_func("Red fruit").startswith("Apples are red source: fruits")
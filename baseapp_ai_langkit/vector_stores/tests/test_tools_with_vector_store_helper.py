@@ -1,7 +1,8 @@
 from typing import Type
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
+from baseapp_ai_langkit.vector_stores.models import DefaultVectorStore
 from baseapp_ai_langkit.vector_stores.tools.inline_vector_store_tool import (
     InlineVectorStoreTool,
 )
@@ -23,6 +24,12 @@ class MockAgentWithToolsWithVectorStoreHelper(ToolsWithVectorStoreHelper):
 
 
 class TestToolsWithVectorStoreHelper(TestCase):
+    def setUp(self):
+        DefaultVectorStore.objects.invalidate_cache()
+
+    def tearDown(self):
+        DefaultVectorStore.objects.invalidate_cache()
+
     def test_get_new_vector_store(self):
         manager = MockAgentWithToolsWithVectorStoreHelper()
         vector_store, created = manager.get_vector_store(MockInlineVectorStoreTool)
@@ -42,3 +49,71 @@ class TestToolsWithVectorStoreHelper(TestCase):
         tools = manager.get_tools()
         self.assertEqual(len(tools), 1)
         self.assertIsInstance(tools[0], InlineVectorStoreTool)
+        self.assertIsInstance(tools[0].vector_store, DefaultVectorStore)
+
+    def test_get_vector_store_is_cached(self):
+        manager = MockAgentWithToolsWithVectorStoreHelper()
+        with self.captureOnCommitCallbacks(execute=True):
+            vector_store, created = manager.get_vector_store(MockInlineVectorStoreTool)
+        self.assertTrue(created)
+
+        with self.assertNumQueries(0):
+            cached_vector_store, created = manager.get_vector_store(MockInlineVectorStoreTool)
+            tools = manager.get_tools()
+        self.assertFalse(created)
+        self.assertEqual(cached_vector_store.pk, vector_store.pk)
+        self.assertEqual(tools[0].vector_store.pk, vector_store.pk)
+
+    def test_cached_vector_store_is_rebuilt_from_the_cache(self):
+        manager = MockAgentWithToolsWithVectorStoreHelper()
+        with self.captureOnCommitCallbacks(execute=True):
+            vector_store, _ = manager.get_vector_store(MockInlineVectorStoreTool)
+
+        first = DefaultVectorStore.objects.get_cached(vector_store.name)
+        second = DefaultVectorStore.objects.get_cached(vector_store.name)
+        self.assertIsNot(first, second)
+        self.assertEqual(first.pk, vector_store.pk)
+        self.assertEqual(first.distance_metric, vector_store.distance_metric)
+        self.assertEqual(first._state.db, "default")
+        self.assertFalse(first._state.adding)
+
+    @override_settings(BASEAPP_AI_LANGKIT_VECTOR_STORES_CACHE_TIMEOUT=0)
+    def test_vector_store_cache_disabled_with_zero_timeout(self):
+        manager = MockAgentWithToolsWithVectorStoreHelper()
+        with self.captureOnCommitCallbacks(execute=True):
+            vector_store, _ = manager.get_vector_store(MockInlineVectorStoreTool)
+
+        self.assertIsNone(DefaultVectorStore.objects.get_cached(vector_store.name))
+
+    def test_get_vector_store_is_not_cached_before_commit(self):
+        manager = MockAgentWithToolsWithVectorStoreHelper()
+        manager.get_vector_store(MockInlineVectorStoreTool)
+        self.assertIsNone(
+            DefaultVectorStore.objects.get_cached("test_vector_store_MockInlineVectorStoreTool")
+        )
+
+    def test_vector_store_cache_invalidated_on_save(self):
+        manager = MockAgentWithToolsWithVectorStoreHelper()
+        with self.captureOnCommitCallbacks(execute=True):
+            vector_store, _ = manager.get_vector_store(MockInlineVectorStoreTool)
+
+        vector_store.name = "renamed_vector_store"
+        vector_store.save()
+
+        self.assertIsNone(
+            DefaultVectorStore.objects.get_cached("test_vector_store_MockInlineVectorStoreTool")
+        )
+        new_vector_store, created = manager.get_vector_store(MockInlineVectorStoreTool)
+        self.assertTrue(created)
+        self.assertNotEqual(new_vector_store.pk, vector_store.pk)
+
+    def test_vector_store_cache_invalidated_on_delete(self):
+        manager = MockAgentWithToolsWithVectorStoreHelper()
+        with self.captureOnCommitCallbacks(execute=True):
+            vector_store, _ = manager.get_vector_store(MockInlineVectorStoreTool)
+
+        vector_store.delete()
+
+        self.assertIsNone(
+            DefaultVectorStore.objects.get_cached("test_vector_store_MockInlineVectorStoreTool")
+        )
@@ -2,6 +2,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from baseapp_ai_langkit.base.utils.distance_metrics import DistanceMetric
 from baseapp_ai_langkit.vector_stores.models import DefaultDocumentEmbedding
 from baseapp_ai_langkit.vector_stores.tests.factories import (
     DefaultDocumentEmbeddingFactory,
@@ -80,3 +81,22 @@ def test_default_vector_store_similarity_search(mock_get_embeddings_model):
     assert results[1]["content"] == doc2.content
 
     mock_embeddings_model.embed_query.assert_called_once_with("What is Python?")
+
+
+@patch("baseapp_ai_langkit.vector_stores.models.DefaultVectorStore.get_embeddings_model")
+def test_default_vector_store_add_documents_inner_product_normalizes(mock_get_embeddings_model):
+    store = DefaultVectorStoreFactory(distance_metric=DistanceMetric.INNER_PRODUCT)
+    mock_embeddings_model = MagicMock()
+    mock_embeddings_model.embed_documents.return_value = [[3.0, 4.0], [0.0, 0.0]]
+    mock_get_embeddings_model.return_value = mock_embeddings_model
+
+    store.add_documents(
+        [
+            ("Document 1 text", {"source": "Test Source 1"}),
+            ("Empty document", {"source": "Test Source 2"}),
+        ]
+    )
+
+    embeddings = DefaultDocumentEmbedding.objects.filter(vector_store=store).order_by("id")
+    assert list(embeddings[0].embedding) == pytest.approx([0.6, 0.8])
+    assert list(embeddings[1].embedding) == pytest.approx([0.0, 0.0])
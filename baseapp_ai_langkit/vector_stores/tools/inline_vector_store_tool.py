@@ -1,13 +1,23 @@
+from typing import Union
+
 from langchain_core.tools import Tool
 
 from baseapp_ai_langkit.base.tools.base_tool import AbstractBaseTool
+from baseapp_ai_langkit.vector_stores.context_assembler import ContextAssembler
+from baseapp_ai_langkit.vector_stores.in_memory import InMemoryVectorStore
 from baseapp_ai_langkit.vector_stores.models import AbstractBaseVectorStore
 
 
 class InlineVectorStoreTool(AbstractBaseTool):
-    vector_store: AbstractBaseVectorStore
+    vector_store: Union[AbstractBaseVectorStore, InMemoryVectorStore]
+    context_assembler_class = ContextAssembler
 
-    def __init__(self, vector_store: AbstractBaseVectorStore, *args, **kwargs):
+    def __init__(
+        self,
+        vector_store: Union[AbstractBaseVectorStore, InMemoryVectorStore],
+        *args,
+        **kwargs,
+    ):
         super().__init__(*args, **kwargs)
         self.vector_store = vector_store
 
@@ -19,6 +29,9 @@ class InlineVectorStoreTool(AbstractBaseTool):
             args_schema=self.args_schema,
         )
 
+    def get_context_assembler(self) -> ContextAssembler:
+        return self.context_assembler_class()
+
     def tool_func(self, input_text: str) -> str:
         results = self.vector_store.similarity_search(input_text)
-        return "\n".join([res["content"] for res in results])
+        return self.get_context_assembler().assemble(results)
@@ -19,7 +19,7 @@ class ToolsWithVectorStoreHelper(ABC):
     def get_tools(self) -> List[InlineVectorStoreTool]:
         """Retrieves the tools instances for the given tools list."""
         return [
-            tool_class(vector_store=self.get_vector_store(tool_class))
+            tool_class(vector_store=self.get_vector_store(tool_class)[0])
             for tool_class in self.tools_list
         ]
 
@@ -29,11 +29,25 @@ class ToolsWithVectorStoreHelper(ABC):
         """
         Args:
             tool_class (Type[InlineVectorStoreTool]): The tool class (extending InlineVectorStoreTool) that can be used to compound the vector store key.
+
+        Returns:
+            Tuple[DefaultVectorStore, bool]: The vector store and whether it was created.
+            Resolved vector stores are cached in a Django cache, so this doesn't hit the database once
+            the store has been resolved (see `DefaultVectorStoreManager`).
         """
+        vector_store = DefaultVectorStore.objects.get_cached(self.get_vector_store_key(tool_class))
+        if vector_store is not None:
+            return vector_store, False
         try:
-            return DefaultVectorStore.objects.get(name=self.get_vector_store_key(tool_class)), False
+            vector_store = DefaultVectorStore.objects.get(
+                name=self.get_vector_store_key(tool_class)
+            )
+            created = False
         except DefaultVectorStore.DoesNotExist:
-            return self.create_vector_store(tool_class), True
+            vector_store = self.create_vector_store(tool_class)
+            created = True
+        DefaultVectorStore.objects.cache(vector_store)
+        return vector_store, created
 
     def create_vector_store(self, tool_class: Type[InlineVectorStoreTool]) -> DefaultVectorStore:
         """